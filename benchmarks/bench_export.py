@@ -0,0 +1,121 @@
+"""
+PNG/PDF export time and file size against rows and facets.
+"""
+import shutil
+import tempfile
+import os.path
+
+import matplotlib.pyplot as plt
+
+from seabornextends import batch
+from seabornextends import plots
+from seabornextends.cache import RenderCache
+from seabornextends.retouch.grid import FacetGridRetoucher
+
+from benchmarks import common
+
+
+class Export(object):
+    """
+    savefig of a plots.plot grid, the grid is drawn in setup so
+    only the export is timed.
+    """
+
+    params = [[10 ** 4, 10 ** 6],
+              [1, 16, 100],
+              ['png', 'pdf']]
+    param_names = ['n_rows', 'n_facets', 'fmt']
+    timeout = 1200
+
+    def setup(self, n_rows, n_facets, fmt):
+        df = common.make_series_frame(n_rows, n_facets=n_facets)
+        self.grid = plots.plot(x='t',
+                               y='y',
+                               data=df,
+                               **common.facet_kws(n_facets))
+        common.draw(self.grid.fig)
+
+    def teardown(self, n_rows, n_facets, fmt):
+        plt.close('all')
+
+    def time_export(self, n_rows, n_facets, fmt):
+        common.export_size(self.grid.fig, fmt=fmt)
+
+    def peakmem_export(self, n_rows, n_facets, fmt):
+        common.export_size(self.grid.fig, fmt=fmt)
+
+    def track_bytes(self, n_rows, n_facets, fmt):
+        return common.export_size(self.grid.fig, fmt=fmt)
+    track_bytes.unit = 'bytes'
+
+
+class RasterizeHeavy(object):
+    """
+    Vector export of a dense plots.plot grid with and without
+    rasterizing its heavy lines.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['pdf', 'svg'],
+              [False, True]]
+    param_names = ['n_rows', 'fmt', 'rasterize']
+    timeout = 1200
+
+    def setup(self, n_rows, fmt, rasterize):
+        df = common.make_series_frame(n_rows, n_facets=4)
+        self.grid = plots.plot(x='t', y='y', data=df, **common.facet_kws(4))
+        if rasterize:
+            FacetGridRetoucher(self.grid).rasterize_heavy(threshold=5000)
+
+    def teardown(self, n_rows, fmt, rasterize):
+        plt.close('all')
+
+    def time_export(self, n_rows, fmt, rasterize):
+        common.export_size(self.grid.fig, fmt=fmt, dpi=150)
+
+    def track_bytes(self, n_rows, fmt, rasterize):
+        return common.export_size(self.grid.fig, fmt=fmt, dpi=150)
+    track_bytes.unit = 'bytes'
+
+
+class RenderCached(object):
+    """
+    batch.render_chart of a retouched chart without a cache, on a cache
+    miss (render and store) and on a hit (hash the used columns and
+    read the file).
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['none', 'miss', 'hit']]
+    param_names = ['n_rows', 'cache']
+    timeout = 600
+
+    def setup(self, n_rows, cache):
+        self.df = common.make_series_frame(n_rows, n_facets=4)
+        self.directory = tempfile.mkdtemp(prefix='sbe-bench-cache-')
+        self.spec = {'plot': 'plot',
+                     'plot_kws': dict(x='t', y='y', downsample='minmax',
+                                      **common.facet_kws(4)),
+                     'retouch': [('set_lines_width', {'width': 2}),
+                                 ('fig.set_size', {'w': 10, 'h': 6})],
+                     'path': os.path.join(self.directory, 'chart.png')}
+        self.cache = None
+        if cache != 'none':
+            self.cache = RenderCache(os.path.join(self.directory, 'cache'))
+        if cache == 'hit':
+            batch.render_chart(self.spec, self.df, cache=self.cache)
+
+    def teardown(self, n_rows, cache):
+        plt.close('all')
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_render_chart(self, n_rows, cache):
+        if cache == 'miss':
+            self.cache.clear()
+        batch.render_chart(self.spec, self.df, cache=self.cache)
+
+
+if __name__ == '__main__':
+    common.run(Export)
+    common.run(RasterizeHeavy)
+    common.run(RenderCached)
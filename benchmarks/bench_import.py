@@ -0,0 +1,78 @@
+"""
+Import time of the package modules, each in a fresh interpreter.
+"""
+import os
+import sys
+import subprocess
+
+from benchmarks import common
+
+
+# the fresh interpreters import the package from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that must stay unloaded after importing the key
+LAZY_DEPENDENCIES = {
+    'seabornextends.retouch.grid': ['seaborn', 'scipy', 'pandas',
+                                    'matplotlib.pyplot'],
+    'seabornextends.retouch.ax': ['seaborn', 'scipy', 'pandas',
+                                  'matplotlib.pyplot'],
+    'seabornextends.retouch.layout': ['seaborn', 'scipy', 'pandas',
+                                      'matplotlib.pyplot'],
+    'seabornextends.retouch.overlay': ['seaborn', 'scipy', 'pandas',
+                                       'matplotlib.pyplot'],
+    'seabornextends.utils': ['seaborn', 'scipy', 'pandas',
+                             'matplotlib.pyplot'],
+    'seabornextends.plots': ['seaborn', 'scipy', 'matplotlib.pyplot'],
+    'seabornextends.batch': ['seaborn', 'scipy', 'matplotlib.pyplot'],
+    'seabornextends.cache': ['seaborn', 'scipy', 'pandas',
+                             'matplotlib.pyplot'],
+    'seabornextends.chunked': ['seaborn', 'scipy', 'matplotlib.pyplot',
+                               'pyarrow'],
+    'seabornextends.pages': ['seaborn', 'scipy', 'matplotlib.pyplot'],
+    'seabornextends.stream': ['seaborn', 'scipy', 'matplotlib.pyplot'],
+}
+
+
+def loaded_modules(module, candidates):
+    """
+    Which of candidates a fresh interpreter has loaded after
+    importing module.
+    """
+    code = ('import sys, {}; '
+            'print(",".join(m for m in {!r} if m in sys.modules))').format(
+                module, list(candidates))
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    return [m for m in out.decode().strip().split(',') if m]
+
+
+def import_seconds(module):
+    """
+    Wall time of importing module in a fresh interpreter,
+    interpreter start up excluded.
+    """
+    code = ('from timeit import default_timer; t = default_timer(); '
+            'import {}; print(default_timer() - t)').format(module)
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    return float(out.decode().strip())
+
+
+class ImportTime(object):
+    """
+    Cold import time per module.
+    """
+
+    params = [sorted(LAZY_DEPENDENCIES) + ['seaborn']]
+    param_names = ['module']
+    timeout = 120
+
+    def setup(self, module):
+        pass
+
+    def track_import_seconds(self, module):
+        return min(import_seconds(module) for _ in range(3))
+    track_import_seconds.unit = 's'
+
+
+if __name__ == '__main__':
+    common.run(ImportTime)
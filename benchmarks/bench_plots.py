@@ -0,0 +1,209 @@
+import matplotlib.pyplot as plt
+
+from seabornextends import plots
+from seabornextends.retouch.grid import FacetGridRetoucher
+
+from benchmarks import common
+
+
+class PlotDownsample(object):
+    """
+    Draw time and vector export size of plots.plot against
+    points per facet, with and without downsampling.
+    """
+
+    params = [[10 ** 4, 10 ** 5, 10 ** 6],
+              [None, 'minmax', 'lttb']]
+    param_names = ['n_rows', 'downsample']
+    timeout = 600
+
+    def setup(self, n_rows, downsample):
+        self.df = common.make_series_frame(n_rows, n_facets=4)
+        self.grid = self._plot(downsample)
+
+    def teardown(self, n_rows, downsample):
+        plt.close('all')
+
+    def _plot(self, downsample):
+        return plots.plot(x='t',
+                          y='y',
+                          data=self.df,
+                          col='facet',
+                          col_wrap=2,
+                          downsample=downsample)
+
+    def time_plot_and_draw(self, n_rows, downsample):
+        grid = self._plot(downsample)
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+    def track_svg_bytes(self, n_rows, downsample):
+        return common.export_size(self.grid.fig, fmt='svg')
+    track_svg_bytes.unit = 'bytes'
+
+    def track_pdf_bytes(self, n_rows, downsample):
+        return common.export_size(self.grid.fig, fmt='pdf')
+    track_pdf_bytes.unit = 'bytes'
+
+
+class DistplotEngine(object):
+    """
+    plots.distplot with seaborn per facet mapping against the
+    grouped binned/FFT engine.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['seaborn', 'grouped']]
+    param_names = ['n_rows', 'engine']
+    timeout = 600
+
+    def setup(self, n_rows, engine):
+        self.df = common.make_series_frame(n_rows, n_facets=6)
+
+    def teardown(self, n_rows, engine):
+        plt.close('all')
+
+    def time_distplot(self, n_rows, engine):
+        grid = plots.distplot(a='y',
+                              data=self.df,
+                              col='facet',
+                              col_wrap=3,
+                              engine=engine)
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+
+class CategoricalEngine(object):
+    """
+    plots.boxplot/violinplot with seaborn per facet mapping against
+    the grouped statistics engine.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['seaborn', 'grouped'],
+              ['boxplot', 'violinplot']]
+    param_names = ['n_rows', 'engine', 'kind']
+    timeout = 600
+
+    def setup(self, n_rows, engine, kind):
+        self.df = common.make_series_frame(n_rows, n_facets=6)
+
+    def teardown(self, n_rows, engine, kind):
+        plt.close('all')
+
+    def time_plot(self, n_rows, engine, kind):
+        grid = getattr(plots, kind)(a='y',
+                                    data=self.df,
+                                    col='facet',
+                                    col_wrap=3,
+                                    engine=engine)
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+
+class UpdateData(object):
+    """
+    Refreshing a retouched grid with new data: plots.update of the
+    existing artists against building and retouching a new grid.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['plot', 'distplot'],
+              ['rebuild', 'update']]
+    param_names = ['n_rows', 'kind', 'refresh']
+    timeout = 600
+
+    def setup(self, n_rows, kind, refresh):
+        self.df = common.make_series_frame(n_rows, n_facets=6)
+        self.new_df = common.make_series_frame(n_rows, n_facets=6, seed=1)
+        self.grid = self._plot(self.df, kind)
+
+    def teardown(self, n_rows, kind, refresh):
+        plt.close('all')
+
+    def _plot(self, df, kind):
+        if kind == 'plot':
+            grid = plots.plot(x='t', y='y', data=df, col='facet',
+                              col_wrap=3, downsample='minmax')
+        else:
+            grid = plots.distplot(a='y', data=df, col='facet', col_wrap=3,
+                                  engine='grouped')
+        retoucher = FacetGridRetoucher(grid)
+        retoucher.set_lines_width(width=2)
+        retoucher.set_tick_params(axis='x', labelsize=8)
+        return grid
+
+    def time_refresh(self, n_rows, kind, refresh):
+        if refresh == 'update':
+            plots.update(self.grid, self.new_df)
+            common.draw(self.grid.fig)
+        else:
+            grid = self._plot(self.new_df, kind)
+            common.draw(grid.fig)
+            plt.close(grid.fig)
+
+
+class JointBinned(object):
+    """
+    Joint plot of many points: seaborn's scatter jointplot against the
+    binned hist and hex kinds of plots.jointplot.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              ['scatter', 'hist', 'hex']]
+    param_names = ['n_rows', 'kind']
+    timeout = 600
+
+    def setup(self, n_rows, kind):
+        self.df = common.make_series_frame(n_rows, n_facets=1)
+
+    def teardown(self, n_rows, kind):
+        plt.close('all')
+
+    def time_jointplot(self, n_rows, kind):
+        if kind == 'scatter':
+            import seaborn as sns
+            grid = sns.jointplot(x='t', y='y', data=self.df)
+        else:
+            grid = plots.jointplot(x='t', y='y', data=self.df, kind=kind)
+        common.draw(grid.fig)
+
+
+class BarplotBootstrap(object):
+    """
+    Bootstrapped bar estimates of many facets and levels: seaborn's
+    loop per bar against one grouped_bootstrap pass.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              [10, 50],
+              ['seaborn', 'grouped']]
+    param_names = ['n_rows', 'n_levels', 'engine']
+    timeout = 600
+
+    def setup(self, n_rows, n_levels, engine):
+        self.df = common.make_categorical_frame(n_rows, n_facets=9,
+                                                n_levels=n_levels)
+
+    def teardown(self, n_rows, n_levels, engine):
+        plt.close('all')
+
+    def time_barplot(self, n_rows, n_levels, engine):
+        grid = plots.barplot(x='level',
+                             y='value',
+                             data=self.df,
+                             col='facet',
+                             col_wrap=3,
+                             bar_kws={'seed': 0},
+                             engine=engine)
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+
+if __name__ == '__main__':
+    common.run(PlotDownsample)
+    common.run(DistplotEngine)
+    common.run(CategoricalEngine)
+    common.run(UpdateData)
+    common.run(JointBinned)
+    common.run(BarplotBootstrap)
@@ -0,0 +1,175 @@
+"""
+FacetGridRetoucher operations against facet count and cardinality.
+"""
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from seabornextends.retouch import layout
+from seabornextends.retouch.grid import FacetGridRetoucher
+
+from benchmarks import common
+
+
+class HighlightLevels(object):
+    """
+    highlight_levels of every tenth level, estimates computed
+    for all facets and levels.
+    """
+
+    params = [[10 ** 5, 10 ** 6],
+              [4, 100],
+              [10, 100, 1000]]
+    param_names = ['n_rows', 'n_facets', 'n_levels']
+    timeout = 600
+
+    def setup(self, n_rows, n_facets, n_levels):
+        self.df = common.make_categorical_frame(n_rows,
+                                                n_facets=n_facets,
+                                                n_levels=n_levels)
+        self.grid = common.facet_grid(self.df, n_facets)
+        self.grid_kws = {'x': 'level', 'y': 'value', 'estimator': np.mean}
+
+    def teardown(self, n_rows, n_facets, n_levels):
+        plt.close('all')
+
+    def time_highlight_levels(self, n_rows, n_facets, n_levels):
+        retoucher = FacetGridRetoucher(self.grid, self.grid_kws)
+        retoucher.highlight_levels(
+            df=self.df,
+            category='level',
+            axis='xaxis',
+            highlights=[{'kind': 'bar', 'level_pattern': '0$'},
+                        {'kind': 'capped_line', 'level_pattern': '5$'}])
+
+
+class HighlightLines(object):
+    """
+    Threshold lines on every facet, drawn: one artist per line against
+    one LineCollection per ax.
+    """
+
+    params = [[16, 100],
+              [10, 200],
+              ['per_line', 'batched']]
+    param_names = ['n_facets', 'n_values', 'mode']
+    timeout = 600
+
+    def setup(self, n_facets, n_values, mode):
+        df = common.make_series_frame(100 * n_facets, n_facets=n_facets)
+        self.grid = common.facet_grid(df, n_facets)
+        self.values = list(np.linspace(-10, 10, n_values))
+
+    def teardown(self, n_facets, n_values, mode):
+        plt.close('all')
+
+    def _highlight(self, mode):
+        retoucher = FacetGridRetoucher(self.grid)
+        if mode == 'batched':
+            retoucher.highlight_lines(values=[self.values])
+        else:
+            for ax_retoucher in retoucher.ax_retouchers:
+                for value in self.values:
+                    ax_retoucher.highlight_line(value=value)
+
+    def time_highlight_lines(self, n_facets, n_values, mode):
+        self._highlight(mode)
+        common.draw(self.grid.fig)
+
+    def track_artists(self, n_facets, n_values, mode):
+        self._highlight(mode)
+        return sum(len(ax.get_children()) for ax in self.grid.axes.flat)
+
+
+class TouchDatesAxis(object):
+    """
+    touch_dates_axis on every facet, including the draw that
+    formats the labels.
+    """
+
+    params = [[1, 16, 100, 400]]
+    param_names = ['n_facets']
+    timeout = 600
+
+    def setup(self, n_facets):
+        df = common.make_series_frame(100 * n_facets, n_facets=n_facets)
+        self.grid = common.facet_grid(df, n_facets)
+        dates = pd.date_range('2017-01-01', periods=100, freq='D')
+        for ax in self.grid.axes.flat:
+            ax.plot(dates, np.arange(100))
+
+    def teardown(self, n_facets):
+        plt.close('all')
+
+    def time_touch_dates_axis(self, n_facets):
+        retoucher = FacetGridRetoucher(self.grid)
+        retoucher.touch_dates_axis(axis='xaxis', fmt='%Y-%b-%d')
+        common.draw(self.grid.fig)
+
+
+class TightLayout(object):
+    """
+    FigRetoucher.set_tight_layout against facet count: exact, fast with
+    empty caches and fast on a grid of the same shape and labels.
+    """
+
+    params = [[1, 16, 100, 400],
+              ['exact', 'fast', 'cached']]
+    param_names = ['n_facets', 'mode']
+    timeout = 600
+
+    def setup(self, n_facets, mode):
+        df = common.make_series_frame(100 * n_facets, n_facets=n_facets)
+        self.grid = common.facet_grid(df, n_facets)
+        self.retoucher = FacetGridRetoucher(self.grid)
+        layout.clear_cache()
+        if mode == 'cached':
+            # an earlier render of the same chart
+            grid = common.facet_grid(df, n_facets)
+            FacetGridRetoucher(grid).fig.set_tight_layout(mode='fast')
+
+    def teardown(self, n_facets, mode):
+        plt.close('all')
+
+    def time_set_tight_layout(self, n_facets, mode):
+        if mode == 'exact':
+            self.retoucher.fig.set_tight_layout(mode='exact')
+        else:
+            if mode == 'fast':
+                layout.clear_cache()
+            self.retoucher.fig.set_tight_layout(mode='fast')
+
+
+class ConsolidateArtists(object):
+    """
+    Draw time of an ax with many lines, as Line2D objects or merged
+    into one LineCollection.
+    """
+
+    params = [[100, 1000, 5000],
+              [False, True]]
+    param_names = ['n_lines', 'consolidate']
+    timeout = 600
+
+    def setup(self, n_lines, consolidate):
+        df = common.make_series_frame(200 * n_lines, n_facets=n_lines)
+        self.grid = common.facet_grid(df, 1)
+        ax = self.grid.axes.flat[0]
+        for _, line in df.groupby('facet'):
+            ax.plot(line['t'].values, line['y'].values, alpha=.3)
+        if consolidate:
+            FacetGridRetoucher(self.grid).consolidate_artists()
+
+    def teardown(self, n_lines, consolidate):
+        plt.close('all')
+
+    def time_draw(self, n_lines, consolidate):
+        common.draw(self.grid.fig)
+
+
+if __name__ == '__main__':
+    common.run(HighlightLevels)
+    common.run(HighlightLines)
+    common.run(TouchDatesAxis)
+    common.run(TightLayout)
+    common.run(ConsolidateArtists)
@@ -0,0 +1,240 @@
+"""
+plots functions against row count, facet count and categorical
+cardinality.
+"""
+import shutil
+import tempfile
+import os.path
+
+import matplotlib.pyplot as plt
+
+from seabornextends import pages
+from seabornextends import plots
+
+from benchmarks import common
+
+
+def _draw_plot(df, kind, engine, **facetgrid_kws):
+    if kind == 'plot':
+        grid = plots.plot(x='t', y='y', data=df, **facetgrid_kws)
+    else:
+        grid = getattr(plots, kind)(a='y',
+                                    data=df,
+                                    engine=engine,
+                                    **facetgrid_kws)
+    common.draw(grid.fig)
+    plt.close(grid.fig)
+
+
+def _skip_engine(kind, engine):
+    if kind == 'plot' and engine != 'seaborn':
+        raise NotImplementedError()
+
+
+class RowsSweep(object):
+    """
+    Draw time and peak memory of every plots function against
+    the number of rows, 4 facets.
+    """
+
+    params = [[10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+              ['plot', 'distplot', 'boxplot', 'violinplot'],
+              ['seaborn', 'grouped']]
+    param_names = ['n_rows', 'kind', 'engine']
+    timeout = 1800
+
+    def setup(self, n_rows, kind, engine):
+        _skip_engine(kind, engine)
+        self.df = common.make_series_frame(n_rows, n_facets=4)
+
+    def teardown(self, n_rows, kind, engine):
+        plt.close('all')
+
+    def time_plot(self, n_rows, kind, engine):
+        _draw_plot(self.df, kind, engine, **common.facet_kws(4))
+
+    def peakmem_plot(self, n_rows, kind, engine):
+        _draw_plot(self.df, kind, engine, **common.facet_kws(4))
+
+
+class FacetsSweep(object):
+    """
+    Draw time and peak memory of every plots function against
+    the number of facets, 100k rows.
+    """
+
+    params = [[1, 16, 100, 400],
+              ['plot', 'distplot', 'boxplot', 'violinplot'],
+              ['seaborn', 'grouped']]
+    param_names = ['n_facets', 'kind', 'engine']
+    timeout = 1800
+
+    def setup(self, n_facets, kind, engine):
+        _skip_engine(kind, engine)
+        self.df = common.make_series_frame(10 ** 5, n_facets=n_facets)
+
+    def teardown(self, n_facets, kind, engine):
+        plt.close('all')
+
+    def time_plot(self, n_facets, kind, engine):
+        _draw_plot(self.df, kind, engine, **common.facet_kws(n_facets))
+
+    def peakmem_plot(self, n_facets, kind, engine):
+        _draw_plot(self.df, kind, engine, **common.facet_kws(n_facets))
+
+
+class CardinalitySweep(object):
+    """
+    boxplot/violinplot against the number of hue levels,
+    100k rows and 4 facets.
+    """
+
+    params = [[2, 10, 50],
+              ['boxplot', 'violinplot'],
+              ['seaborn', 'grouped']]
+    param_names = ['n_levels', 'kind', 'engine']
+    timeout = 1800
+
+    def setup(self, n_levels, kind, engine):
+        self.df = common.make_categorical_frame(10 ** 5,
+                                                n_facets=4,
+                                                n_levels=n_levels)
+
+    def teardown(self, n_levels, kind, engine):
+        plt.close('all')
+
+    def time_plot(self, n_levels, kind, engine):
+        grid = getattr(plots, kind)(a='value',
+                                    data=self.df,
+                                    hue='level',
+                                    engine=engine,
+                                    **common.facet_kws(4))
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+
+class FacetSplit(object):
+    """
+    Splitting the data by facet alone: FacetGrid.facet_data (a boolean
+    mask per facet) against plots._facet_columns (one sort of the
+    plotted columns), wide frame with columns that are not plotted.
+    """
+
+    params = [[10 ** 6, 10 ** 7],
+              [16, 400],
+              ['mask', 'sort']]
+    param_names = ['n_rows', 'n_facets', 'split']
+    timeout = 1800
+
+    def setup(self, n_rows, n_facets, split):
+        df = common.make_series_frame(n_rows, n_facets=n_facets)
+        for idx in range(8):
+            df['extra{}'.format(idx)] = df['y']
+        self.grid = common.facet_grid(df, n_facets)
+
+    def teardown(self, n_rows, n_facets, split):
+        plt.close('all')
+
+    def _split(self, split):
+        if split == 'mask':
+            for _, data in self.grid.facet_data():
+                data[['t', 'y']].dropna()
+        else:
+            for _ in plots._facet_columns(self.grid, ['t', 'y']):
+                pass
+
+    def time_split(self, n_rows, n_facets, split):
+        self._split(split)
+
+    def track_peak_bytes(self, n_rows, n_facets, split):
+        return common.peak_memory(self._split, split)
+    track_peak_bytes.unit = 'bytes'
+
+
+class ChunkedInput(object):
+    """
+    Draw time and peak memory of the chunked engine against the table
+    size, chunks are generated on the fly so the table is never held
+    in memory.
+    """
+
+    params = [[10 ** 6, 10 ** 7],
+              ['distplot', 'boxplot', 'violinplot']]
+    param_names = ['n_rows', 'kind']
+    timeout = 1800
+
+    chunksize = 10 ** 5
+
+    def setup(self, n_rows, kind):
+        pass
+
+    def teardown(self, n_rows, kind):
+        plt.close('all')
+
+    def _chunks(self, n_rows):
+        for seed in range(n_rows // self.chunksize):
+            yield common.make_series_frame(self.chunksize, n_facets=16,
+                                           seed=seed)
+
+    def _plot(self, n_rows, kind):
+        grid = getattr(plots, kind)(a='y',
+                                    data=self._chunks(n_rows),
+                                    engine='chunked',
+                                    **common.facet_kws(16))
+        common.draw(grid.fig)
+        plt.close(grid.fig)
+
+    def time_plot(self, n_rows, kind):
+        self._plot(n_rows, kind)
+
+    def track_peak_bytes(self, n_rows, kind):
+        return common.peak_memory(self._plot, n_rows, kind)
+    track_peak_bytes.unit = 'bytes'
+
+
+class Paginated(object):
+    """
+    Multipage PDF of a facet grid: one figure with every facet against
+    pages of 16 facets, each closed before the next.
+    """
+
+    params = [[64, 256],
+              ['single', 'pages']]
+    param_names = ['n_facets', 'layout']
+    timeout = 1800
+
+    def setup(self, n_facets, layout):
+        self.df = common.make_series_frame(500 * n_facets,
+                                           n_facets=n_facets)
+        self.directory = tempfile.mkdtemp(prefix='sbe-bench-pages-')
+        self.spec = {'plot': 'plot',
+                     'plot_kws': dict(x='t', y='y', downsample='minmax',
+                                      col='facet', col_wrap=4),
+                     'path': os.path.join(self.directory, 'grid.pdf')}
+
+    def teardown(self, n_facets, layout):
+        plt.close('all')
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _render(self, layout):
+        if layout == 'pages':
+            pages.render_pages(self.spec, self.df, page_size=16)
+        else:
+            grid = plots.plot(data=self.df, pyplot=False,
+                              **self.spec['plot_kws'])
+            grid.fig.savefig(self.spec['path'])
+
+    def time_render(self, n_facets, layout):
+        self._render(layout)
+
+    def peakmem_render(self, n_facets, layout):
+        self._render(layout)
+
+
+if __name__ == '__main__':
+    common.run(RowsSweep)
+    common.run(FacetsSweep)
+    common.run(CardinalitySweep)
+    common.run(FacetSplit)
+    common.run(ChunkedInput)
+    common.run(Paginated)
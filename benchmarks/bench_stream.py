@@ -0,0 +1,61 @@
+"""
+Cost of one streamed batch against the length of the history.
+"""
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from seabornextends import plots
+from seabornextends.stream import LineStream
+
+from benchmarks import common
+
+
+class StreamAppend(object):
+    """
+    New batch into a 4 facet plots.plot grid: rebuilding the grid with
+    the whole history against LineStream.append with a window.
+    """
+
+    params = [[10 ** 4, 10 ** 5, 10 ** 6],
+              ['rebuild', 'append']]
+    param_names = ['history', 'mode']
+    timeout = 600
+
+    window = 10000
+    batch_rows = 100
+
+    def setup(self, history, mode):
+        self.df = common.make_series_frame(history, n_facets=4)
+        self.grid = plots.plot(x='t', y='y', data=self.df, col='facet',
+                               col_wrap=2, pyplot=False)
+        common.draw(self.grid.fig)
+        self.stream = LineStream(self.grid, window=self.window)
+        self.t0 = self.df['t'].max() + 1
+
+    def teardown(self, history, mode):
+        self.stream.close()
+        plt.close('all')
+
+    def _batch(self):
+        per_facet = self.batch_rows // 4
+        batch = pd.DataFrame({
+            't': np.tile(np.arange(self.t0, self.t0 + per_facet), 4),
+            'y': np.random.standard_normal(4 * per_facet),
+            'facet': np.repeat(np.arange(4), per_facet)})
+        self.t0 += per_facet
+        return batch
+
+    def time_batch(self, history, mode):
+        batch = self._batch()
+        if mode == 'append':
+            self.stream.append(batch)
+        else:
+            self.df = pd.concat([self.df, batch], ignore_index=True)
+            grid = plots.plot(x='t', y='y', data=self.df, col='facet',
+                              col_wrap=2, pyplot=False)
+            common.draw(grid.fig)
+
+
+if __name__ == '__main__':
+    common.run(StreamAppend)
@@ -0,0 +1,36 @@
+"""
+Guard for the lazy imports: exits non-zero if importing a package
+module loads one of its heavy dependencies.
+
+Run from the repo root:
+python -m benchmarks.check_imports
+
+or as a script, from anywhere:
+python benchmarks/check_imports.py
+"""
+import os
+import sys
+
+if __name__ == '__main__' and not __package__:
+    # run as a script, the repo root isn't on the path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+
+from benchmarks.bench_import import LAZY_DEPENDENCIES
+from benchmarks.bench_import import loaded_modules
+
+
+def main():
+    failed = False
+    for module, lazy in sorted(LAZY_DEPENDENCIES.items()):
+        loaded = loaded_modules(module, lazy)
+        if loaded:
+            failed = True
+            print('{} eagerly imports {}'.format(module, ', '.join(loaded)))
+        else:
+            print('{} ok'.format(module))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Shared helpers for the benchmarks.
+
+Benchmarks follow the asv conventions: classes with params/param_names,
+a setup method and time_*/peakmem_*/track_* methods.
+
+Run from the repo root, e.g.:
+python -m benchmarks.bench_plots
+
+or run everything and store the results of the current commit, see
+benchmarks/run.py:
+python -m benchmarks.run --save
+"""
+import io
+import itertools
+import timeit
+import tracemalloc
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+
+def make_series_frame(n_rows, n_facets=1, seed=0):
+    """
+    Random walk per facet with a sorted timestamp column.
+    """
+    rs = np.random.RandomState(seed)
+    per_facet = max(n_rows // n_facets, 1)
+    facet = np.repeat(np.arange(n_facets), per_facet)
+    t = np.tile(np.arange(per_facet), n_facets)
+    y = rs.standard_normal(len(t)).cumsum()
+    return pd.DataFrame({'t': t, 'y': y, 'facet': facet})
+
+
+def make_categorical_frame(n_rows, n_facets=1, n_levels=10, seed=0):
+    """
+    Normal values per facet and level, level is a category of
+    n_levels strings, day a category of n_levels dates.
+    """
+    rs = np.random.RandomState(seed)
+    level = rs.randint(0, n_levels, n_rows)
+    names = ['L{:04d}'.format(i) for i in range(n_levels)]
+    days = pd.date_range('2017-01-01', periods=n_levels, freq='D')
+    return pd.DataFrame({
+        'value': rs.standard_normal(n_rows) + level * 0.1,
+        'facet': rs.randint(0, n_facets, n_rows),
+        'level': pd.Categorical.from_codes(level, names),
+        'day': pd.Categorical.from_codes(level, days)})
+
+
+def facet_kws(n_facets):
+    """
+    FacetGrid kwargs laying out n_facets facets on a roughly square grid.
+    """
+    if n_facets == 1:
+        return dict()
+    col_wrap = int(np.ceil(np.sqrt(n_facets)))
+    return {'col': 'facet', 'col_wrap': col_wrap}
+
+
+def facet_grid(df, n_facets):
+    """
+    Empty FacetGrid with n_facets facets.
+    """
+    import seaborn as sns
+
+    return sns.FacetGrid(df, **facet_kws(n_facets))
+
+
+def draw(fig):
+    fig.canvas.draw()
+
+
+def export_size(fig, fmt='png', **kwargs):
+    """
+    Size in bytes of fig saved as fmt.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **kwargs)
+    return len(buf.getvalue())
+
+
+def peak_memory(func, *args):
+    """
+    Peak bytes allocated by Python and numpy during func(*args).
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.clear_traces()
+    start, _ = tracemalloc.get_traced_memory()
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return peak - start
+
+
+def run(benchmark_cls, repeat=3, verbose=True):
+    """
+    Minimal stand alone runner: prints one line per benchmark
+    method and param combination.
+
+    Returns
+    -------
+
+        results : list of dict
+            benchmark, params, value and unit of every measure.
+    """
+    params = getattr(benchmark_cls, 'params', [[None]])
+    names = getattr(benchmark_cls, 'param_names', ['param'])
+    methods = [m for m in dir(benchmark_cls)
+               if m.startswith(('time_', 'peakmem_', 'track_'))]
+
+    results = list()
+    for combo in itertools.product(*params):
+        bench = benchmark_cls()
+        try:
+            bench.setup(*combo)
+        except NotImplementedError:
+            # asv convention for combinations that don't apply
+            continue
+        label = ', '.join('{}={}'.format(n, v) for n, v in zip(names, combo))
+        for method in methods:
+            func = getattr(bench, method)
+            if method.startswith('time_'):
+                value = min(timeit.repeat(lambda: func(*combo),
+                                          number=1, repeat=repeat))
+                unit = 's'
+            elif method.startswith('peakmem_'):
+                value = peak_memory(func, *combo)
+                unit = 'bytes'
+            else:
+                value = func(*combo)
+                unit = getattr(func, 'unit', '')
+            name = benchmark_cls.__name__ + '.' + method
+            results.append({'benchmark': name,
+                            'params': dict(zip(names, map(str, combo))),
+                            'value': float(value),
+                            'unit': unit})
+            if verbose:
+                print('{:<40} {:<40} {:>14.4f} {}'.format(
+                    name, label, value, unit))
+        teardown = getattr(bench, 'teardown', None)
+        if teardown:
+            teardown(*combo)
+
+    return results
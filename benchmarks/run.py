@@ -0,0 +1,182 @@
+"""
+Run the benchmarks, store the results per commit and compare commits.
+
+Run from the repo root, e.g.:
+python -m benchmarks.run --save
+python -m benchmarks.run --bench 'RowsSweep|Export' --save
+python -m benchmarks.run --compare 1a2b3c4 5d6e7f8
+
+Results are written to benchmarks/results/<commit>.json, one file per
+commit (suffixed -dirty when the tree has uncommitted changes).
+"""
+import os
+import re
+import sys
+import json
+import inspect
+import platform
+import argparse
+import datetime
+import importlib
+import subprocess
+
+from benchmarks import common
+
+
+MODULES = ['bench_plots', 'bench_scale', 'bench_retouch', 'bench_export',
+           'bench_import', 'bench_stream']
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'results')
+
+
+def benchmark_classes(pattern=None):
+    """
+    Benchmark classes of MODULES whose name matches pattern.
+    """
+    classes = list()
+    for name in MODULES:
+        module = importlib.import_module('benchmarks.' + name)
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            if pattern and not re.search(pattern, cls_name):
+                continue
+            classes.append(cls)
+    return classes
+
+
+def git_commit():
+    """
+    Short hash of HEAD, suffixed -dirty if the tree has changes.
+    """
+    def git(*args):
+        return subprocess.check_output(('git',) + args).decode().strip()
+
+    commit = git('rev-parse', '--short', 'HEAD')
+    if git('status', '--porcelain', '--untracked-files=no'):
+        commit += '-dirty'
+    return commit
+
+
+def environment():
+    import numpy
+    import pandas
+    import matplotlib
+    import seaborn
+
+    return {'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'numpy': numpy.__version__,
+            'pandas': pandas.__version__,
+            'matplotlib': matplotlib.__version__,
+            'seaborn': seaborn.__version__}
+
+
+def results_path(commit):
+    return os.path.join(RESULTS_DIR, '{}.json'.format(commit))
+
+
+def save(results, commit):
+    """
+    Merge results into the file of commit, so partial runs add up.
+    """
+    if not os.path.isdir(RESULTS_DIR):
+        os.makedirs(RESULTS_DIR)
+
+    path = results_path(commit)
+    stored = {'results': list()}
+    if os.path.exists(path):
+        with open(path) as f:
+            stored = json.load(f)
+
+    def key(result):
+        return (result['benchmark'], sorted(result['params'].items()))
+
+    new_keys = set(json.dumps(key(r)) for r in results)
+    kept = [r for r in stored['results']
+            if json.dumps(key(r)) not in new_keys]
+
+    stored.update({'commit': commit,
+                   'date': datetime.datetime.now().isoformat(),
+                   'environment': environment(),
+                   'results': kept + results})
+
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=1, sort_keys=True)
+
+    return path
+
+
+def load(commit):
+    with open(results_path(commit)) as f:
+        return json.load(f)
+
+
+def compare(base, head, threshold=1.1):
+    """
+    Print head / base for every measure of both commits.
+
+    Returns
+    -------
+
+        regressions : list of dict
+            Measures where head is more than threshold times base.
+    """
+    def index(stored):
+        return dict(((r['benchmark'],
+                      json.dumps(r['params'], sort_keys=True)), r)
+                    for r in stored['results'])
+
+    base_results = index(load(base))
+    head_results = index(load(head))
+
+    regressions = list()
+    print('{:<40} {:<50} {:>12} {:>12} {:>8}'.format(
+        'benchmark', 'params', base, head, 'ratio'))
+    for key in sorted(set(base_results) & set(head_results)):
+        before = base_results[key]['value']
+        after = head_results[key]['value']
+        ratio = after / before if before else float('nan')
+        flag = ''
+        if ratio > threshold:
+            flag = ' !'
+            regressions.append(dict(head_results[key], ratio=ratio))
+        print('{:<40} {:<50} {:>12.4g} {:>12.4g} {:>8.2f}{}'.format(
+            key[0], key[1], before, after, ratio, flag))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bench', default=None,
+                        help='regex on the benchmark class names')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', action='store_true',
+                        help='store the results of the current commit')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'),
+                        help='compare the stored results of two commits')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='head / base ratio reported as regression')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(*args.compare, threshold=args.threshold)
+        print('{} regressions above {}x'.format(len(regressions),
+                                              args.threshold))
+        return 1 if regressions else 0
+
+    results = list()
+    for cls in benchmark_classes(args.bench):
+        results += common.run(cls, repeat=args.repeat)
+
+    if args.save:
+        print('saved to {}'.format(save(results, git_commit())))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+import io
+import os
+import shutil
+import logging
+import tempfile
+import traceback
+import functools
+import multiprocessing
+from timeit import default_timer
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrames(object):
+    """
+    DataFrames stored as one memory-mapped .npy file per column, so
+    worker processes can load them without pickling the data per task.
+
+    Categorical and object columns are stored as integer codes, their
+    levels travel with the (small) manifest. The index is not kept.
+
+    Example:
+    shared = SharedFrames({'orders': df_orders})
+    frame = shared.load('orders')
+    shared.cleanup()
+    """
+
+    def __init__(self, frames, directory=None):
+
+        self._owner = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix='sbe-frames-')
+
+        # {frame name: [(column, file, kind, levels)]}
+        self.manifest = dict()
+
+        for name, frame in frames.items():
+            self.manifest[name] = [self._dump(name, idx, frame[column])
+                                   for idx, column in
+                                   enumerate(frame.columns)]
+
+        self._loaded = dict()
+
+    def _dump(self, name, idx, series):
+        path = os.path.join(self.directory, '{}-{}.npy'.format(name, idx))
+
+        if hasattr(series, 'cat'):
+            kind, values = 'category', series.cat.codes.values
+            levels = series.cat.categories.tolist()
+        elif series.dtype.kind not in 'biufmM':
+            kind = 'object'
+            values, levels = pd.factorize(series.values)
+            levels = levels.tolist()
+        else:
+            kind, values, levels = 'array', series.values, None
+
+        np.save(path, np.ascontiguousarray(values))
+
+        return (series.name, path, kind, levels)
+
+    @classmethod
+    def from_manifest(cls, manifest):
+        """
+        Attach to frames dumped by another process.
+        """
+        shared = cls.__new__(cls)
+        shared._owner = False
+        shared.directory = None
+        shared.manifest = manifest
+        shared._loaded = dict()
+        return shared
+
+    def load(self, name):
+        """
+        DataFrame built from the memory-mapped columns, cached so each
+        process builds a frame only once.
+        """
+
+        if name in self._loaded:
+            return self._loaded[name]
+
+        if name not in self.manifest:
+            msg = "no shared frame named {}".format(name)
+            logging.error(msg)
+            raise KeyError(msg)
+
+        columns = list()
+        data = dict()
+        for column, path, kind, levels in self.manifest[name]:
+            values = np.load(path, mmap_mode='r')
+            if kind == 'category':
+                values = pd.Categorical.from_codes(np.asarray(values), levels)
+            elif kind == 'object':
+                # code -1 (missing) picks the trailing nan
+                levels = np.append(np.array(levels, dtype=object), np.nan)
+                values = levels[values]
+            columns.append(column)
+            data[column] = values
+
+        frame = pd.DataFrame(data, columns=columns)
+        self._loaded[name] = frame
+
+        return frame
+
+    def cleanup(self):
+        """
+        Remove the column files if this instance created them.
+        """
+        if self._owner and self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+def apply_retouch(retoucher, operations):
+    """
+    Apply recorded retouch operations to a retoucher.
+
+    Operations are merged into a RetouchPlan and applied in one pass
+    per axis.
+
+    Parameters
+    ----------
+
+        retoucher : FacetGridRetoucher or JointGridRetoucher
+
+        operations : list of (name, kwargs) or RetouchPlan
+            name is a retoucher method, e.g. 'set_lim', or a
+            FigRetoucher method prefixed with 'fig.', e.g.
+            'fig.set_size'.
+    """
+    from seabornextends.retouch.plan import RetouchPlan
+
+    plan = operations
+    if not isinstance(plan, RetouchPlan):
+        plan = RetouchPlan(operations)
+    plan.apply(retoucher)
+
+
+def make_retoucher(grid, grid_kws=None):
+    """
+    JointGridRetoucher or FacetGridRetoucher of grid.
+    """
+    import seaborn as sns
+
+    from seabornextends.retouch.grid import FacetGridRetoucher
+    from seabornextends.retouch.grid import JointGridRetoucher
+
+    if isinstance(grid, sns.JointGrid):
+        return JointGridRetoucher(grid, grid_kws)
+    return FacetGridRetoucher(grid, grid_kws)
+
+
+def _save(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def render_chart(spec, data, pyplot=True, cache=None):
+    """
+    Render, retouch and save one chart spec.
+
+    With pyplot=False the figure never enters pyplot (see plots.plot),
+    so charts can be rendered from several threads at once.
+
+    With a cache the saved bytes are looked up by a hash of the spec
+    and of the data columns it uses, a hit is written to path without
+    rendering.
+
+    Parameters
+    ----------
+
+        spec : dict
+            plot: name of a seabornextends.plots function or the
+                function itself.
+            plot_kws: arguments of the plot function other than data,
+                e.g. {'a': 'order_value', 'col': 'scale'}.
+            grid_kws: grid params given to the retoucher, optional.
+            retouch: list of (name, kwargs) or a RetouchPlan, see
+                apply_retouch.
+            path: output file, format follows the extension.
+            savefig_kws: passed to fig.savefig, optional.
+
+        data : pd.DataFrame
+
+        cache : cache.RenderCache, default None
+
+    Returns
+    -------
+
+        cached : bool
+            True if the chart came from the cache.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(spec, data)
+        content = cache.get(key)
+        if content is not None:
+            _save(spec['path'], content)
+            return True
+
+    from seabornextends import plots
+
+    func = spec['plot']
+    if not callable(func):
+        func = getattr(plots, func)
+
+    plot_kws = dict(spec.get('plot_kws', dict()))
+    if not pyplot:
+        plot_kws['pyplot'] = False
+
+    grid = func(data=data, **plot_kws)
+
+    try:
+        apply_retouch(make_retoucher(grid, spec.get('grid_kws')),
+                      spec.get('retouch', list()))
+
+        savefig_kws = spec.get('savefig_kws', dict())
+        if key is None:
+            grid.fig.savefig(spec['path'], **savefig_kws)
+        else:
+            buf = io.BytesIO()
+            savefig_kws = dict(savefig_kws)
+            savefig_kws.setdefault(
+                'format', os.path.splitext(spec['path'])[1][1:].lower())
+            grid.fig.savefig(buf, **savefig_kws)
+            content = buf.getvalue()
+            cache.put(key, content)
+            _save(spec['path'], content)
+    finally:
+        if pyplot:
+            import matplotlib.pyplot as plt
+            plt.close(grid.fig)
+
+    return False
+
+
+# per worker process state, set by _init_worker
+_WORKER = dict()
+
+
+def _init_worker(manifest):
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+    _WORKER['frames'] = SharedFrames.from_manifest(manifest)
+
+
+def _render_task(spec, frames=None, pyplot=True, cache=None):
+    """
+    Render one spec, in a worker process unless frames are given,
+    never raises.
+    """
+    start = default_timer()
+    result = {'path': spec.get('path'), 'seconds': None, 'cached': False,
+              'error': None, 'traceback': None}
+    try:
+        if frames is None:
+            data = _WORKER['frames'].load(spec['data'])
+        else:
+            data = frames[spec['data']]
+        result['cached'] = render_chart(spec, data, pyplot=pyplot,
+                                        cache=cache)
+    except Exception as e:
+        result['error'] = repr(e)
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = default_timer() - start
+    return result
+
+
+def render_batch(specs, frames, processes=None, cache=None):
+    """
+    Render many chart specs across a process pool with the Agg backend.
+
+    Frames are dumped once to memory-mapped column files and each worker
+    loads a frame the first time one of its specs needs it.
+
+    Example:
+    report = render_batch(
+        specs=[{'plot': 'distplot',
+                'data': 'orders',
+                'plot_kws': {'a': 'order_value', 'col': 'scale'},
+                'retouch': [('set_lim', {'axis': 'xaxis', 'left': 0}),
+                            ('fig.set_size', {'w': 10, 'h': 3})],
+                'path': 'charts/order_value.png'}],
+        frames={'orders': df})
+
+    Parameters
+    ----------
+
+        specs : list of dict
+            See render_chart, plus data: name of a frame in frames.
+
+        frames : dict or SharedFrames
+            {name: pd.DataFrame} shared by the specs.
+
+        processes : int, default None
+            Pool size, default is the number of CPUs.
+
+        cache : cache.RenderCache, default None
+            Shared by the workers through its directory, the hits and
+            misses of the workers are not counted in cache.stats().
+
+    Returns
+    -------
+
+        report : list of dict
+            One per spec, in order: path, seconds, cached, error and
+            traceback (None when the chart rendered).
+    """
+
+    shared = frames
+    if not isinstance(frames, SharedFrames):
+        shared = SharedFrames(frames)
+
+    pool = multiprocessing.Pool(processes=processes,
+                                initializer=_init_worker,
+                                initargs=(shared.manifest,))
+    try:
+        report = pool.map(functools.partial(_render_task, cache=cache),
+                          specs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+        if shared is not frames:
+            shared.cleanup()
+
+    _log_failures(report)
+
+    return report
+
+
+def _log_failures(report):
+    for result in report:
+        if result['error']:
+            logging.error("failed to render {}: {}".format(result['path'],
+                                                          result['error']))
+
+
+def render_threaded(specs, frames, max_workers=None, executor=None,
+                    cache=None):
+    """
+    Render many chart specs concurrently in threads of this process.
+
+    Figures are built off pyplot, each on its own Agg canvas, so no
+    figure leaks into pyplot's global state and no thread waits on
+    another's figure. Useful in a web service where forking workers is
+    not an option. Drawing holds the GIL for much of its time, so expect
+    less speed-up than render_batch on CPU bound charts.
+
+    Example:
+    executor = ThreadPoolExecutor(max_workers=4)
+    report = render_threaded(specs, frames={'orders': df},
+                             executor=executor)
+
+    Parameters
+    ----------
+
+        specs : list of dict
+            See render_batch.
+
+        frames : dict
+            {name: pd.DataFrame} shared by the specs, not copied.
+
+        max_workers : int, default None
+            Size of the pool created when no executor is given.
+
+        executor : concurrent.futures.Executor, default None
+            Long lived pool to reuse across calls.
+
+        cache : cache.RenderCache, default None
+            See render_chart.
+
+    Returns
+    -------
+
+        report : list of dict
+            See render_batch.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        futures = [executor.submit(_render_task, spec, frames, False, cache)
+                   for spec in specs]
+        report = [future.result() for future in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    _log_failures(report)
+
+    return report
@@ -0,0 +1,342 @@
+"""
+Opt-in on-disk cache of rendered charts.
+
+A chart is keyed on a hash of the data columns it uses, the plot
+function and its kwargs, the grid params, the retouch operations, the
+savefig kwargs, the rcParams and the library versions. The same chart
+from the same data slice is then a file read instead of a render.
+
+Example:
+cache = RenderCache('~/.cache/charts', max_bytes=500 * 2 ** 20)
+report = batch.render_batch(specs, frames={'orders': df}, cache=cache)
+cache.stats()
+"""
+import os
+import json
+import errno
+import hashlib
+import logging
+import tempfile
+import threading
+
+import numpy as np
+
+
+# bump to invalidate every entry written by older code
+CACHE_VERSION = 1
+
+# packages whose version changes the rendered output
+VERSIONED_PACKAGES = ['matplotlib', 'seaborn', 'pandas', 'numpy', 'scipy']
+
+# rcParams that differ between processes but not in the output
+IGNORED_RCPARAMS = ['backend', 'backend_fallback', 'interactive']
+
+SUFFIX = '.chart'
+
+
+def _package_versions():
+    from importlib import metadata
+
+    versions = dict()
+    for package in VERSIONED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def _callable_name(func):
+    """
+    module.qualname of a module level function or class, None for
+    lambdas, local functions, partials, ... whose name isn't unique.
+    """
+    module = getattr(func, '__module__', None)
+    qualname = getattr(func, '__qualname__', None)
+    if module is None or qualname is None or '<' in qualname:
+        return None
+    return '{}.{}'.format(module, qualname)
+
+
+def _plot_name(func):
+    if callable(func):
+        return _stable(func)
+    return 'seabornextends.plots.{}'.format(func)
+
+
+def _stable(value):
+    """
+    JSON serializable form of value that is the same in every process,
+    for json.dumps(default=_stable). Raises ValueError for values
+    without one, e.g. lambdas, instead of keying on their address.
+    """
+    import datetime
+
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, 'by_key'):
+        # cycler, e.g. the axes.prop_cycle rcParam
+        return value.by_key()
+    if callable(value) and _callable_name(value) is not None:
+        return _callable_name(value)
+
+    msg = ("{!r} in a cached spec has no stable serialization, use a "
+           "module level function or plain values").format(value)
+    logging.error(msg)
+    raise ValueError(msg)
+
+
+def _operations(retouch):
+    """
+    Retouch operations as (name, kwargs) pairs, from a list or a
+    RetouchPlan.
+    """
+    return [list(op) for op in getattr(retouch, 'operations', retouch)]
+
+
+def used_columns(plot_kws, data, grid_kws=None):
+    """
+    Columns of data named by the plot kwargs (x, y, a, hue, col, ...)
+    and by the grid params retouch operations read (e.g. highlight
+    estimates), string or not.
+    """
+    columns = list()
+    for kws in [plot_kws, grid_kws or dict()]:
+        for value in kws.values():
+            if isinstance(value, bool):
+                continue
+            try:
+                named = value in data.columns
+            except TypeError:
+                # unhashable, e.g. a list of levels
+                continue
+            if named and value not in columns:
+                columns.append(value)
+    return columns
+
+
+def data_digest(data, columns=None):
+    """
+    Hash of the values, dtypes and names of columns of data, not of
+    the index.
+    """
+    import pandas as pd
+
+    columns = list(data.columns) if columns is None else list(columns)
+    digest = hashlib.sha256()
+    digest.update(repr([(column, str(data[column].dtype))
+                        for column in columns]).encode())
+    digest.update(np.int64(len(data)).tobytes())
+    for column in columns:
+        hashed = pd.util.hash_pandas_object(data[column], index=False)
+        digest.update(np.ascontiguousarray(hashed.values).tobytes())
+    return digest.hexdigest()
+
+
+class RenderCache(object):
+    """
+    Rendered chart bytes on local disk, one file per key, evicted least
+    recently used first once the directory holds more than max_bytes.
+
+    Entries are written to a temporary file and renamed, so a reader
+    (another thread or process sharing the directory) sees a whole entry
+    or none. A hit touches the entry's mtime, the eviction order.
+
+    Invalidation: the key covers everything that changes the output,
+    including the library versions and rcParams, so stale entries are
+    never returned, only left to be evicted. invalidate(key) drops one
+    entry, clear() all of them, CACHE_VERSION all entries of older code.
+
+    Parameters
+    ----------
+
+        directory : str
+
+        max_bytes : int, default 256 MB
+            Size of the directory above which entries are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 2 ** 20):
+
+        if max_bytes <= 0:
+            msg = "max_bytes must be positive but is {}".format(max_bytes)
+            logging.error(msg)
+            raise ValueError(msg)
+
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+
+        try:
+            os.makedirs(self.directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def __getstate__(self):
+        # sent to worker processes, which count their own stats
+        state = self.__dict__.copy()
+        state.pop('_lock')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def key(self, spec, data):
+        """
+        Key of a render_chart spec on data, see batch.render_chart.
+        """
+        import matplotlib as mpl
+
+        plot_kws = spec.get('plot_kws', dict())
+        path = spec.get('path')
+        savefig_kws = dict(spec.get('savefig_kws', dict()))
+        savefig_kws.setdefault(
+            'format', os.path.splitext(path)[1][1:].lower() if path else None)
+
+        meta = {
+            'version': CACHE_VERSION,
+            'packages': _package_versions(),
+            'plot': _plot_name(spec['plot']),
+            'plot_kws': plot_kws,
+            'grid_kws': spec.get('grid_kws'),
+            'retouch': _operations(spec.get('retouch', list())),
+            'savefig_kws': savefig_kws,
+            'rcparams': [(name, mpl.rcParams[name])
+                         for name in sorted(mpl.rcParams)
+                         if name not in IGNORED_RCPARAMS],
+        }
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps(meta, sort_keys=True,
+                                 default=_stable).encode())
+        columns = used_columns(plot_kws, data, spec.get('grid_kws'))
+        digest.update(data_digest(data, columns).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Cached bytes of key, None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except (IOError, OSError):
+            self._count('misses')
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            # evicted meanwhile, the bytes are still good
+            pass
+        self._count('hits')
+        return content
+
+    def put(self, key, content):
+        """
+        Store content under key, then evict down to max_bytes.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._count('writes')
+        self.evict()
+
+    def _entries(self):
+        entries = list()
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            # removed by another process
+            return False
+        return True
+
+    def evict(self, max_bytes=None):
+        """
+        Remove the least recently used entries until the directory
+        holds at most max_bytes (default self.max_bytes).
+
+        Returns
+        -------
+
+            n_evicted : int
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        n_evicted = 0
+        for _, size, name in sorted(entries):
+            if total <= max_bytes:
+                break
+            if self._remove(name):
+                n_evicted += 1
+            total -= size
+
+        if n_evicted:
+            self._count('evictions', n_evicted)
+            logging.debug("evicted {} cached charts".format(n_evicted))
+        return n_evicted
+
+    def invalidate(self, key):
+        """
+        Drop the entry of key, True if there was one.
+        """
+        return self._remove(key + SUFFIX)
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        for _, _, name in self._entries():
+            self._remove(name)
+
+    def stats(self):
+        """
+        Hits, misses, writes and evictions of this instance, entries
+        and bytes of the directory.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        entries = self._entries()
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] * 1.0 / lookups if lookups else None
+        return stats
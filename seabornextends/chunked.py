@@ -0,0 +1,520 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from seabornextends import stats
+
+
+# rows read per chunk from Parquet/CSV files
+CHUNKSIZE = 10 ** 6
+
+
+def read_chunks(source, columns=None, chunksize=None):
+    """
+    DataFrame chunks of source.
+
+    Parameters
+    ----------
+
+        source : pd.DataFrame, iterable of pd.DataFrame or str
+            A path ending in .parquet or .pq is read by record batches
+            (needs pyarrow), any other path with pd.read_csv.
+
+        columns : list, default None
+            Columns to read, all if None.
+
+        chunksize : int, default CHUNKSIZE
+            Rows per chunk read from a file.
+    """
+
+    chunksize = chunksize or CHUNKSIZE
+
+    if isinstance(source, pd.DataFrame):
+        yield source if columns is None else source[columns]
+        return
+
+    if not isinstance(source, str):
+        for chunk in source:
+            yield chunk if columns is None else chunk[columns]
+        return
+
+    if source.endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            msg = "reading {} in chunks needs pyarrow".format(source)
+            logging.error(msg)
+            raise ImportError(msg)
+
+        for batch in pq.ParquetFile(source).iter_batches(
+                batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    for chunk in pd.read_csv(source, usecols=columns, chunksize=chunksize):
+        yield chunk
+
+
+class QuantileSketch(object):
+
+    """
+    Mergeable quantile sketch of a stream of values (a KLL style
+    compactor hierarchy).
+
+    Level h keeps values standing for 2 ** h values each. A level
+    holding more than k values is sorted and every other value (from a
+    random offset) moves up a level. Memory is O(k log(n / k)) and the
+    rank error of a quantile about 1 / k, whatever the scale of the
+    values. count, sum, min, max and the n_tail most extreme values on
+    each side are exact.
+    """
+
+    def __init__(self, k=2048, n_tail=1000, seed=0):
+        self.k = k
+        self.n_tail = n_tail
+        self.count = 0
+        self.sum = 0.
+        self.min = np.inf
+        self.max = -np.inf
+        self.low = np.empty(0)
+        self.high = np.empty(0)
+        self.levels = list()
+        self._random = np.random.RandomState(seed)
+
+    def _add(self, level, values):
+        if level == len(self.levels):
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+        if len(self.levels[level]) > self.k:
+            self._compact(level)
+
+    def _compact(self, level):
+        items = np.sort(self.levels[level])
+        n_even = len(items) - len(items) % 2
+        promoted = items[:n_even][self._random.randint(2)::2]
+        self.levels[level] = items[n_even:]
+        self._add(level + 1, promoted)
+
+    def _tails(self, low, high):
+        if len(low) > self.n_tail:
+            low = np.partition(low, self.n_tail - 1)[:self.n_tail]
+        if len(high) > self.n_tail:
+            high = np.partition(high, -self.n_tail)[-self.n_tail:]
+        self.low, self.high = low, high
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+
+        self.count += len(values)
+        self.sum += values.sum()
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._tails(np.concatenate([self.low, values]),
+                    np.concatenate([self.high, values]))
+        self._add(0, values)
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._tails(np.concatenate([self.low, other.low]),
+                    np.concatenate([self.high, other.high]))
+        for level, items in enumerate(other.levels):
+            self._add(level, items)
+        return self
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(values), 2. ** level)
+                                  for level, values in
+                                  enumerate(self.levels)])
+        order = np.argsort(items)
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """
+        Approximate quantiles, q in [0, 1], nan if empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if not self.count:
+            return np.full(q.shape, np.nan)
+
+        items, weights = self._weighted_items()
+        position = (np.cumsum(weights) - weights / 2.) / weights.sum()
+        return np.interp(q,
+                         np.concatenate([[0.], position, [1.]]),
+                         np.concatenate([[self.min], items, [self.max]]))
+
+    def box_stats(self, whis=1.5):
+        """
+        Box plot statistics like stats.grouped_box_stats: quartiles
+        from the sketch, whiskers at the most extreme kept value within
+        whis * IQR, fliers from the exact tails.
+        """
+        if not self.count:
+            box = dict((column, np.nan) for column in
+                       ['count', 'mean'] + stats.BOX_STATS_COLUMNS)
+            box['fliers'] = np.empty(0)
+            return box
+
+        q1, med, q3 = self.quantile([.25, .5, .75])
+        lo_fence = q1 - whis * (q3 - q1)
+        hi_fence = q3 + whis * (q3 - q1)
+
+        kept = np.concatenate(self.levels + [self.low, self.high])
+        inside = kept[(kept >= lo_fence) & (kept <= hi_fence)]
+        fliers = np.unique(np.concatenate([
+            self.low[self.low < lo_fence], self.high[self.high > hi_fence]]))
+
+        return {'count': self.count,
+                'mean': self.sum / self.count,
+                'whislo': inside.min() if len(inside) else q1,
+                'q1': q1,
+                'med': med,
+                'q3': q3,
+                'whishi': inside.max() if len(inside) else q3,
+                'fliers': fliers}
+
+
+class StreamingHistogram(object):
+
+    """
+    Per group histogram of a stream of values.
+
+    With edges the counts are exact on these edges. Without, values
+    are counted on a fine grid of at most n_fine bins whose width is a
+    power of two, doubled (merging pairs of bins) whenever the values
+    outgrow it, and rebinned at the end.
+    """
+
+    def __init__(self, edges=None, n_fine=4096):
+        self.edges = None if edges is None else np.asarray(edges, float)
+        self.n_fine = n_fine
+        self.width = None
+        self.origin = 0
+        self.used = None
+        n_bins = n_fine if self.edges is None else len(self.edges) - 1
+        self.counts = np.zeros((0, n_bins))
+
+    def _add_groups(self, n_groups):
+        if n_groups > len(self.counts):
+            self.counts = np.vstack([
+                self.counts,
+                np.zeros((n_groups - len(self.counts),
+                          self.counts.shape[1]))])
+
+    def _coarsen(self):
+        n_groups, n_bins = self.counts.shape
+        columns = (self.origin + np.arange(n_bins)) // 2
+        self.origin //= 2
+        self.width *= 2
+        if self.used is not None:
+            self.used = (self.used[0] // 2, self.used[1] // 2)
+        self.counts = self._moved(columns - self.origin)
+
+    def _moved(self, columns):
+        """
+        Counts with old column i added to column columns[i].
+        """
+        n_groups, n_bins = self.counts.shape
+        inside = (columns >= 0) & (columns < n_bins)
+        flat = np.arange(n_groups)[:, None] * n_bins + columns[inside]
+        return np.bincount(flat.ravel(),
+                           weights=self.counts[:, inside].ravel(),
+                           minlength=n_groups * n_bins).reshape(
+                               n_groups, n_bins)
+
+    def update(self, values, codes, n_groups):
+        values = np.asarray(values, dtype=np.float64)
+        codes = np.asarray(codes)
+        keep = (codes >= 0) & np.isfinite(values)
+        values, codes = values[keep], codes[keep]
+        self._add_groups(n_groups)
+        if not len(values):
+            return self
+
+        if self.edges is not None:
+            self.counts += stats.grouped_histogram(values, codes,
+                                                   len(self.counts),
+                                                   self.edges)
+            return self
+
+        lo, hi = values.min(), values.max()
+        if self.width is None:
+            span = hi - lo if hi > lo else max(abs(lo), 1.)
+            self.width = 2. ** np.floor(np.log2(span / self.n_fine))
+            self.origin = int(np.floor(lo / self.width))
+
+        while True:
+            first = int(np.floor(lo / self.width))
+            last = int(np.floor(hi / self.width))
+            if self.used is not None:
+                first = min(first, self.used[0])
+                last = max(last, self.used[1])
+            if last - first < self.n_fine:
+                break
+            self._coarsen()
+
+        self.used = (first, last)
+        if first < self.origin or last >= self.origin + self.n_fine:
+            columns = np.arange(self.n_fine) + self.origin - first
+            self.origin = first
+            self.counts = self._moved(columns)
+
+        columns = np.floor(values / self.width).astype(np.int64) - \
+            self.origin
+        n_bins = self.n_fine
+        self.counts += np.bincount(codes * n_bins + columns,
+                                   minlength=len(self.counts) * n_bins
+                                   ).reshape(len(self.counts), n_bins)
+        return self
+
+    def fine(self):
+        """
+        Edges and counts (one row per group) of the used bins.
+        """
+        if self.edges is not None:
+            return self.edges, self.counts
+        if self.used is None:
+            return np.empty(0), self.counts[:, :0]
+        first = self.used[0] - self.origin
+        last = self.used[1] - self.origin + 1
+        edges = (np.arange(self.used[0], self.used[1] + 2) * self.width)
+        return edges, self.counts[:, first:last]
+
+    def histogram(self, bins=None, max_bins=50):
+        """
+        Edges shared by all groups and counts on them.
+
+        Parameters
+        ----------
+
+            bins : int, default None
+                At most this many bins (whole fine bins are merged).
+                If None uses the Freedman-Diaconis rule on all values,
+                capped at max_bins, like stats.shared_bin_edges.
+        """
+        edges, counts = self.fine()
+        if self.edges is not None or not len(edges):
+            return edges, counts
+
+        n_fine = len(edges) - 1
+        if bins is None:
+            total = counts.sum(axis=0)
+            cum = np.cumsum(total) / total.sum()
+            q25, q75 = np.interp([.25, .75], cum, edges[1:])
+            h = 2 * (q75 - q25) / (total.sum() ** (1. / 3))
+            span = edges[-1] - edges[0]
+            bins = int(np.ceil(span / h)) if h > 0 else \
+                int(np.sqrt(total.sum()))
+            bins = max(min(bins, max_bins), 1)
+
+        merge = int(np.ceil(n_fine / float(bins)))
+        columns = np.arange(n_fine) // merge
+        n_bins = columns[-1] + 1
+        coarse = np.zeros((len(counts), n_bins))
+        for group in range(len(counts)):
+            coarse[group] = np.bincount(columns, weights=counts[group],
+                                        minlength=n_bins)
+        coarse_edges = np.append(edges[::merge][:n_bins], edges[-1])
+        return coarse_edges, coarse
+
+
+class FacetAggregator(object):
+
+    """
+    Streaming aggregates of one column per facet and hue level.
+
+    Chunks are split by the facet columns (by), groups are numbered in
+    order of first appearance, like the levels FacetGrid derives from
+    the data.
+    """
+
+    def __init__(self, a, by, histogram=False, sketch=False, edges=None,
+                 n_fine=4096, k=2048):
+        self.a = a
+        self.by = list(by)
+        self.keys = dict()
+        self.dtypes = dict()
+        self.histogram = StreamingHistogram(edges, n_fine) \
+            if histogram else None
+        self.sketches = list() if sketch else None
+        self.k = k
+
+    def _codes(self, chunk):
+        if not self.by:
+            if not self.keys:
+                self.keys[()] = 0
+            return np.zeros(len(chunk), dtype=np.intp)
+
+        for column in self.by:
+            self.dtypes.setdefault(column, chunk[column].dtype)
+
+        factorized = [pd.factorize(chunk[column].values)
+                      for column in self.by]
+        shape = [max(len(uniques), 1) for _, uniques in factorized]
+        codes = np.full(len(chunk), -1, dtype=np.intp)
+        valid = np.all([c >= 0 for c, _ in factorized], axis=0)
+        if not valid.any():
+            return codes
+
+        combined = np.ravel_multi_index([c[valid] for c, _ in factorized],
+                                        shape)
+        combos, first, inverse = np.unique(combined, return_index=True,
+                                           return_inverse=True)
+
+        # number new keys in order of first appearance
+        global_codes = np.empty(len(combos), dtype=np.intp)
+        for idx in np.argsort(first):
+            key = tuple(uniques[level] for (_, uniques), level in
+                        zip(factorized,
+                            np.unravel_index(combos[idx], shape)))
+            global_codes[idx] = self.keys.setdefault(key, len(self.keys))
+
+        codes[valid] = global_codes[inverse.ravel()]
+        return codes
+
+    def update(self, chunk):
+        values = chunk[self.a].values.astype(np.float64)
+        codes = self._codes(chunk)
+        n_groups = len(self.keys)
+
+        if self.histogram is not None:
+            self.histogram.update(values, codes, n_groups)
+
+        if self.sketches is not None:
+            while len(self.sketches) < n_groups:
+                self.sketches.append(QuantileSketch(k=self.k))
+            codes[np.isnan(values)] = -1
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+            values = values[order]
+            for group in np.flatnonzero(np.diff(bounds)):
+                self.sketches[group].update(
+                    values[bounds[group]:bounds[group + 1]])
+        return self
+
+    def consume(self, chunks):
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def facet_frame(self, repeats=1):
+        """
+        Facet columns of every group, each repeated repeats times.
+        """
+        keys = sorted(self.keys, key=self.keys.get)
+        repeats = np.broadcast_to(repeats, len(keys))
+        frame = pd.DataFrame(
+            dict((column, np.repeat(np.array([key[idx] for key in keys],
+                                             dtype=object), repeats))
+                 for idx, column in enumerate(self.by)),
+            columns=self.by)
+        for column, dtype in self.dtypes.items():
+            frame[column] = frame[column].astype(dtype)
+        return frame
+
+
+def _facet_vars(by):
+    return [var for var in by if var is not None]
+
+
+def histogram_summary(source, a, by=(), bins=None, chunksize=None):
+    """
+    Per facet bin counts of column a in one pass over source, the
+    layout of the distplot 'summary' engine (stats.HIST_COLUMNS).
+
+    Parameters
+    ----------
+
+        source : pd.DataFrame, iterable of pd.DataFrame or path
+            See read_chunks.
+
+        by : list
+            Facet columns (row, col, hue).
+
+        bins : int or array, default None
+            Edges give exact counts on them, an int at most that many
+            shared bins, None the Freedman-Diaconis rule.
+    """
+    by = _facet_vars(by)
+    edges = bins if bins is not None and np.ndim(bins) == 1 else None
+    aggregator = FacetAggregator(a, by, histogram=True, edges=edges)
+    aggregator.consume(read_chunks(source, [a] + by, chunksize))
+
+    edges, counts = aggregator.histogram.histogram(
+        bins=None if edges is not None else bins)
+    n_bins = len(edges) - 1
+
+    summary = aggregator.facet_frame(n_bins)
+    summary['bin_left'] = np.tile(edges[:-1], len(counts))
+    summary['bin_right'] = np.tile(edges[1:], len(counts))
+    summary['count'] = counts.ravel()
+    return summary
+
+
+def box_summary(source, a, by=(), whis=1.5, chunksize=None):
+    """
+    Per facet box plot statistics of column a in one pass over source
+    from mergeable quantile sketches, the layout of the boxplot
+    'summary' engine (stats.BOX_STATS_COLUMNS, count, mean, fliers).
+    """
+    by = _facet_vars(by)
+    aggregator = FacetAggregator(a, by, sketch=True)
+    aggregator.consume(read_chunks(source, [a] + by, chunksize))
+
+    summary = aggregator.facet_frame()
+    box_stats = pd.DataFrame([sketch.box_stats(whis)
+                              for sketch in aggregator.sketches],
+                             columns=['count', 'mean'] +
+                             stats.BOX_STATS_COLUMNS + ['fliers'])
+    return pd.concat([summary, box_stats], axis=1)
+
+
+def violin_summary(source, a, by=(), bw='scott', gridsize=100, cut=2,
+                   chunksize=None, n_fine=4096):
+    """
+    Per facet densities and inner box statistics of column a in one
+    pass over source, the layout of the violinplot 'summary' engine
+    (stats.DENSITY_COLUMNS plus stats.BOX_STATS_COLUMNS).
+
+    Densities are KDEs of the fine streaming histogram, the bin
+    centers weighted by their counts. The fine bins are shared by all
+    facets, raise n_fine when facets cover very different ranges.
+    """
+    by = _facet_vars(by)
+    aggregator = FacetAggregator(a, by, histogram=True, sketch=True,
+                                 n_fine=n_fine)
+    aggregator.consume(read_chunks(source, [a] + by, chunksize))
+
+    edges, counts = aggregator.histogram.fine()
+    n_groups = len(counts)
+    centers = (edges[:-1] + edges[1:]) / 2.
+    supports, densities = stats.grouped_kde(
+        np.tile(centers, n_groups),
+        np.repeat(np.arange(n_groups), len(centers)),
+        n_groups,
+        bw=bw,
+        gridsize=gridsize,
+        cut=cut,
+        weights=counts.ravel())
+
+    rows = [0 if support is None else len(support) for support in supports]
+    summary = aggregator.facet_frame(rows)
+    filled = [support for support in supports if support is not None]
+    summary['support'] = np.concatenate(filled) if filled else []
+    summary['density'] = np.concatenate(
+        [d for d in densities if d is not None]) if filled else []
+
+    box_stats = pd.DataFrame([sketch.box_stats()
+                              for sketch in aggregator.sketches],
+                             columns=stats.BOX_STATS_COLUMNS)
+    box_stats = box_stats.loc[np.repeat(np.arange(n_groups), rows)]
+    for column in stats.BOX_STATS_COLUMNS:
+        summary[column] = box_stats[column].values
+    return summary
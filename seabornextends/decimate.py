@@ -0,0 +1,193 @@
+import logging
+import numpy as np
+
+
+VALID_METHODS = ['minmax', 'lttb']
+
+
+def _as_float(x):
+    """
+    Float view of x values, datetime64 are taken as int64 ticks.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.view('i8').astype(np.float64)
+    return x.astype(np.float64)
+
+
+def _bucket_edges(x, n_buckets):
+    """
+    Start index of every non empty bucket when the x range of
+    a sorted x is split into n_buckets equal intervals.
+    """
+    x0, x1 = x[0], x[-1]
+    if x1 <= x0:
+        return np.array([0])
+
+    edges = np.linspace(x0, x1, n_buckets + 1)[1:-1]
+    starts = np.concatenate([[0], np.searchsorted(x, edges, side='left')])
+
+    # drop empty buckets, reduceat expects strictly increasing starts
+    starts = starts[np.concatenate([[True], np.diff(starts) > 0])]
+    return starts[starts < len(x)]
+
+
+def _first_match(mask, bucket):
+    """
+    Index of the first True in mask for each bucket that has one.
+    """
+    idx = np.flatnonzero(mask)
+    _, first = np.unique(bucket[idx], return_index=True)
+    return idx[first]
+
+
+def minmax_index(x, y, n_buckets):
+    """
+    Indices to keep so that a line looks the same at n_buckets pixels.
+
+    Splits x into n_buckets equal intervals (one per pixel column) and
+    keeps the first, last, min and max point of every interval, so peaks
+    stay visible.
+
+    Parameters
+    ----------
+
+        x : array
+            Sorted x values.
+
+        y : array
+            y values, nans are ignored when looking for min/max.
+
+        n_buckets : int
+            Number of intervals, usually the width of the ax in pixels.
+    """
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    starts = _bucket_edges(x, n_buckets)
+    counts = np.diff(np.append(starts, len(x)))
+    bucket = np.repeat(np.arange(len(starts)), counts)
+
+    mins = np.fmin.reduceat(y, starts)
+    maxs = np.fmax.reduceat(y, starts)
+
+    with np.errstate(invalid='ignore'):
+        min_idx = _first_match(y == mins[bucket], bucket)
+        max_idx = _first_match(y == maxs[bucket], bucket)
+
+    last_idx = np.append(starts[1:], len(x)) - 1
+
+    return np.unique(np.concatenate([starts, last_idx, min_idx, max_idx]))
+
+
+def lttb_index(x, y, n_out):
+    """
+    Indices picked by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, for each of the n_out - 2
+    buckets in between, the point that forms the largest triangle with
+    the point kept in the previous bucket and the mean of the next one.
+    Triangle areas are computed for a whole bucket at once.
+
+    Parameters
+    ----------
+
+        x : array
+            Sorted x values.
+
+        y : array
+            y values, must not contain nans.
+
+        n_out : int
+            Number of points to keep.
+    """
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # bucket boundaries for the n - 2 inner points
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    # mean of every bucket, used as the third point of the triangle
+    sums_x = np.add.reduceat(x[:-1], bounds[:-1])
+    sums_y = np.add.reduceat(y[:-1], bounds[:-1])
+    sizes = np.diff(bounds)
+    means_x = np.append(sums_x / sizes, x[-1])
+    means_y = np.append(sums_y / sizes, y[-1])
+
+    index = np.empty(n_out, dtype=np.intp)
+    index[0] = 0
+    index[-1] = n - 1
+
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = bounds[b], bounds[b + 1]
+        ax_, ay_ = x[prev], y[prev]
+        cx, cy = means_x[b + 1], means_y[b + 1]
+        area = np.abs((ax_ - cx) * (y[lo:hi] - ay_) -
+                      (ax_ - x[lo:hi]) * (cy - ay_))
+        prev = lo + np.argmax(area)
+        index[b + 1] = prev
+
+    return index
+
+
+def downsample_index(x, y, method='minmax', n_out=1000):
+    """
+    Indices of the points of a line worth drawing at n_out pixels.
+
+    Parameters
+    ----------
+
+        x : array
+            x values, must be sorted, otherwise nothing is dropped.
+
+        y : array
+
+        method : str, default 'minmax'
+            One of 'minmax' or 'lttb'.
+
+        n_out : int, default 1000
+            Target resolution in pixels.
+    """
+
+    if method not in VALID_METHODS:
+        msg = "method must be one of {} but is {}".format(VALID_METHODS,
+                                                          method)
+        logging.error(msg)
+        raise ValueError(msg)
+
+    n = len(x)
+    n_out = int(n_out)
+
+    if n <= 2 * n_out:
+        return np.arange(n)
+
+    xf = _as_float(x)
+    if np.any(np.diff(xf) < 0):
+        logging.debug("x is not sorted, skipping downsampling")
+        return np.arange(n)
+
+    if method == 'minmax':
+        return minmax_index(xf, y, n_out)
+
+    yf = np.asarray(y, dtype=np.float64)
+    if np.isnan(yf).any():
+        # lttb can't rank nans, keep them as gaps via minmax
+        return minmax_index(xf, yf, n_out)
+
+    return lttb_index(xf, yf, n_out)
+
+
+def ax_pixel_width(ax, dpi=None):
+    """
+    Width of an ax in pixels when the figure is rendered at dpi.
+    """
+    fig = ax.figure
+    dpi = dpi or fig.dpi
+    return int(np.ceil(ax.get_position().width * fig.get_figwidth() * dpi))
@@ -0,0 +1,351 @@
+"""
+Opt-in timing of plots functions and retoucher methods.
+
+Nothing is recorded unless a recorder is active in the current thread,
+the instrumented functions then only pay for one global lookup.
+
+Example:
+with instrument.record(hook=send_to_statsd) as recorder:
+    grid = plots.distplot(a='order_value', data=df, col='scale')
+    retoucher = FacetGridRetoucher(grid)
+    retoucher.set_lim(axis='xaxis', left=0)
+    retoucher.fig.set_tight_layout()
+
+recorder.report()['operations']['FacetGridRetoucher.set_lim']
+recorder.to_frame().groupby('name')['seconds'].sum()
+"""
+import logging
+import functools
+import threading
+import contextlib
+import tracemalloc
+from collections import OrderedDict
+from timeit import default_timer
+
+import matplotlib as mpl
+import matplotlib.axes
+import matplotlib.figure
+
+
+EVENT_COLUMNS = ['name', 'facet', 'parent', 'depth', 'start', 'seconds',
+                 'artists', 'artists_added', 'memory', 'error']
+
+# number of active recorders over all threads, 0 skips every lookup
+_ACTIVE = 0
+_ACTIVE_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def _recorder():
+    if not _ACTIVE:
+        return None
+    return getattr(_LOCAL, 'recorder', None)
+
+
+def _figure(obj):
+    """
+    Figure behind a retoucher, grid, ax or figure, None if there is none.
+    """
+    if isinstance(obj, mpl.figure.Figure):
+        return obj
+    for attr in ['_fig', 'fig', 'figure']:
+        fig = getattr(obj, attr, None)
+        if isinstance(fig, mpl.figure.Figure):
+            return fig
+    return None
+
+
+def _ax(obj):
+    """
+    The ax of an AxRetoucher or the ax itself, None otherwise.
+    """
+    ax = getattr(obj, 'ax', obj)
+    if isinstance(ax, mpl.axes.Axes) and ax.figure is not None:
+        return ax
+    return None
+
+
+def _count_artists(target):
+    """
+    Artists of an ax, or of all the axes of a figure.
+    """
+    if target is None:
+        return None
+    if isinstance(target, mpl.axes.Axes):
+        return len(target.get_children())
+    return (sum(len(ax.get_children()) for ax in target.axes) +
+            len(target.texts) + len(target.legends))
+
+
+def _facet(ax):
+    """
+    Position of ax in its figure.
+    """
+    if ax is None:
+        return None
+    try:
+        return ax.figure.axes.index(ax)
+    except ValueError:
+        return None
+
+
+class Recorder(object):
+
+    """
+    Events of the instrumented calls made in one thread, see record.
+    """
+
+    def __init__(self, hook=None, memory=False):
+        self.hook = hook
+        self.memory = memory
+        self.events = list()
+        self._stack = list()
+        self._tracing = False
+
+    def start(self):
+        global _ACTIVE
+
+        if getattr(_LOCAL, 'recorder', None) is not None:
+            msg = "a recorder is already active in this thread"
+            logging.error(msg)
+            raise RuntimeError(msg)
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        _LOCAL.recorder = self
+        with _ACTIVE_LOCK:
+            _ACTIVE += 1
+
+    def stop(self):
+        global _ACTIVE
+
+        _LOCAL.recorder = None
+        with _ACTIVE_LOCK:
+            _ACTIVE -= 1
+
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def _enter(self, name, facet=None, target=None):
+        frame = {'name': name,
+                 'facet': facet,
+                 'target': target,
+                 'artists': _count_artists(target),
+                 'memory': None}
+
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent['peak'] = max(parent.get('peak', 0), peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+                peak = current
+            frame['memory'] = current
+            frame['peak'] = peak
+
+        self._stack.append(frame)
+        frame['start'] = default_timer()
+        return frame
+
+    def _exit(self, frame, target=None, error=False):
+        seconds = default_timer() - frame['start']
+        self._stack.pop()
+
+        artists = _count_artists(target or frame['target'])
+        added = None
+        if artists is not None:
+            added = artists - (frame['artists'] or 0)
+
+        memory = None
+        if frame['memory'] is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame.get('peak', 0))
+            memory = peak - frame['memory']
+            if self._stack:
+                parent = self._stack[-1]
+                parent['peak'] = max(parent.get('peak', 0), peak)
+
+        event = {'name': frame['name'],
+                 'facet': frame['facet'],
+                 'parent': self._stack[-1]['name'] if self._stack else None,
+                 'depth': len(self._stack),
+                 'start': frame['start'],
+                 'seconds': seconds,
+                 'artists': artists,
+                 'artists_added': added,
+                 'memory': memory,
+                 'error': error}
+        self.events.append(event)
+
+        if self.hook is not None:
+            try:
+                self.hook(event)
+            except Exception:
+                logging.exception("instrument hook failed")
+
+    def report(self):
+        """
+        Totals per operation and per operation and facet.
+
+        Returns
+        -------
+
+            report : dict
+                operations: {name: {calls, seconds, max_seconds,
+                    artists_added, peak_memory}}
+                facets: {name: {facet: {same keys}}}
+                events: list of the recorded events.
+        """
+
+        def totals(events):
+            memory = [e['memory'] for e in events if e['memory'] is not None]
+            added = [e['artists_added'] for e in events
+                     if e['artists_added'] is not None]
+            return {'calls': len(events),
+                    'seconds': sum(e['seconds'] for e in events),
+                    'max_seconds': max(e['seconds'] for e in events),
+                    'artists_added': sum(added) if added else None,
+                    'peak_memory': max(memory) if memory else None}
+
+        by_name = OrderedDict()
+        for event in self.events:
+            by_name.setdefault(event['name'], list()).append(event)
+
+        operations = OrderedDict()
+        facets = OrderedDict()
+        for name, events in by_name.items():
+            operations[name] = totals(events)
+            by_facet = OrderedDict()
+            for event in events:
+                if event['facet'] is not None:
+                    by_facet.setdefault(event['facet'], list()).append(event)
+            if by_facet:
+                facets[name] = OrderedDict(
+                    (facet, totals(facet_events))
+                    for facet, facet_events in by_facet.items())
+
+        return {'operations': operations,
+                'facets': facets,
+                'events': list(self.events)}
+
+    def to_frame(self):
+        """
+        One row per recorded call, in the order the calls finished.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.events, columns=EVENT_COLUMNS)
+
+
+@contextlib.contextmanager
+def record(hook=None, memory=False):
+    """
+    Record the instrumented calls made in this thread.
+
+    Parameters
+    ----------
+
+        hook : callable, default None
+            Called with every event dict as soon as the call ends, e.g.
+            to forward timings to a metrics system. Errors raised by the
+            hook are logged, not raised.
+
+        memory : bool, default False
+            Track peak memory per call with tracemalloc, which slows
+            down everything while recording.
+    """
+    recorder = Recorder(hook=hook, memory=memory)
+    recorder.start()
+    try:
+        yield recorder
+    finally:
+        recorder.stop()
+
+
+@contextlib.contextmanager
+def span(name, facet=None, target=None):
+    """
+    Record a block of code as one operation, artists are counted on
+    target (an ax or a figure) if given.
+    """
+    recorder = _recorder()
+    if recorder is None:
+        yield
+        return
+
+    frame = recorder._enter(name, facet=facet, target=target)
+    error = True
+    try:
+        yield
+        error = False
+    finally:
+        recorder._exit(frame, error=error)
+
+
+def timed(name=None):
+    """
+    Record every call of the decorated function or method.
+
+    Artists are counted on the ax of an AxRetoucher (also giving the
+    facet), on the figure of other retouchers or on the figure of the
+    returned grid (plots functions).
+    """
+    def decorator(func):
+        op_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder()
+            if recorder is None:
+                return func(*args, **kwargs)
+
+            owner = args[0] if args else None
+            ax = _ax(owner)
+            frame = recorder._enter(op_name,
+                                    facet=_facet(ax),
+                                    target=ax or _figure(owner))
+            result, error = None, True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+            finally:
+                recorder._exit(frame, target=_figure(result), error=error)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def timed_methods(prefix):
+    """
+    Class decorator applying timed to every public method, recorded
+    as prefix.method.
+    """
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or not callable(value):
+                continue
+            setattr(cls, attr, timed('{}.{}'.format(prefix, attr))(value))
+        return cls
+    return decorator
+
+
+def per_facet(func, name):
+    """
+    func recording one event per facet when mapped onto a FacetGrid,
+    func itself when nothing is recording. func must be called with the
+    facet's ax as ax=.
+    """
+    if _recorder() is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, ax, **kwargs):
+        with span(name, facet=_facet(ax), target=ax):
+            return func(*args, ax=ax, **kwargs)
+
+    return wrapper
@@ -0,0 +1,319 @@
+"""
+Facet grids with too many facets for one figure, rendered page by page.
+
+Example:
+report = pages.render_pages(
+    spec={'plot': 'plot',
+          'plot_kws': {'x': 'timestamp', 'y': 'latency',
+                       'col': 'host', 'col_wrap': 4, 'hue': 'region'},
+          'retouch': [('set_lines_width', {'width': 1}),
+                      ('set_tight_layout', {})],
+          'path': 'charts/latency.pdf'},
+    data=df,
+    page_size=16)
+"""
+import os
+import logging
+from timeit import default_timer
+
+import numpy as np
+import pandas as pd
+
+from seabornextends import batch
+from seabornextends import instrument
+from seabornextends import utils
+
+
+VALID_LIMITS = ['shared', 'page']
+
+
+def _page_variable(plot_kws):
+    """
+    Facet variable split into pages: rows when facetted by row and col,
+    else the only one.
+    """
+    if plot_kws.get('row') is not None:
+        return 'row'
+    if plot_kws.get('col') is not None:
+        return 'col'
+    msg = "plot_kws must facet by row or col to render pages"
+    logging.error(msg)
+    raise ValueError(msg)
+
+
+def page_path(path, page):
+    """
+    path of a page in a series: path.format(page=page) if it has a
+    {page} field, else a zero padded page number before the extension.
+    """
+    if '{page' in path:
+        return path.format(page=page)
+    root, ext = os.path.splitext(path)
+    return '{}-{:03d}{}'.format(root, page, ext)
+
+
+def _sharing(plot_kws):
+    """
+    Axes whose limits are shared by all facets, so across pages too.
+    """
+    return [axis for axis, kw in [('x', 'sharex'), ('y', 'sharey')]
+            if plot_kws.get(kw, True) is True]
+
+
+def _view_limits(grid, axes):
+    limits = dict()
+    for axis in axes:
+        for ax in grid.axes.flat:
+            lo, hi = getattr(ax, 'get_{}lim'.format(axis))()
+            limits.setdefault(axis, list()).append((lo, hi))
+    return limits
+
+
+def _union(page_limits):
+    """
+    Union of view limits, keeping the direction of the first (e.g. a
+    y axis inverted by a horizontal boxplot).
+    """
+    limits = np.array(page_limits, dtype=np.float64)
+    lo, hi = np.nanmin(limits), np.nanmax(limits)
+    if limits[0, 0] > limits[0, 1]:
+        lo, hi = hi, lo
+    return (float(lo), float(hi))
+
+
+def _set_limits(grid, limits):
+    for ax in grid.axes.flat:
+        for axis, lim in limits.items():
+            getattr(ax, 'set_{}lim'.format(axis))(lim)
+
+
+class _Pages(object):
+    """
+    Page grids of a spec, built one at a time from one split of data.
+    """
+
+    def __init__(self, spec, data, page_size):
+
+        if not isinstance(data, pd.DataFrame):
+            msg = "data must be pd.DataFrame but is {}".format(type(data))
+            logging.error(msg)
+            raise ValueError(msg)
+
+        if page_size < 1:
+            msg = "page_size must be a positive int but is {}".format(
+                page_size)
+            logging.error(msg)
+            raise ValueError(msg)
+
+        from seabornextends import plots
+
+        self.func = spec['plot']
+        if not callable(self.func):
+            self.func = getattr(plots, self.func)
+
+        plot_kws = dict(spec.get('plot_kws', dict()))
+        self.variable = _page_variable(plot_kws)
+        column = plot_kws[self.variable]
+        order_kw = self.variable + '_order'
+
+        # levels shared by all pages, so colors and facets line up
+        levels = utils.categorical_levels(data[column],
+                                          plot_kws.pop(order_kw, None))
+        for var in ['row', 'col', 'hue']:
+            if var != self.variable and plot_kws.get(var) is not None:
+                plot_kws[var + '_order'] = utils.categorical_levels(
+                    data[plot_kws[var]], plot_kws.get(var + '_order'))
+
+        self.plot_kws = plot_kws
+        self.data = data
+        self.order_kw = order_kw
+        self.levels = levels
+        self.n_pages = int(np.ceil(len(levels) * 1. / page_size))
+        self.page_size = page_size
+
+        # one stable sort: rows of a page keep their order
+        codes = utils.level_codes(data[column], levels)
+        page_codes = np.where(codes >= 0, codes // page_size, -1)
+        self._order, self._bounds = plots._group_slices(page_codes,
+                                                        self.n_pages)
+
+    def __len__(self):
+        return self.n_pages
+
+    def rows(self, page=None):
+        """
+        Positions of the rows of a page, or of all pages.
+        """
+        if page is None:
+            return self._order[self._bounds[0]:self._bounds[-1]]
+        return self._order[self._bounds[page]:self._bounds[page + 1]]
+
+    def page_levels(self, page):
+        return self.levels[page * self.page_size:
+                           (page + 1) * self.page_size]
+
+    def grid(self, page):
+        """
+        Grid of the page-th page, off pyplot.
+        """
+        plot_kws = dict(self.plot_kws)
+        plot_kws[self.order_kw] = self.page_levels(page)
+        with instrument.span('pages.grid'):
+            return self.func(data=self.data.take(self.rows(page)),
+                             pyplot=False,
+                             **plot_kws)
+
+
+def _line_limits(pages, axes):
+    """
+    View limits of plots.plot without building the pages: lines
+    autoscale to their data range plus the axes margins. None if a
+    column isn't numeric or dates.
+    """
+    import matplotlib as mpl
+    import matplotlib.dates
+
+    limits = dict()
+    for axis in axes:
+        values = pages.data[pages.plot_kws[axis]].values.take(pages.rows())
+        if np.issubdtype(values.dtype, np.datetime64):
+            values = mpl.dates.date2num(values)
+        elif not np.issubdtype(values.dtype, np.number):
+            return None
+        values = values.astype(np.float64)
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        margin = mpl.rcParams['axes.{}margin'.format(axis)] * (hi - lo)
+        limits[axis] = (float(lo - margin), float(hi + margin))
+    return limits
+
+
+@instrument.timed('pages.shared_limits')
+def shared_limits(spec, data, page_size=16):
+    """
+    Union of the view limits of all pages of spec on data: every page is
+    built (not drawn) once and closed. Lines of plots.plot are limited
+    by their data range, computed without building any page.
+
+    Returns
+    -------
+
+        limits : dict
+            {'x': (lo, hi), 'y': (lo, hi)} for the axes the facets share,
+            can be passed to render_pages as limits.
+    """
+    from seabornextends import plots
+
+    pages = _Pages(spec, data, page_size)
+    axes = _sharing(pages.plot_kws)
+
+    if pages.func is plots.plot:
+        limits = _line_limits(pages, axes)
+        if limits is not None:
+            return limits
+
+    page_limits = dict()
+    for page in range(len(pages)):
+        grid = pages.grid(page)
+        for axis, limits in _view_limits(grid, axes).items():
+            page_limits.setdefault(axis, list()).extend(limits)
+        del grid
+
+    return {axis: _union(limits) for axis, limits in page_limits.items()}
+
+
+@instrument.timed('pages.render_pages')
+def render_pages(spec, data, page_size=16, limits='shared'):
+    """
+    Render a facet grid spec one page of page_size facets at a time,
+    into a multipage PDF or a series of image files.
+
+    Each page is built off pyplot, retouched with the same RetouchPlan,
+    written and dropped before the next one, so peak memory depends on
+    page_size and not on the number of facets. Pages get the same facet,
+    hue and level orders, and the same limits on the axes the facets
+    share.
+
+    Parameters
+    ----------
+
+        spec : dict
+            See batch.render_chart. plot_kws must facet by col (pages of
+            page_size columns, use col_wrap to fold them) or by row
+            (pages of page_size rows). path ending with .pdf writes one
+            multipage PDF, any other path a series of files, see
+            page_path.
+
+        data : pd.DataFrame
+
+        page_size : int, default 16
+            Levels of the paginated facet variable per page.
+
+        limits : str or dict, default 'shared'
+            'shared' builds every page once first to find the union of
+            their limits, see shared_limits. 'page' lets each page
+            autoscale. A dict as returned by shared_limits, e.g.
+            {'y': (0, 100)}, skips the first pass.
+
+    Returns
+    -------
+
+        report : dict
+            pages: list of {page, levels, path, seconds}.
+            limits: the limits applied to every page.
+    """
+    from seabornextends.retouch.plan import RetouchPlan
+
+    if not isinstance(limits, dict) and limits not in VALID_LIMITS:
+        msg = "limits must be a dict or one of {} but is {}".format(
+            VALID_LIMITS, limits)
+        logging.error(msg)
+        raise ValueError(msg)
+
+    pages = _Pages(spec, data, page_size)
+
+    if limits == 'shared':
+        limits = shared_limits(spec, data, page_size=page_size)
+    elif limits == 'page':
+        limits = dict()
+
+    retouch = spec.get('retouch', list())
+    plan = retouch if isinstance(retouch, RetouchPlan) \
+        else RetouchPlan(retouch)
+    savefig_kws = spec.get('savefig_kws', dict())
+
+    path = spec['path']
+    pdf = None
+    if path.lower().endswith('.pdf'):
+        from matplotlib.backends.backend_pdf import PdfPages
+        pdf = PdfPages(path)
+
+    report = {'pages': list(), 'limits': limits}
+    try:
+        for page in range(len(pages)):
+            start = default_timer()
+
+            grid = pages.grid(page)
+            _set_limits(grid, limits)
+            batch.apply_retouch(
+                batch.make_retoucher(grid, spec.get('grid_kws')), plan)
+
+            if pdf is None:
+                page_file = page_path(path, page + 1)
+                grid.fig.savefig(page_file, **savefig_kws)
+            else:
+                page_file = path
+                pdf.savefig(grid.fig, **savefig_kws)
+            del grid
+
+            report['pages'].append({'page': page + 1,
+                                    'levels': pages.page_levels(page),
+                                    'path': page_file,
+                                    'seconds': default_timer() - start})
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+    logging.debug("rendered {} pages of {} facets".format(
+        len(pages), len(pages.levels)))
+
+    return report
@@ -1,13 +1,18 @@
+import copy
 import logging
-from datetime import datetime
-import numpy as np
 import matplotlib as mpl
-import matplotlib.pyplot as plt
+import matplotlib.axes
 import matplotlib.ticker as ticker
+from matplotlib.artist import setp
 
+from seabornextends import instrument
+from seabornextends.retouch import consolidate
 from seabornextends.retouch.fig import FigRetoucher
+from seabornextends.retouch.dates import DateLabelFormatter
+from seabornextends.retouch import overlay
 
 
+@instrument.timed_methods('AxRetoucher')
 class AxRetoucher(object):
 
     """
@@ -34,18 +39,60 @@ class AxRetoucher(object):
             raise ValueError(msg)
         return getattr(self.ax, axis)
 
+    def _point_collections(self):
+        # merged lines and highlights are collections too
+        skip = consolidate.merged_lines(self.ax) + \
+            overlay.overlay_collections(self.ax)
+        return [c for c in self.ax.collections if c not in skip]
+
     def set_point_sizes(self, sizes=[10]):
-        plt.setp(self.ax.collections, sizes=sizes)
+        setp(self._point_collections(), sizes=sizes)
 
     def set_point_colors(self, colors):
-        plt.setp(self.ax.collections, color=colors)
+        setp(self._point_collections(), color=colors)
 
     def set_lines_colors(self, colors):
-        for idx, line in enumerate(self.ax.get_lines()):
+        """
+        One color per line: Line2D objects first, then the lines merged
+        by consolidate_artists, in draw order.
+        """
+        lines = self.ax.get_lines()
+        for idx, line in enumerate(lines):
             line.set_color(colors[idx])
 
+        start = len(lines)
+        for collection in consolidate.merged_lines(self.ax):
+            stop = start + len(collection.get_paths())
+            collection.set_color(list(colors[start:stop]))
+            start = stop
+
     def set_lines_width(self, width=2):
-        plt.setp(self.ax.get_lines(), linewidth=width)
+        setp(self.ax.get_lines(), linewidth=width)
+        setp(consolidate.merged_lines(self.ax), linewidth=width)
+
+    def consolidate_artists(self, lines=True, points=True, min_artists=2):
+        """
+        Merge the lines of the ax into one LineCollection and its
+        scatter collections into one PathCollection, colors, widths and
+        sizes are kept per element. Much faster to draw with thousands of
+        lines per ax, the setters above then assign arrays.
+
+        Only lines in data coordinates without markers are merged, merged
+        lines no longer show up in ax.get_lines() or an automatic
+        ax.legend() (FacetGrid legends keep their handles).
+
+        Parameters
+        ----------
+
+            min_artists : int, default 2
+                Smallest number of compatible artists worth merging.
+        """
+        merged = list()
+        if lines:
+            merged += consolidate.merge_lines(self.ax, min_artists)
+        if points:
+            merged += consolidate.merge_points(self.ax, min_artists)
+        return merged
 
     def set_tick_params(self, axis='xaxis', **kwargs):
         """
@@ -82,43 +129,93 @@ class AxRetoucher(object):
 
     def set_ticklabel_rotation(self, axis='xaxis', rotation=90):
         axis = self._which_axis(axis)
-        plt.setp(axis.get_majorticklabels(), rotation=rotation)
+        setp(axis.get_majorticklabels(), rotation=rotation)
 
     def highlight_line(self, axis='yaxis', value=0, style_kws=None):
+        self.highlight_lines(axis=axis, values=[value],
+                             styles_kws=[style_kws])
+
+    def highlight_lines(self, axis='yaxis', values=None, styles_kws=None):
+        """
+        Lines across the ax at values, drawn as one LineCollection.
+
+        Parameters
+        ----------
+
+            values : list
+                x values (axis='xaxis') or y values, None are skipped.
+
+            styles_kws : dict or list of dict, default None
+                Style of all lines or of each one (color, alpha,
+                linewidth, linestyle), over semi transparent black.
+        """
         def_style_kws = {
             'alpha': 0.3,
             'color': 'black',
             'linewidth': 2,
             'linestyle': 'solid'
         }
-        style_kws = style_kws or dict()
-        style_kws = dict(def_style_kws, **style_kws)
-
-        if axis == 'xaxis' and value is not None:
-            self.ax.axvline(value, **style_kws)
-        if axis == 'yaxis' and value is not None:
-            self.ax.axhline(value, **style_kws)
-
-    def touch_dates_axis(self, axis='xaxis', fmt='%Y-%m-%d'):
+        values = values or list()
+        if styles_kws is None or isinstance(styles_kws, dict):
+            styles_kws = [styles_kws] * len(values)
+
+        lines = overlay.Overlay(self.ax)
+        for value, style_kws in zip(values, styles_kws):
+            lines.add_span(value, axis=axis,
+                           **dict(def_style_kws, **(style_kws or dict())))
+        return lines.draw()
+
+    def touch_dates_axis(self,
+                         axis='xaxis',
+                         fmt='%Y-%m-%d',
+                         levels=None,
+                         locator=None,
+                         cache=None):
         """
         Reformats date axis plotted from datetime64[ns]
 
+        Installs a DateLabelFormatter, so labels follow the tick values
+        through limit changes, pan and zoom and no draw is needed first.
+
         fmt examples:
         fmt='%Y-%m-%d'
         fmt='%Y-%b-%d'
 
+        Parameters
+        ----------
+
+            levels : list, default None
+                Dates at tick positions 0..n-1 of a categorical axis.
+                Read from the current tick labels when these are fixed
+                (e.g. pointplot), otherwise ticks are taken as dates.
+
+            locator : matplotlib.ticker.Locator, default None
+                Copied to the axis, e.g. mdates.MonthLocator(). The
+                current locator is kept if None.
+
+            cache : dict, default None
+                Formatted labels, shared by the axes of a grid.
         """
 
         axis = self._which_axis(axis)
-        tick_labels = [tick.get_text() for tick in axis.get_majorticklabels()]
-        new_ticks = list()
-        for tick in tick_labels:
-            tick_ = np.datetime64(tick, 's')   # seconds
-            tick_ = datetime.utcfromtimestamp(tick_.astype(int))
-            tick_ = tick_.strftime(fmt)
-            new_ticks.append(tick_)
-
-        self.ax.xaxis.set_major_formatter(ticker.FixedFormatter(new_ticks))
+
+        formatter = axis.get_major_formatter()
+        if levels is None:
+            if isinstance(formatter, ticker.FixedFormatter):
+                levels = list(formatter.seq)
+            elif isinstance(formatter, DateLabelFormatter):
+                levels = formatter.levels
+            elif hasattr(formatter, '_units'):
+                # string category axis, {label: position}
+                units = formatter._units
+                levels = sorted(units, key=units.get)
+
+        if locator is not None:
+            axis.set_major_locator(copy.copy(locator))
+
+        axis.set_major_formatter(DateLabelFormatter(fmt=fmt,
+                                                    levels=levels,
+                                                    cache=cache))
 
     def add_legend(self, **kwargs):
         def_legend_kws = {
@@ -0,0 +1,154 @@
+import weakref
+import numpy as np
+import matplotlib as mpl
+import matplotlib.collections
+import matplotlib.colors
+
+
+# LineCollections standing in for merged Line2D objects
+_MERGED_LINES = weakref.WeakSet()
+
+# linestyles that draw nothing
+NO_LINESTYLES = ['None', 'none', '', ' ']
+
+
+def merged_lines(ax):
+    """
+    LineCollections of ax created by merge_lines, in draw order.
+    """
+    return [c for c in ax.collections if c in _MERGED_LINES]
+
+
+def _mergeable_line(ax, line):
+    return (line.get_transform() == ax.transData and
+            line.get_visible() and
+            line.get_marker() in ['None', 'none', '', ' ', None] and
+            line.get_drawstyle() == 'default' and
+            line.get_linestyle() not in NO_LINESTYLES)
+
+
+def merge_lines(ax, min_lines=2):
+    """
+    Replace the plain Line2D objects of ax (data coordinates, no
+    markers, default drawstyle) by one LineCollection per zorder,
+    keeping each line's color, alpha, width and style.
+
+    Returns
+    -------
+
+        collections : list of LineCollection
+    """
+
+    groups = dict()
+    for line in ax.get_lines():
+        if _mergeable_line(ax, line):
+            groups.setdefault(line.get_zorder(), list()).append(line)
+
+    collections = list()
+    for zorder, lines in sorted(groups.items()):
+        if len(lines) < min_lines:
+            continue
+
+        collection = mpl.collections.LineCollection(
+            [line.get_xydata() for line in lines],
+            colors=[mpl.colors.to_rgba(line.get_color(), line.get_alpha())
+                    for line in lines],
+            linewidths=[line.get_linewidth() for line in lines],
+            linestyles=[line.get_linestyle() for line in lines],
+            capstyle=lines[0].get_solid_capstyle(),
+            joinstyle=lines[0].get_solid_joinstyle(),
+            zorder=zorder)
+
+        for line in lines:
+            line.remove()
+
+        # the data limits already cover the lines
+        ax.add_collection(collection, autolim=False)
+        _MERGED_LINES.add(collection)
+        collections.append(collection)
+
+    return collections
+
+
+def _per_point(values, n, empty):
+    values = np.asarray(values)
+    if not len(values):
+        values = np.asarray([empty])
+    if len(values) == n:
+        return values
+    return np.repeat(values[:1], n, axis=0)
+
+
+def _path_key(path):
+    return (path.vertices.tobytes(),
+            None if path.codes is None else path.codes.tobytes())
+
+
+def _mergeable_points(ax, collection):
+    return (isinstance(collection, mpl.collections.PathCollection) and
+            collection.get_visible() and
+            len(collection.get_paths()) == 1 and
+            collection.get_offset_transform() == ax.transData and
+            collection.get_transform().is_affine and
+            collection.get_array() is None)
+
+
+def merge_points(ax, min_collections=2):
+    """
+    Replace the scatter PathCollections of ax that share a marker by one
+    PathCollection per marker and zorder, keeping per point colors and
+    sizes.
+
+    Returns
+    -------
+
+        collections : list of PathCollection
+    """
+
+    groups = dict()
+    for collection in ax.collections:
+        if _mergeable_points(ax, collection):
+            key = (collection.get_zorder(),
+                   _path_key(collection.get_paths()[0]))
+            groups.setdefault(key, list()).append(collection)
+
+    transparent = (0., 0., 0., 0.)
+    merged = list()
+    for (zorder, _), collections in sorted(groups.items(),
+                                            key=lambda item: item[0][0]):
+        if len(collections) < min_collections:
+            continue
+
+        offsets, sizes, facecolors, edgecolors, linewidths = \
+            [], [], [], [], []
+        for collection in collections:
+            points = np.asarray(collection.get_offsets())
+            n = len(points)
+            offsets.append(points)
+            sizes.append(_per_point(collection.get_sizes(), n, 1.))
+            facecolors.append(_per_point(collection.get_facecolor(), n,
+                                         transparent))
+            edgecolors.append(_per_point(collection.get_edgecolor(), n,
+                                         transparent))
+            linewidths.append(_per_point(collection.get_linewidth(), n,
+                                         0.))
+
+        first = collections[0]
+        collection = mpl.collections.PathCollection(
+            first.get_paths(),
+            sizes=np.concatenate(sizes),
+            offsets=np.concatenate(offsets),
+            facecolors=np.concatenate(facecolors),
+            edgecolors=np.concatenate(edgecolors),
+            linewidths=np.concatenate(linewidths),
+            transform=mpl.transforms.IdentityTransform(),
+            zorder=zorder,
+            offset_transform=ax.transData)
+
+        for old in collections:
+            old.remove()
+
+        ax.add_collection(collection, autolim=False)
+        merged.append(collection)
+
+    return merged
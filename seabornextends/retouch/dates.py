@@ -0,0 +1,105 @@
+import logging
+import numpy as np
+import matplotlib.dates as mdates
+import matplotlib.ticker as ticker
+
+
+# days between the matplotlib date epoch and 1970-01-01
+EPOCH_OFFSET = (np.datetime64(mdates.get_epoch(), 'us') -
+                np.datetime64('1970-01-01', 'us')) / np.timedelta64(1, 'D')
+
+# labels kept per cache before it is emptied
+MAX_CACHED_LABELS = 10000
+
+
+def datenums_to_datetime64(values):
+    """
+    matplotlib date numbers (float days) as datetime64[us], nan -> NaT.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    days = values + EPOCH_OFFSET
+    finite = np.isfinite(days)
+    us = np.zeros(len(days), dtype=np.int64)
+    us[finite] = np.round(days[finite] * 86400e6)
+    dates = us.view('M8[us]')
+    dates[~finite] = np.datetime64('NaT')
+    return dates
+
+
+def format_dates(dates, fmt):
+    """
+    strftime over an array of dates at once, NaT -> ''.
+    """
+    import pandas as pd
+
+    dates = pd.DatetimeIndex(dates)
+    labels = np.asarray(dates.strftime(fmt), dtype=object)
+    labels[np.asarray(dates.isna())] = ''
+    return labels
+
+
+class DateLabelFormatter(ticker.Formatter):
+
+    """
+    Formats date ticks from their numeric value, needs no prior draw.
+
+    Ticks are matplotlib date numbers, or positions 0..n-1 into levels
+    when the axis is categorical (e.g. pointplot of dates). Labels of
+    all the ticks of a draw are formatted at once in set_locs and kept
+    in cache, which can be shared by the formatters of many axes.
+
+    Example:
+    ax.xaxis.set_major_formatter(DateLabelFormatter('%Y-%b'))
+    """
+
+    def __init__(self, fmt='%Y-%m-%d', levels=None, cache=None):
+        self.fmt = fmt
+        self.cache = cache if cache is not None else dict()
+
+        self.levels = levels
+        self._level_labels = None
+        if levels is not None:
+            self._level_labels = self._format_levels(levels)
+
+    def _store(self, keys, labels):
+        if len(self.cache) > MAX_CACHED_LABELS:
+            self.cache.clear()
+        self.cache.update(zip(keys, labels))
+
+    def _format_levels(self, levels):
+        keys = [('level', self.fmt, str(level)) for level in levels]
+        missing = [idx for idx, key in enumerate(keys)
+                   if key not in self.cache]
+        if missing:
+            import pandas as pd
+            dates = pd.to_datetime(pd.Index([str(levels[idx])
+                                             for idx in missing]),
+                                   errors='coerce')
+            self._store([keys[idx] for idx in missing],
+                        format_dates(dates, self.fmt))
+        return [self.cache[key] for key in keys]
+
+    def _format_values(self, values):
+        keys = [('num', self.fmt, float(value)) for value in values]
+        missing = [idx for idx, key in enumerate(keys)
+                   if key not in self.cache]
+        if missing:
+            dates = datenums_to_datetime64([values[idx] for idx in missing])
+            self._store([keys[idx] for idx in missing],
+                        format_dates(dates, self.fmt))
+        return [self.cache[key] for key in keys]
+
+    def set_locs(self, locs):
+        self.locs = locs
+        if self._level_labels is None and len(locs):
+            self._format_values(list(locs))
+
+    def __call__(self, x, pos=None):
+        if self._level_labels is None:
+            return self._format_values([x])[0]
+
+        idx = int(round(x))
+        if abs(x - idx) > 1e-6 or not 0 <= idx < len(self._level_labels):
+            logging.debug("no date level at tick {}".format(x))
+            return ''
+        return self._level_labels[idx]
@@ -1,9 +1,17 @@
 import math
 import logging
 import matplotlib as mpl
-import matplotlib.pyplot as plt
+import matplotlib.figure
 
+from seabornextends import instrument
+from seabornextends.retouch import layout
+from seabornextends.retouch import rasterize
 
+
+LAYOUT_MODES = ['exact', 'fast']
+
+
+@instrument.timed_methods('FigRetoucher')
 class FigRetoucher(object):
 
     def __init__(self, fig):
@@ -49,7 +57,7 @@ class FigRetoucher(object):
             'borderaxespad': 0.0
         }
         kwargs = dict(def_legend_kws, **kwargs)
-        plt.legend(**kwargs)
+        self.fig.gca().legend(**kwargs)
 
     def adjust_subplots(self, **kwargs):
         def_subplots_kws = {
@@ -59,12 +67,81 @@ class FigRetoucher(object):
         subplots_kws = dict(def_subplots_kws, **kwargs)
         self.fig.subplots_adjust(**subplots_kws)
 
-    def set_tight_layout(self):
-        try:
-            self.fig.tight_layout()
-        except ValueError:
-            # skip set_tight_layout error
-            pass
+    def set_tight_layout(self, mode='fast', subplots_kws=None, pad=1.08,
+                         h_pad=None, w_pad=None):
+        """
+        Fit the axes decorations in the figure.
+
+        Example:
+        subplots_kws = fig_retoucher.set_tight_layout(mode='fast')
+        # same shape and labels: skip measuring
+        other_retoucher.set_tight_layout(subplots_kws=subplots_kws)
+
+        Parameters
+        ----------
+
+            mode : str, default 'fast'
+                'exact' runs fig.tight_layout. 'fast' computes the same
+                parameters measuring one ax per group of axes with the
+                same ticks and labels and caching the result for grids
+                of the same shape and labels, see layout.fast_layout.
+                It falls back to 'exact' for axes not on one gridspec
+                or figures it can't measure.
+
+            subplots_kws : dict, default None
+                Result of an earlier call, applied with subplots_adjust
+                without measuring anything.
+
+            pad, h_pad, w_pad : float
+                See fig.tight_layout.
+
+        Returns
+        -------
+
+            subplots_kws : dict
+                The subplots_adjust parameters of the figure.
+        """
+        if mode not in LAYOUT_MODES:
+            msg = "mode must be one of {} but is {}".format(LAYOUT_MODES,
+                                                            mode)
+            logging.error(msg)
+            raise ValueError(msg)
+
+        applied = None
+        if subplots_kws is not None or mode == 'fast':
+            applied = layout.fast_layout(self.fig,
+                                         subplots_kws=subplots_kws,
+                                         pad=pad,
+                                         h_pad=h_pad,
+                                         w_pad=w_pad)
+
+        if applied is None:
+            try:
+                self.fig.tight_layout(pad=pad, h_pad=h_pad, w_pad=w_pad)
+            except ValueError:
+                # skip set_tight_layout error
+                pass
+
+        params = self.fig.subplotpars
+        return {name: float(getattr(params, name)) for name in
+                ['left', 'right', 'bottom', 'top', 'wspace', 'hspace']}
+
+    def rasterize_heavy(self, threshold=5000, measure=None, **savefig_kws):
+        """
+        Rasterize artists with more than threshold points in vector
+        exports, highlights stay vector.
+
+        Example:
+        report = fig_retoucher.rasterize_heavy(threshold=10000,
+                                               measure='pdf',
+                                               dpi=300)
+
+        See rasterize.rasterize_heavy.
+        """
+        return rasterize.rasterize_heavy(self.fig,
+                                         threshold=threshold,
+                                         measure=measure,
+                                         **savefig_kws)
 
     def set_annot(self, annot, **kwargs):
         def_annot_kws = {
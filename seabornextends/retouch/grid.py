@@ -1,20 +1,80 @@
 import logging
 import re
+import weakref
 import numpy as np
-import seaborn as sns
 
+from seabornextends import instrument
 from seabornextends.retouch.ax import AxRetoucher
 from seabornextends.retouch.fig import FigRetoucher
+from seabornextends.retouch.overlay import Overlay
+from seabornextends.retouch.plan import RetouchPlan
+from seabornextends.retouch.plan import deferrable
 from seabornextends import utils
 
 
+# per ax operations taking either one value for all axes
+# or a list with one value per ax
+PER_AX_LISTS = {
+    'set_point_sizes': ('sizes', 'list_of_sizes'),
+    'set_point_colors': ('colors', 'list_of_colors'),
+    'set_lines_colors': ('colors', 'list_of_colors'),
+}
+
+
+# values per column compared when looking up cached estimates
+CHECK_SAMPLE_SIZE = 1024
+
+
+def _column_state(series):
+    """
+    Cheap check that a column still holds the same values: where they
+    live, their length and dtype, and CHECK_SAMPLE_SIZE evenly spaced
+    values. Assigning the column (df[c] = ..., df[c] *= 2) always
+    changes it, writing single cells (df.loc[i, c] = ...) only if a
+    compared value changes, see FacetGridRetoucher.clear_estimates.
+    """
+    if hasattr(series, 'cat'):
+        values = series.cat.codes.values
+    else:
+        values = series.values
+    values = np.asarray(values)
+
+    sample = values[::max(len(values) // CHECK_SAMPLE_SIZE, 1)]
+    if sample.dtype == object:
+        import pandas as pd
+        sample = pd.util.hash_array(sample)
+
+    return (values.__array_interface__['data'][0],
+            len(values),
+            series.dtype,
+            np.ascontiguousarray(sample).tobytes())
+
+
+def _forget(cache, key):
+    """
+    weakref callback dropping cache[key] once its frame is collected.
+    """
+    def callback(ref):
+        if key in cache and cache[key][0] is ref:
+            del cache[key]
+    return callback
+
+
+@instrument.timed_methods('FacetGridRetoucher')
 class FacetGridRetoucher(object):
     """
     Adds refinements to a Seaborn FacetGrid with
     one or more facets (Ax objects).
+
+    With lazy=True operations are recorded into self.plan instead of
+    being applied (and return None), then merged and applied in one
+    pass per axis by apply() or savefig(). Drawing the figure on a
+    canvas applies pending operations and redraws, saving it another
+    way (grid.fig.savefig) raises until they are applied.
     """
 
-    def __init__(self, grid, grid_kws=None):
+    def __init__(self, grid, grid_kws=None, lazy=False):
+        import seaborn as sns
 
         if not isinstance(grid, sns.FacetGrid):
             msg = "grid must be sns.FacetGrid but is {}".format(type(grid))
@@ -34,19 +94,254 @@ class FacetGridRetoucher(object):
         # TODO: should we make this a requirement?
         self.grid_kws = grid_kws or dict()
 
+        # per facet x per level estimates computed by highlight_levels,
+        # {id(df): (weakref to df, {key: (column states, estimates)})}
+        self._estimates = dict()
+
+        # date tick labels shared by the axes, see touch_dates_axis
+        self._date_labels = dict()
+
+        # operations recorded while lazy, see apply
+        self.lazy = lazy
+        self.plan = RetouchPlan()
+        self._applying = False
+        self._draw_cid = None
+
+    def _level_groups(self, df, category):
+        """
+        Group of every row of df, facet x level of category.
+
+        Returns
+        -------
+
+            codes : np.ndarray
+                ax index * n_levels + level index, -1 outside the grid.
+
+            n_levels : int
+        """
+        try:
+            level_codes = df[category].cat.codes.values
+            n_levels = len(df[category].cat.categories)
+        except AttributeError:
+            msg = "'{}' must be a category".format(category)
+            logging.error(msg)
+            raise AttributeError(msg)
+
+        ax_codes, _ = utils.facet_codes(self.grid, df)
+
+        codes = ax_codes * n_levels + level_codes
+        codes[(ax_codes < 0) | (level_codes < 0)] = -1
+
+        return codes, n_levels
+
+    def _frame_state(self, df, category, column):
+        """
+        States of the facet, category and value columns of df, see
+        _column_state.
+        """
+        columns = [c for c in [self.grid._row_var, self.grid._col_var,
+                               category, column] if c is not None]
+        return tuple(_column_state(df[c]) for c in dict.fromkeys(columns))
+
+    def _cached_estimates(self, df, key, state):
+        entry = self._estimates.get(id(df))
+        if entry is None or entry[0]() is not df:
+            return None
+        cached = entry[1].get(key)
+        if cached is None or cached[0] != state:
+            return None
+        return cached[1]
+
+    def _cache_estimates(self, df, key, state, estimates):
+        entry = self._estimates.get(id(df))
+        if entry is None or entry[0]() is not df:
+            ref = weakref.ref(df, _forget(self._estimates, id(df)))
+            entry = self._estimates[id(df)] = (ref, dict())
+        entry[1][key] = (state, estimates)
+
+    def clear_estimates(self):
+        """
+        Drop the cached estimates, e.g. after writing single values of
+        a frame in place.
+        """
+        self._estimates.clear()
+
+    def level_estimates(self, df, category, column, estimator):
+        """
+        Estimate column for every facet and every level of category
+        in one grouped pass over the categorical codes.
+
+        Facets are located with the grid's own row/col variables.
+        Hue levels are pooled since a highlight spans the whole level.
+        Results are cached on the retoucher by frame, checked against a
+        cheap state of the columns used (see _column_state), so repeated
+        highlights of the same df only pay for the grouping once.
+
+        Returns
+        -------
+
+            estimates : np.ndarray
+                Shape (n_axes, n_levels), nan where a facet has no
+                values for a level.
+        """
+
+        state = self._frame_state(df, category, column)
+        key = (category, column, estimator)
+        estimates = self._cached_estimates(df, key, state)
+        if estimates is not None:
+            return estimates
+
+        codes, n_levels = self._level_groups(df, category)
+
+        from seabornextends import stats
+
+        estimates = stats.grouped_estimates(
+            values=df[column].values,
+            codes=codes,
+            n_groups=len(self.axes) * n_levels,
+            estimator=estimator)
+        estimates = estimates.reshape(len(self.axes), n_levels)
+
+        self._cache_estimates(df, key, state, estimates)
+
+        return estimates
+
+    def level_intervals(self, df, category, column, estimator, ci=95,
+                        n_boot=1000, seed=None):
+        """
+        Bootstrap confidence interval of the estimate of column for every
+        facet and every level of category, all resampled at once by
+        stats.grouped_bootstrap instead of one loop per facet and level.
+
+        Facets and levels are located as in level_estimates, results are
+        cached the same way.
+
+        Returns
+        -------
+
+            low, high : np.ndarray
+                Shape (n_axes, n_levels), nan where a facet has no
+                values for a level.
+        """
+
+        state = self._frame_state(df, category, column)
+        key = (category, column, estimator, ci, n_boot, seed)
+        intervals = self._cached_estimates(df, key, state)
+        if intervals is not None:
+            return intervals
+
+        codes, n_levels = self._level_groups(df, category)
+
+        from seabornextends import stats
+
+        intervals = stats.grouped_bootstrap(
+            values=df[column].values,
+            codes=codes,
+            n_groups=len(self.axes) * n_levels,
+            estimator=estimator,
+            ci=ci,
+            n_boot=n_boot,
+            seed=seed)
+
+        shape = (len(self.axes), n_levels)
+        low = intervals['ci_low'].values.reshape(shape)
+        high = intervals['ci_high'].values.reshape(shape)
+
+        self._cache_estimates(df, key, state, (low, high))
+
+        return low, high
+
+    def _retouch_ax(self, idx, name, kwargs):
+        """
+        Apply one per ax operation (e.g. set_lim) to the idx-th ax only.
+        """
+        ax_retoucher = self.ax_retouchers[idx]
+
+        if name in PER_AX_LISTS:
+            value_kw, list_kw = PER_AX_LISTS[name]
+            values = kwargs.get(list_kw)
+            if isinstance(values, (list, np.ndarray)):
+                getattr(ax_retoucher, name)(**{value_kw: values[idx]})
+            elif kwargs.get(value_kw) is not None:
+                getattr(ax_retoucher, name)(**{value_kw: kwargs[value_kw]})
+            else:
+                pass
+        else:
+            getattr(ax_retoucher, name)(**kwargs)
+
+    def _retouch_axes(self, name, **kwargs):
+        """
+        Apply a per ax operation to every ax, or record it if lazy.
+        """
+        if self.lazy and not self._applying:
+            self._record(name, **kwargs)
+            return
+
+        for idx in range(len(self.ax_retouchers)):
+            self._retouch_ax(idx, name, kwargs)
+
+    def _record(self, name, **kwargs):
+        """
+        Record an operation while lazy, and watch the figure's draws
+        until it is applied.
+        """
+        self.plan.record(name, **kwargs)
+        if self._draw_cid is None:
+            self._draw_cid = self._fig.canvas.mpl_connect('draw_event',
+                                                          self._on_draw)
+
+    def _on_draw(self, event):
+        """
+        draw_event callback while operations are pending. A draw on a
+        canvas applies them and redraws. A draw for saving the figure is
+        already rendered by the time draw_event fires, so it raises
+        instead of writing a file without them.
+        """
+        if not len(self.plan):
+            return
+        if event.canvas.is_saving():
+            msg = ("figure saved with {} pending retouch operations, call "
+                   "apply() or the retoucher's savefig() first").format(
+                       len(self.plan))
+            logging.error(msg)
+            raise ValueError(msg)
+        self.apply()
+        event.canvas.draw_idle()
+
+    def apply(self):
+        """
+        Apply the operations recorded while lazy in one pass per axis.
+
+        Returns
+        -------
+
+            plan : RetouchPlan
+                The applied plan, can be applied to other retouchers of
+                grids with the same shape.
+        """
+        plan, self.plan = self.plan, RetouchPlan()
+        if self._draw_cid is not None:
+            self._fig.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        plan.apply(self)
+        return plan
+
+    def savefig(self, *args, **kwargs):
+        """
+        Apply pending operations and save the figure.
+        """
+        self.apply()
+        self._fig.savefig(*args, **kwargs)
+
     def set_point_sizes(self,
                         sizes=None,
                         list_of_sizes=None):
         """
         If list of sizes, then one size list per ax
         """
-        for idx, ax_retoucher in enumerate(self.ax_retouchers):
-            if isinstance(list_of_sizes, (list, np.ndarray)):
-                ax_retoucher.set_point_sizes(sizes=list_of_sizes[idx])
-            elif sizes is not None:
-                ax_retoucher.set_point_sizes(sizes=sizes)
-            else:
-                pass
+        self._retouch_axes('set_point_sizes',
+                           sizes=sizes,
+                           list_of_sizes=list_of_sizes)
 
     def set_point_colors(self,
                          colors=None,
@@ -54,59 +349,66 @@ class FacetGridRetoucher(object):
         """
         If list of colors, then one size list per ax
         """
-        for idx, ax_retoucher in enumerate(self.ax_retouchers):
-            if isinstance(list_of_colors, (list, np.ndarray)):
-                ax_retoucher.set_point_colors(colors=list_of_colors[idx])
-            elif colors is not None:
-                ax_retoucher.set_point_colors(colors=colors)
-            else:
-                pass
+        self._retouch_axes('set_point_colors',
+                           colors=colors,
+                           list_of_colors=list_of_colors)
 
     def set_lines_colors(self,
                          colors=None,
                          list_of_colors=None):
         # TODO: len(colors) must match number of lines AND capsizes x2
-        for idx, ax_retoucher in enumerate(self.ax_retouchers):
-            if isinstance(list_of_colors, (list, np.ndarray)):
-                ax_retoucher.set_lines_colors(colors=list_of_colors[idx])
-            elif colors is not None:
-                ax_retoucher.set_lines_colors(colors=colors)
-            else:
-                pass
+        self._retouch_axes('set_lines_colors',
+                           colors=colors,
+                           list_of_colors=list_of_colors)
 
     def set_lines_width(self,
                         width=1):
-        for idx, ax_retoucher in enumerate(self.ax_retouchers):
-            ax_retoucher.set_lines_width(width=width)
+        self._retouch_axes('set_lines_width', width=width)
+
+    def consolidate_artists(self, **kwargs):
+        """
+        Merge the lines and scatter points of every ax into collections,
+        see AxRetoucher.consolidate_artists.
+        """
+        self._retouch_axes('consolidate_artists', **kwargs)
 
     def set_lim(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.set_lim(**kwargs)
+        self._retouch_axes('set_lim', **kwargs)
 
     def hide_axis_label(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.hide_axis_label(**kwargs)
+        self._retouch_axes('hide_axis_label', **kwargs)
 
     def set_visible(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.set_visible(**kwargs)
+        self._retouch_axes('set_visible', **kwargs)
 
     def set_ticklabel_rotation(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.set_ticklabel_rotation(**kwargs)
+        self._retouch_axes('set_ticklabel_rotation', **kwargs)
 
-    def touch_dates_axis(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.touch_dates_axis(**kwargs)
+    def touch_dates_axis(self,
+                         axis='xaxis',
+                         fmt='%Y-%m-%d',
+                         levels=None,
+                         locator=None):
+        """
+        Date labels on every ax, formatted once for the whole grid.
+
+        See AxRetoucher.touch_dates_axis, each ax gets its own copy of
+        locator.
+        """
+        self._retouch_axes('touch_dates_axis',
+                           axis=axis,
+                           fmt=fmt,
+                           levels=levels,
+                           locator=locator,
+                           cache=self._date_labels)
 
     def set_tick_params(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.set_tick_params(**kwargs)
+        self._retouch_axes('set_tick_params', **kwargs)
 
     def set_label_size(self, **kwargs):
-        for ax_retoucher in self.ax_retouchers:
-            ax_retoucher.set_label_size(**kwargs)
+        self._retouch_axes('set_label_size', **kwargs)
 
+    @deferrable
     def add_legend(self, **kwargs):
         """
         Set using grid method but can't pass override loc
@@ -119,6 +421,7 @@ class FacetGridRetoucher(object):
         legend_kws = dict(def_legend_kws, **kwargs)
         self.grid.add_legend(**legend_kws)
 
+    @deferrable
     def set_annot(self, annot, **kwargs):
         """
         NOTE: set to first axis only
@@ -135,10 +438,54 @@ class FacetGridRetoucher(object):
         ax = self.ax_retouchers[0].ax
         ax.text(s=annot, transform=ax.transAxes, **kwargs)
 
+    @deferrable
+    def set_tight_layout(self, mode='fast', subplots_kws=None, **kwargs):
+        """
+        Fit the decorations of the grid in the figure, see
+        FigRetoucher.set_tight_layout. Returns the subplots_kws to pass
+        on to grids of the same shape and labels, None when lazy.
+        """
+        return self.fig.set_tight_layout(mode=mode,
+                                         subplots_kws=subplots_kws,
+                                         **kwargs)
+
+    @deferrable
+    def rasterize_heavy(self, threshold=5000, measure=None, **savefig_kws):
+        """
+        Rasterize heavy artists of the grid in vector exports, see
+        FigRetoucher.rasterize_heavy. Returns None when lazy.
+        """
+        return self.fig.rasterize_heavy(threshold=threshold,
+                                        measure=measure,
+                                        **savefig_kws)
+
+    @deferrable
     def highlight_lines(self,
                         values,
                         axis='yaxis',
                         styles_kws=None):
+        """
+        Lines across every ax at values, one LineCollection per ax.
+
+        Example:
+
+        # a threshold on every facet, two on the second one
+        retoucher.highlight_lines(
+            values=[0.5, [0.2, 0.8], 0.5],
+            axis='yaxis',
+            styles_kws=[{'color': 'C3', 'alpha': 1}])
+
+        Parameters
+        ----------
+
+            values : list
+                One value or list of values per ax, or a single value
+                for all axes.
+
+            styles_kws : list of dict, default None
+                One style per ax or a single one for all axes, each a
+                dict or a list of dicts with one style per value.
+        """
 
         styles_kws = styles_kws or list()
 
@@ -152,10 +499,14 @@ class FacetGridRetoucher(object):
             styles_kws = styles_kws * len(self.axes)
 
         for idx, ax_retoucher in enumerate(self.ax_retouchers):
-            ax_retoucher.highlight_line(axis=axis,
-                                        value=values[idx],
-                                        style_kws=styles_kws[idx])
-
+            ax_values = values[idx]
+            if not isinstance(ax_values, (list, tuple, np.ndarray)):
+                ax_values = [ax_values]
+            ax_retoucher.highlight_lines(axis=axis,
+                                         values=list(ax_values),
+                                         styles_kws=styles_kws[idx])
+
+    @deferrable
     def highlight_levels(self,
                          df,
                          category,
@@ -190,8 +541,19 @@ class FacetGridRetoucher(object):
 
         bar / capped line: plot from 0 up to the aggregated value
         line: plots lines that extend to 100%
+
+        All highlights of an ax are drawn as one PolyCollection of bars
+        and one LineCollection per kind of line, see overlay.Overlay.
+
+        When grid_kws has a ci (and optionally n_boot and seed), bars and
+        capped lines also get the bootstrap confidence interval of their
+        level as a capped error range, see level_intervals. A highlight
+        can turn it off with 'ci': False and style it with 'ci_color',
+        'ci_width' and 'capsize' (in level units).
         """
 
+        import matplotlib as mpl
+
         # what is the other axis
         other_axis = utils.other_axis(axis)
         logging.debug("other_axis: {}".format(other_axis))
@@ -202,6 +564,31 @@ class FacetGridRetoucher(object):
         # the estimator used to summarize the df
         estimator = self.grid_kws['estimator']
 
+        # get all levels for the plotted category
+        try:
+            levels = df[category].cat.categories.tolist()
+        except AttributeError:
+            msg = "'{}' must be a category".format(category)
+            logging.error(msg)
+            raise AttributeError(msg)
+        except Exception:
+            raise
+
+        # one grouped pass for all facets and levels
+        estimates = self.level_estimates(df=df,
+                                         category=category,
+                                         column=other_axis_column,
+                                         estimator=estimator)
+
+        # intervals only computed if a highlight draws them
+        ci = self.grid_kws.get('ci')
+        intervals = None
+
+        # levels are on the x axis: vertical bars and lines
+        vert = axis == 'xaxis'
+
+        overlays = [Overlay(ax) for ax in self.axes]
+
         for highlight in highlights:
 
             # what kind of highlight will be plotted
@@ -218,80 +605,74 @@ class FacetGridRetoucher(object):
             style = highlight.get('style') or 'solid'
             width = highlight.get('width') or 1.5
 
-            # mapping of the functions we will use to highlight
-            mapping = {
-                'line': {
-                    'xaxis': 'axvline',
-                    'yaxis': 'axhline'
-                },
-                'capped_line': {
-                    'xaxis': 'vlines',
-                    'yaxis': 'hlines'
-                },
-                'bar': {
-                    'xaxis': 'bar',
-                    'yaxis': 'barh'
-                }
-            }
-
-            highlighter = mapping[kind][axis]
-
-            # get all levels for the plotted category
-            try:
-                levels = df[category].cat.categories.tolist()
-            except AttributeError:
-                msg = "'{}' must be a category".format(category)
-                logging.error(msg)
-                raise AttributeError(msg)
-            except Exception:
-                raise
+            line_kws = {'color': color,
+                        'alpha': alpha,
+                        'linewidth': width,
+                        'linestyle': style}
 
             # see which levels match the ones we want to highlight
             # and get their index
             logging.debug("level_pattern: {}".format(level_pattern))
             pattern = re.compile(str(level_pattern))
-            matches = [str(l) for l in levels if pattern.search(str(l))]
             matches_idx = [i for i, l in enumerate(levels)
                            if pattern.search(str(l))]
 
-            logging.debug("matches: {}".format(matches))
             logging.debug("matches_idx: {}".format(matches_idx))
 
-            for idx, ax_retoucher in enumerate(self.ax_retouchers):
-                ax = ax_retoucher.ax
+            for idx, overlay in enumerate(overlays):
                 for level_idx in matches_idx:
 
-                    # get all values for the level we wish to highlight
-                    filtered = df[df[category].astype('str').isin(matches)]
-                    values = filtered[other_axis_column]
-                    estimate = estimator(values)
+                    # aggregated value of the level in this facet
+                    estimate = estimates[idx, level_idx]
 
                     if kind == 'line':
-                        getattr(ax, highlighter)(
-                            level_idx,
-                            linestyle=style,
-                            linewidth=width,
-                            color=color,
-                            alpha=alpha)
-
-                    if kind == 'capped_line':
-                        getattr(ax, highlighter)(
-                            level_idx,
-                            0,
-                            estimate,
-                            linestyle=style,
-                            linewidth=width,
-                            color=color,
-                            alpha=alpha)
-
-                    elif kind == 'bar':
-                        getattr(ax, highlighter)(
-                            level_idx,
-                            estimate,
-                            color=color,
-                            alpha=alpha)
+                        overlay.add_span(level_idx, axis=axis, **line_kws)
 
+                    elif kind == 'capped_line':
+                        start, end = (level_idx, 0), (level_idx, estimate)
+                        if not vert:
+                            start, end = start[::-1], end[::-1]
+                        overlay.add_segment(start, end, **line_kws)
 
+                    elif kind == 'bar':
+                        overlay.add_bar(level_idx,
+                                        estimate,
+                                        vert=vert,
+                                        color=color,
+                                        alpha=alpha)
+
+                if kind == 'line' or ci is None or \
+                        not highlight.get('ci', True):
+                    continue
+
+                if intervals is None:
+                    intervals = self.level_intervals(
+                        df=df,
+                        category=category,
+                        column=other_axis_column,
+                        estimator=estimator,
+                        ci=ci,
+                        n_boot=self.grid_kws.get('n_boot', 1000),
+                        seed=self.grid_kws.get('seed'))
+                low, high = intervals
+
+                overlay.add_ranges(
+                    utils.interval_segments(
+                        matches_idx,
+                        low[idx, matches_idx],
+                        high[idx, matches_idx],
+                        vert=vert,
+                        capsize=highlight.get('capsize', .1)),
+                    color=highlight.get('ci_color') or '.26',
+                    linewidth=highlight.get('ci_width') or
+                    1.5 * mpl.rcParams['lines.linewidth'],
+                    alpha=alpha)
+
+        for overlay in overlays:
+            overlay.draw()
+
+
+@instrument.timed_methods('JointGridRetoucher')
 class JointGridRetoucher(object):
     """
     Adds refinements to a Seaborn JointGrid with
@@ -299,6 +680,7 @@ class JointGridRetoucher(object):
     """
 
     def __init__(self, grid, grid_kws=None):
+        import seaborn as sns
 
         if not isinstance(grid, sns.JointGrid):
             msg = "grid must be sns.JointGrid but is {}".format(type(grid))
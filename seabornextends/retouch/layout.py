@@ -0,0 +1,506 @@
+"""
+tight_layout for large grids: the same subplots_adjust parameters as
+fig.tight_layout, with far fewer text measurements.
+
+fig.tight_layout measures the tight bbox of every ax, which lays out all
+of its tick labels, axis labels and titles. In a facet grid most axes
+share their ticks and labels, so their margins (tight bbox minus ax box,
+in pixels) are the same: here axes are grouped by what decides their
+margins, one representative per group is measured and the margins are
+cached by label signature. The resulting parameters are cached by the
+shape of the grid and the signatures of its cells, so a grid with the
+same shape and labels measures nothing.
+
+Like tight_layout this assumes margins don't depend on the position of
+the ax, so axes with adjustable='datalim' or aspect set may be off.
+
+Only public matplotlib API is used, except for the artists of the
+figure's suptitle, supxlabel and supylabel and of the axes' left and
+right titles, which have no public accessor: figures without them fall
+back to fig.tight_layout, axes without them are measured on their own.
+So do figures whose canvas has no renderer (get_renderer).
+"""
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.spines
+import matplotlib.text
+from matplotlib.font_manager import FontProperties
+
+
+# figure attributes holding the suptitle, supxlabel and supylabel
+SUPLABELS = ['_suptitle', '_supxlabel', '_supylabel']
+
+# axes attributes holding the left and right titles
+SIDE_TITLES = ['_left_title', '_right_title']
+
+# label signature -> margins in pixels
+MAX_MARGINS = 4096
+# figure signature -> subplots_adjust kwargs
+MAX_LAYOUTS = 256
+
+_MARGINS = OrderedDict()
+_LAYOUTS = OrderedDict()
+_LOCK = threading.Lock()
+_STATS = {'measured': 0, 'margin_hits': 0, 'layout_hits': 0}
+
+
+class _Unique(object):
+    """
+    Signature part of an artist we can't describe by value: the ax is
+    measured on its own and its layout isn't cached.
+    """
+
+    def __init__(self, artist):
+        self.id = id(artist)
+
+    def __eq__(self, other):
+        return isinstance(other, _Unique) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+def _cacheable(signature):
+    if isinstance(signature, _Unique):
+        return False
+    if isinstance(signature, tuple):
+        return all(_cacheable(part) for part in signature)
+    return True
+
+
+def _cache_get(cache, key, stat):
+    with _LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+            _STATS[stat] += 1
+        return value
+
+
+def _cache_put(cache, key, value, max_size):
+    with _LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+
+def clear_cache():
+    with _LOCK:
+        _MARGINS.clear()
+        _LAYOUTS.clear()
+        for name in _STATS:
+            _STATS[name] = 0
+
+
+def cache_info():
+    """
+    Axes measured, margin and layout cache hits and cache sizes.
+    """
+    with _LOCK:
+        info = dict(_STATS)
+        info['margins'] = len(_MARGINS)
+        info['layouts'] = len(_LAYOUTS)
+    return info
+
+
+def _text_signature(ax, text):
+    if not text.get_visible() or not text.get_text():
+        return None
+    transform = text.get_transform()
+    if transform == ax.transData:
+        coords = 'data'
+    elif transform == ax.transAxes:
+        coords = 'axes'
+    else:
+        return _Unique(text)
+    return (text.get_text(),
+            hash(text.get_fontproperties()),
+            text.get_rotation(),
+            text.get_horizontalalignment(),
+            text.get_verticalalignment(),
+            text.get_linespacing(),
+            tuple(text.get_position()),
+            coords,
+            text.get_bbox_patch() is not None)
+
+
+def _label_signature(text):
+    return (text.get_visible(),
+            text.get_text(),
+            hash(text.get_fontproperties()),
+            text.get_rotation(),
+            text.get_horizontalalignment(),
+            text.get_verticalalignment())
+
+
+def _title_signature(title, renderer, width):
+    """
+    A title's height doesn't depend on its text, its width only when it
+    overflows the ax: facets titled 'col = a', 'col = b' match.
+    """
+    signature = _label_signature(title) + (tuple(title.get_position()),)
+    text = title.get_text()
+    if not title.get_visible() or not text:
+        return signature
+    if '$' not in text and \
+            title.get_window_extent(renderer).width <= width:
+        text = ('fits', text.count('\n'))
+    return signature[:1] + (text,) + signature[2:]
+
+
+def _drawn_ticks(axis):
+    """
+    Major and minor ticks of axis a draw would show, their labels
+    formatted: the ticks within the view interval, with the tolerance
+    matplotlib uses.
+    """
+    # formats every tick label, as a draw does
+    axis.get_majorticklabels()
+    axis.get_minorticklabels()
+    ticks = axis.get_major_ticks() + axis.get_minor_ticks()
+
+    transform = axis.get_transform()
+    low, high = transform.transform(sorted(axis.get_view_interval()))
+    low, high = min(low, high), max(low, high)
+    tolerance = (high - low) * 1e-10
+
+    drawn = list()
+    for tick in ticks:
+        loc = transform.transform(tick.get_loc())
+        if low - tolerance <= loc <= high + tolerance:
+            drawn.append(tick)
+    return drawn
+
+
+def _ticks_signature(axis, ticks):
+    """
+    What the ticks of axis draw: their values and labels once measured,
+    otherwise the (shared) tickers and view interval that produce them.
+    """
+    if not ticks:
+        return (id(axis.major), id(axis.minor),
+                tuple(axis.get_view_interval()),
+                tuple((t.label1.get_visible(), t.label2.get_visible())
+                      for t in axis.majorTicks))
+
+    return (tuple((tick.get_loc(),
+                   tick.label1.get_visible() and tick.label1.get_text(),
+                   tick.label2.get_visible() and tick.label2.get_text())
+                  for tick in _drawn_ticks(axis)),
+            axis.offsetText.get_visible() and
+            axis.major.formatter.get_offset())
+
+
+def _axis_signature(axis, ticks):
+    if not axis.get_visible():
+        return None
+    first = axis.majorTicks[0] if axis.majorTicks else None
+    return (_ticks_signature(axis, ticks),
+            repr(sorted(axis.get_tick_params(which='major').items())),
+            repr(sorted(axis.get_tick_params(which='minor').items())),
+            None if first is None else _label_signature(first.label1),
+            None if first is None else _label_signature(first.label2),
+            _label_signature(axis.label),
+            axis.label_position,
+            axis.offsetText.get_visible())
+
+
+def _extra_signature(ax):
+    """
+    Texts, spines and unclipped artists that reach outside the ax.
+    """
+    parts = list()
+    for artist in ax.get_default_bbox_extra_artists():
+        if artist is ax.patch:
+            continue
+        elif isinstance(artist, mpl.spines.Spine):
+            parts.append((artist.spine_type,
+                          repr(artist.get_position()),
+                          repr(artist.get_bounds())))
+        elif isinstance(artist, mpl.text.Text):
+            parts.append(_text_signature(ax, artist))
+        else:
+            # legends, offset boxes, unclipped lines
+            parts.append(_Unique(artist))
+    return tuple(parts)
+
+
+def ax_signature(ax, renderer, ticks=True):
+    """
+    Everything that decides the margins of ax around its box.
+
+    With ticks=False the ticks are described by their tickers and view
+    interval, cheap but only comparable within one figure. With
+    ticks=True by their values and labels, comparable across figures.
+    """
+    if not ax.get_visible():
+        return None
+    titles = [ax.title] + [getattr(ax, name, None) for name in SIDE_TITLES]
+    if any(title is None for title in titles):
+        return _Unique(ax)
+
+    box = ax.get_position(original=True)
+    fig = ax.get_figure()
+    width = box.width * fig.bbox.width
+    return (round(width, 3),
+            round(box.height * fig.bbox.height, 3),
+            ax.axison,
+            _axis_signature(ax.xaxis, ticks),
+            _axis_signature(ax.yaxis, ticks),
+            tuple(_title_signature(title, renderer, width)
+                  for title in titles),
+            _extra_signature(ax))
+
+
+def _measure(ax, renderer):
+    """
+    Margins of ax (left, right, top, bottom) in pixels.
+    """
+    fig = ax.get_figure()
+    box = fig.transFigure.transform_bbox(ax.get_position(original=True))
+    tight = ax.get_tightbbox(renderer, for_layout_only=True)
+    with _LOCK:
+        _STATS['measured'] += 1
+    if tight is None:
+        return np.zeros(4)
+    return np.array([box.x0 - tight.x0,
+                     tight.x1 - box.x1,
+                     tight.y1 - box.y1,
+                     box.y0 - tight.y0])
+
+
+def _cells(fig):
+    """
+    Visible axes per gridspec cell, None if not all are on one gridspec.
+    """
+    cells = OrderedDict()
+    gridspec = None
+    for ax in fig.axes:
+        if not ax.get_visible() or not ax.get_in_layout():
+            continue
+        spec = ax.get_subplotspec()
+        if spec is None:
+            return None, None
+        spec = spec.get_topmost_subplotspec()
+        if gridspec is None:
+            gridspec = spec.get_gridspec()
+        elif spec.get_gridspec() is not gridspec:
+            return None, None
+        key = (spec.rowspan.start, spec.rowspan.stop,
+               spec.colspan.start, spec.colspan.stop)
+        cells.setdefault(key, list()).append(ax)
+    if gridspec is None or gridspec.locally_modified_subplot_params():
+        return None, None
+    return gridspec, cells
+
+
+def _suptitle_signature(text):
+    if text is None or not text.get_in_layout():
+        return None
+    return _label_signature(text)
+
+
+def _signatures(cells, renderer):
+    """
+    Signature of every cell, computing the tick labels of one ax per
+    group of axes with the same tickers, limits and labels.
+
+    Returns
+    -------
+
+        signatures : OrderedDict
+            {cell: tuple of ax signatures}
+
+        representatives : dict
+            {ax signature: first ax with it}
+    """
+    local_signatures = dict()
+    representatives = dict()
+    signatures = OrderedDict()
+
+    for cell, axes in cells.items():
+        cell_signatures = list()
+        for ax in axes:
+            local = ax_signature(ax, renderer, ticks=False)
+            if local not in local_signatures:
+                signature = ax_signature(ax, renderer, ticks=True)
+                local_signatures[local] = signature
+                representatives.setdefault(signature, ax)
+            cell_signatures.append(local_signatures[local])
+        signatures[cell] = tuple(cell_signatures)
+
+    return signatures, representatives
+
+
+def _margins(fig, renderer, signatures, representatives):
+    """
+    Margins of every cell, measuring one ax per signature not cached.
+    """
+    measured = dict()
+    for signature, ax in representatives.items():
+        key = (signature, fig.dpi)
+        cacheable = _cacheable(signature)
+        value = _cache_get(_MARGINS, key, 'margin_hits') \
+            if cacheable else None
+        if value is None:
+            value = _measure(ax, renderer)
+            if cacheable:
+                _cache_put(_MARGINS, key, value, MAX_MARGINS)
+        measured[signature] = value
+
+    # twin axes: union of their boxes
+    return OrderedDict(
+        (cell, np.max([measured[sig] for sig in cell_signatures], axis=0))
+        for cell, cell_signatures in signatures.items())
+
+
+def _subplots_kws(fig, renderer, shape, margins, pad=1.08, h_pad=None,
+                  w_pad=None):
+    """
+    matplotlib's tight_layout solution (_auto_adjust_subplotpars) from
+    the margins of each cell.
+    """
+    rows, cols = shape
+
+    font_size_inch = (FontProperties(
+        size=mpl.rcParams['font.size']).get_size_in_points() / 72.)
+    pad_inch = pad * font_size_inch
+    vpad_inch = h_pad * font_size_inch if h_pad is not None else pad_inch
+    hpad_inch = w_pad * font_size_inch if w_pad is not None else pad_inch
+
+    width, height = fig.bbox.width, fig.bbox.height
+    fig_width_inch, fig_height_inch = fig.get_size_inches()
+
+    vspaces = np.zeros((rows + 1, cols))
+    hspaces = np.zeros((rows, cols + 1))
+    for (r0, r1, c0, c1), (left, right, top, bottom) in margins.items():
+        hspaces[r0:r1, c0] += left / width
+        hspaces[r0:r1, c1] += right / width
+        vspaces[r0, c0:c1] += top / height
+        vspaces[r1, c0:c1] += bottom / height
+
+    def suplabel_size(text, attr):
+        if text is None or not text.get_in_layout():
+            return 0.
+        extent = fig.transFigure.inverted().transform_bbox(
+            text.get_window_extent(renderer))
+        return getattr(extent, attr)
+
+    suptitle, supxlabel, supylabel = [getattr(fig, name)
+                                      for name in SUPLABELS]
+
+    margin_left = max(hspaces[:, 0].max(), 0) + pad_inch / fig_width_inch
+    if supylabel is not None and supylabel.get_in_layout():
+        margin_left += suplabel_size(supylabel, 'width') + \
+            pad_inch / fig_width_inch
+    margin_right = max(hspaces[:, -1].max(), 0) + pad_inch / fig_width_inch
+    margin_top = max(vspaces[0, :].max(), 0) + pad_inch / fig_height_inch
+    if suptitle is not None and suptitle.get_in_layout():
+        margin_top += suplabel_size(suptitle, 'height') + \
+            pad_inch / fig_height_inch
+    margin_bottom = max(vspaces[-1, :].max(), 0) + pad_inch / fig_height_inch
+    if supxlabel is not None and supxlabel.get_in_layout():
+        margin_bottom += suplabel_size(supxlabel, 'height') + \
+            pad_inch / fig_height_inch
+
+    if margin_left + margin_right >= 1 or margin_bottom + margin_top >= 1:
+        return None
+
+    kwargs = dict(left=margin_left,
+                  right=1 - margin_right,
+                  bottom=margin_bottom,
+                  top=1 - margin_top)
+
+    if cols > 1:
+        hspace = hspaces[:, 1:-1].max() + hpad_inch / fig_width_inch
+        h_axes = (1 - margin_right - margin_left - hspace * (cols - 1)) / cols
+        if h_axes < 0:
+            return None
+        kwargs['wspace'] = hspace / h_axes
+    if rows > 1:
+        vspace = vspaces[1:-1, :].max() + vpad_inch / fig_height_inch
+        v_axes = (1 - margin_top - margin_bottom - vspace * (rows - 1)) / rows
+        if v_axes < 0:
+            return None
+        kwargs['hspace'] = vspace / v_axes
+
+    return {name: float(value) for name, value in kwargs.items()}
+
+
+def fast_layout_kws(fig, pad=1.08, h_pad=None, w_pad=None):
+    """
+    subplots_adjust kwargs equal to what fig.tight_layout would apply.
+
+    Returns
+    -------
+
+        subplots_kws : dict or None
+            left, right, bottom, top, wspace, hspace. None if the axes
+            aren't on one gridspec, the figure can't be measured (use
+            fig.tight_layout then) or their decorations don't fit the
+            figure.
+    """
+    get_renderer = getattr(fig.canvas, 'get_renderer', None)
+    if get_renderer is None or \
+            not all(hasattr(fig, name) for name in SUPLABELS):
+        return None
+
+    gridspec, cells = _cells(fig)
+    if not cells:
+        return None
+
+    renderer = get_renderer()
+    shape = gridspec.get_geometry()
+    signatures, representatives = _signatures(cells, renderer)
+
+    key = (tuple(np.round(fig.get_size_inches(), 6)),
+           fig.dpi,
+           shape,
+           pad, h_pad, w_pad,
+           mpl.rcParams['font.size'],
+           tuple(_suptitle_signature(getattr(fig, name))
+                 for name in SUPLABELS),
+           tuple(signatures.items()))
+    cacheable = _cacheable(key)
+
+    if cacheable:
+        kwargs = _cache_get(_LAYOUTS, key, 'layout_hits')
+        if kwargs is not None:
+            return dict(kwargs)
+
+    margins = _margins(fig, renderer, signatures, representatives)
+
+    kwargs = _subplots_kws(fig, renderer, shape, margins,
+                           pad=pad, h_pad=h_pad, w_pad=w_pad)
+    if kwargs is not None and cacheable:
+        _cache_put(_LAYOUTS, key, dict(kwargs), MAX_LAYOUTS)
+
+    return kwargs
+
+
+def fast_layout(fig, subplots_kws=None, pad=1.08, h_pad=None, w_pad=None):
+    """
+    Apply fast_layout_kws, or subplots_kws from an earlier call to skip
+    measuring.
+
+    Returns
+    -------
+
+        subplots_kws : dict or None
+            The applied kwargs, None if the layout couldn't be applied.
+    """
+    if subplots_kws is None:
+        subplots_kws = fast_layout_kws(fig, pad=pad, h_pad=h_pad,
+                                       w_pad=w_pad)
+    if subplots_kws is None:
+        logging.debug("fast layout not applied: axes not on one gridspec, "
+                      "figure not measurable or decorations don't fit it")
+        return None
+
+    fig.subplots_adjust(**subplots_kws)
+    return subplots_kws
@@ -0,0 +1,253 @@
+"""
+Highlight overlays of an ax drawn as a few collections instead of one
+artist per line or bar.
+
+Example:
+overlay = Overlay(ax)
+for value in thresholds:
+    overlay.add_span(value, axis='yaxis', color='C3', alpha=.3)
+overlay.add_bar(2, 0.8, color='C2')
+overlay.draw()
+"""
+import logging
+import weakref
+import numpy as np
+import matplotlib as mpl
+import matplotlib.collections
+import matplotlib.colors
+
+from seabornextends.retouch import rasterize
+
+
+# style kwargs a collection can vary per element, with their aliases
+LINE_STYLE_KWS = {'color': 'color', 'c': 'color',
+                  'alpha': 'alpha',
+                  'linewidth': 'linewidth', 'lw': 'linewidth',
+                  'linestyle': 'linestyle', 'ls': 'linestyle'}
+
+BAR_STYLE_KWS = {'color': 'color', 'alpha': 'alpha'}
+
+# collections drawn by Overlay, entries go away with their collection
+_OVERLAYS = weakref.WeakSet()
+
+
+def overlay_collections(ax):
+    """
+    Collections of ax drawn by Overlay (highlights, not plotted data),
+    in draw order.
+    """
+    return [c for c in ax.collections if c in _OVERLAYS]
+
+
+def _style(style_kws, names, defaults):
+    """
+    style_kws with aliases resolved and defaults filled, None if it has
+    kwargs a collection can't vary per element (e.g. zorder, label).
+    """
+    style = dict(defaults)
+    for name, value in style_kws.items():
+        if name not in names:
+            return None
+        style[names[name]] = value
+    return style
+
+
+class Overlay(object):
+    """
+    Collects highlight lines and bars of an ax, then draws each kind as
+    one collection with per element colors, alphas, widths and styles:
+
+    - spans: lines across the ax at x (axis='xaxis') or y values, like
+      axvline / axhline, in the blended axis transform.
+    - segments: lines in data coordinates, like vlines / hlines.
+    - ranges: error ranges in data coordinates, drawn over segments.
+    - bars: like bar / barh, one PolyCollection.
+
+    Highlights with kwargs that can't vary per element are drawn on
+    their own by add_* right away.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self._reset()
+
+    def _reset(self):
+        self._spans = {'xaxis': list(), 'yaxis': list()}
+        self._segments = list()
+        self._ranges = list()
+        self._bars = list()
+
+    def add_span(self, value, axis='yaxis', **style_kws):
+        """
+        Line across the ax at value, see axvline / axhline.
+        """
+        if value is None:
+            return
+        style = _style(style_kws, LINE_STYLE_KWS, {'color': 'r',
+                                                   'alpha': None,
+                                                   'linewidth': 1.5,
+                                                   'linestyle': 'solid'})
+        if style is None:
+            func = self.ax.axvline if axis == 'xaxis' else self.ax.axhline
+            rasterize.keep_vector(func(value, **style_kws))
+            return
+        self._spans[axis].append((value, style))
+
+    def add_segment(self, start, end, **style_kws):
+        """
+        Line from start to end, (x, y) points in data coordinates.
+        """
+        style = _style(style_kws, LINE_STYLE_KWS, {'color': 'r',
+                                                   'alpha': None,
+                                                   'linewidth': 1.5,
+                                                   'linestyle': 'solid'})
+        if style is None:
+            msg = "segment style must only have {} but is {}".format(
+                sorted(LINE_STYLE_KWS), style_kws)
+            logging.error(msg)
+            raise ValueError(msg)
+        self._segments.append(([start, end], style))
+
+    def add_ranges(self, segments, **style_kws):
+        """
+        Error range segments (see utils.interval_segments) sharing a
+        style.
+        """
+        style = _style(style_kws, LINE_STYLE_KWS, {'color': '.26',
+                                                   'alpha': None,
+                                                   'linewidth': 1.5,
+                                                   'linestyle': 'solid'})
+        if style is None:
+            msg = "range style must only have {} but is {}".format(
+                sorted(LINE_STYLE_KWS), style_kws)
+            logging.error(msg)
+            raise ValueError(msg)
+        for segment in segments:
+            self._ranges.append((segment, style))
+
+    def add_bar(self, position, height, vert=True, width=.8, **style_kws):
+        """
+        Bar from 0 to height centered on position, see bar / barh.
+        """
+        style = _style(style_kws, BAR_STYLE_KWS, {'color': 'C0',
+                                                  'alpha': None})
+        if style is None:
+            func = self.ax.bar if vert else self.ax.barh
+            rasterize.keep_vector(func(position, height, width, **style_kws))
+            return
+        self._bars.append((position, height, vert, width, style))
+
+    def __len__(self):
+        return (len(self._spans['xaxis']) + len(self._spans['yaxis']) +
+                len(self._segments) + len(self._ranges) + len(self._bars))
+
+    def _line_collection(self, segments, styles, transform):
+        collection = mpl.collections.LineCollection(
+            segments,
+            colors=[mpl.colors.to_rgba(s['color'], s['alpha'])
+                    for s in styles],
+            linewidths=[s['linewidth'] for s in styles],
+            linestyles=[s['linestyle'] for s in styles],
+            transform=transform)
+        self.ax.add_collection(collection, autolim=False)
+        rasterize.keep_vector(collection)
+        _OVERLAYS.add(collection)
+        return collection
+
+    def _draw_spans(self, axis):
+        spans = self._spans[axis]
+        # e.g. dates to numbers, as axvline / axhline do
+        values = np.asarray(getattr(self.ax, axis).convert_units(
+            [value for value, _ in spans]), dtype=np.float64)
+        if axis == 'xaxis':
+            segments = [[(v, 0), (v, 1)] for v in values]
+            transform = self.ax.get_xaxis_transform(which='grid')
+            lo, hi = self.ax.get_xbound()
+        else:
+            segments = [[(0, v), (1, v)] for v in values]
+            transform = self.ax.get_yaxis_transform(which='grid')
+            lo, hi = self.ax.get_ybound()
+
+        collection = self._line_collection(segments,
+                                           [style for _, style in spans],
+                                           transform)
+
+        # axvline / axhline extend the data limits on their axis only,
+        # and rescale only if a line is outside the view
+        points = np.zeros((len(values), 2))
+        points[:, 0 if axis == 'xaxis' else 1] = values
+        self.ax.update_datalim(points,
+                               updatex=axis == 'xaxis',
+                               updatey=axis == 'yaxis')
+        if np.any((values < lo) | (values > hi)):
+            self.ax.autoscale_view(scalex=axis == 'xaxis',
+                                   scaley=axis == 'yaxis')
+        return collection
+
+    def _draw_bars(self):
+        polygons, colors = list(), list()
+        sticky_x, sticky_y = False, False
+        for position, height, vert, width, style in self._bars:
+            lo, hi = position - width / 2., position + width / 2.
+            if vert:
+                polygons.append([(lo, 0), (lo, height), (hi, height),
+                                 (hi, 0)])
+                sticky_y = True
+            else:
+                polygons.append([(0, lo), (height, lo), (height, hi),
+                                 (0, hi)])
+                sticky_x = True
+            colors.append(mpl.colors.to_rgba(style['color'],
+                                             style['alpha']))
+
+        collection = mpl.collections.PolyCollection(
+            polygons,
+            facecolors=colors,
+            edgecolors='none',
+            zorder=1)
+        # bars stick to their base like Axes.bar
+        if sticky_x:
+            collection.sticky_edges.x.append(0)
+        if sticky_y:
+            collection.sticky_edges.y.append(0)
+        self.ax.add_collection(collection)
+        rasterize.keep_vector(collection)
+        _OVERLAYS.add(collection)
+        return collection
+
+    def draw(self):
+        """
+        Add the collected highlights to the ax, bars below lines.
+
+        Returns
+        -------
+
+            collections : list
+                Collections added, at most one per kind.
+        """
+        collections = list()
+
+        if self._bars:
+            collections.append(self._draw_bars())
+
+        for axis in ['xaxis', 'yaxis']:
+            if self._spans[axis]:
+                collections.append(self._draw_spans(axis))
+
+        for items in [self._segments, self._ranges]:
+            if not items:
+                continue
+            collection = self._line_collection(
+                [segment for segment, _ in items],
+                [style for _, style in items],
+                self.ax.transData)
+            # error ranges count too, as seaborn's error bars do
+            self.ax.update_datalim(np.concatenate(
+                [segment for segment, _ in items]))
+            collections.append(collection)
+
+        if self._bars or self._segments or self._ranges:
+            self.ax.autoscale_view()
+
+        self._reset()
+        return collections
@@ -0,0 +1,177 @@
+import inspect
+import logging
+import functools
+from collections import OrderedDict
+
+
+# per ax operations of FacetGridRetoucher and how repeated calls merge:
+# 'update' merges kwargs (later values win), 'replace' keeps the last call.
+# the merge key is the operation plus the listed kwargs (with defaults).
+AX_OPERATIONS = {
+    'set_point_sizes': ('replace', ()),
+    'set_point_colors': ('replace', ()),
+    'set_lines_colors': ('replace', ()),
+    'set_lines_width': ('replace', ()),
+    'consolidate_artists': ('replace', ()),
+    'set_lim': ('update', (('axis', 'xaxis'),)),
+    'hide_axis_label': ('replace', (('axis', 'xaxis'),)),
+    'set_visible': ('replace', (('axis', 'xaxis'),)),
+    'set_ticklabel_rotation': ('replace', (('axis', 'xaxis'),)),
+    'touch_dates_axis': ('replace', (('axis', 'xaxis'),)),
+    'set_tick_params': ('update', (('axis', 'xaxis'), ('which', 'major'))),
+    'set_label_size': ('replace', (('axis', 'xaxis'),)),
+}
+
+
+def call_kwargs(method, args, kwargs):
+    """
+    All arguments of a call as one kwargs dict, **kwargs flattened.
+    """
+    signature = inspect.signature(method)
+    bound = signature.bind(*args, **kwargs)
+    call = dict()
+    for name, value in bound.arguments.items():
+        if signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD:
+            call.update(value)
+        else:
+            call[name] = value
+    return call
+
+
+def deferrable(method):
+    """
+    Record calls with retoucher._record instead of running them while
+    the retoucher is lazy. A recorded call returns None, whatever the
+    method returns when applied.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.lazy and not self._applying:
+            call = call_kwargs(method, (self,) + args, kwargs)
+            call.pop('self')
+            self._record(method.__name__, **call)
+            return
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+class RetouchPlan(object):
+    """
+    Ordered retouch operations that are merged and applied in one pass
+    per axis.
+
+    Consecutive per ax operations (set_lim, set_tick_params, ...) are
+    merged, the last set_lim per axis wins and tick_params per axis are
+    combined, then applied ax by ax. Grid level operations (highlights,
+    legends, annotations) and FigRetoucher operations ('fig.' prefix)
+    run in their recorded position, so they see the same state as when
+    called eagerly.
+
+    A plan holds no reference to a grid and can be applied to any
+    retoucher whose grid has the same shape.
+
+    Example:
+    plan = RetouchPlan()
+    plan.record('set_lim', axis='xaxis', left=0)
+    plan.record('set_tick_params', axis='xaxis', labelsize=8)
+    plan.record('set_lim', axis='xaxis', right=100)
+    plan.record('fig.set_size', w=10, h=4)
+    for retoucher in retouchers:
+        plan.apply(retoucher)
+    """
+
+    def __init__(self, operations=None):
+        self.operations = list()
+        self._steps = None
+        for name, kwargs in operations or list():
+            self.record(name, **(kwargs or dict()))
+
+    def __len__(self):
+        return len(self.operations)
+
+    def record(self, name, **kwargs):
+        """
+        Add a retoucher operation, e.g. record('set_lim', left=0).
+        """
+        self.operations.append((name, kwargs))
+        self._steps = None
+
+    def _merge_key(self, name, kwargs):
+        if name not in AX_OPERATIONS or kwargs.get('reset'):
+            return None
+        _, key_kws = AX_OPERATIONS[name]
+        return (name,) + tuple(kwargs.get(k, default)
+                               for k, default in key_kws)
+
+    def compile(self):
+        """
+        Merged steps, cached until the next record.
+
+        Returns
+        -------
+
+            steps : list
+                ('axes', [(name, kwargs), ...]) for a run of per ax
+                operations or ('call', name, kwargs) for the others.
+        """
+
+        if self._steps is not None:
+            return self._steps
+
+        steps = list()
+        run = OrderedDict()
+
+        def flush():
+            if run:
+                steps.append(('axes', list(run.values())))
+                run.clear()
+
+        for name, kwargs in self.operations:
+            key = self._merge_key(name, kwargs)
+            if key is None:
+                flush()
+                steps.append(('call', name, kwargs))
+            elif key in run and AX_OPERATIONS[name][0] == 'update':
+                run[key] = (name, dict(run[key][1], **kwargs))
+            else:
+                run[key] = (name, dict(kwargs))
+        flush()
+
+        logging.debug("{} operations compiled to {} steps".format(
+            len(self.operations), len(steps)))
+
+        self._steps = steps
+        return steps
+
+    def apply(self, retoucher):
+        """
+        Apply the plan to a FacetGridRetoucher, or call the operations
+        one by one on retouchers without per ax support.
+        """
+
+        applying = getattr(retoucher, '_applying', False)
+        retoucher._applying = True
+        try:
+            for step in self.compile():
+                if step[0] == 'axes':
+                    self._apply_axes(retoucher, step[1])
+                else:
+                    self._call(retoucher, step[1], step[2])
+        finally:
+            retoucher._applying = applying
+
+    def _apply_axes(self, retoucher, operations):
+        if not hasattr(retoucher, '_retouch_ax'):
+            for name, kwargs in operations:
+                self._call(retoucher, name, kwargs)
+            return
+
+        for idx in range(len(retoucher.ax_retouchers)):
+            for name, kwargs in operations:
+                retoucher._retouch_ax(idx, name, kwargs)
+
+    def _call(self, retoucher, name, kwargs):
+        target = retoucher
+        if name.startswith('fig.'):
+            target, name = retoucher.fig, name[len('fig.'):]
+        getattr(target, name)(**kwargs)
@@ -0,0 +1,117 @@
+import io
+import weakref
+import logging
+import numpy as np
+import matplotlib as mpl
+import matplotlib.artist
+import matplotlib.collections
+import matplotlib.lines
+import matplotlib.patches
+
+
+# artists drawn as highlights, never rasterized
+_KEEP_VECTOR = weakref.WeakSet()
+
+
+def keep_vector(artists):
+    """
+    Exclude artists (or containers of artists) from rasterize_heavy.
+    """
+    if isinstance(artists, mpl.artist.Artist):
+        artists = [artists]
+    for artist in artists:
+        _KEEP_VECTOR.add(artist)
+    return artists
+
+
+def element_count(artist):
+    """
+    Number of primitives a vector backend writes for artist: vertices of
+    lines and polygons, markers of scatter collections.
+    """
+    if isinstance(artist, mpl.lines.Line2D):
+        return len(artist.get_xydata())
+
+    if isinstance(artist, mpl.collections.Collection):
+        paths = artist.get_paths()
+        offsets = artist.get_offsets()
+        if len(offsets) > 1:
+            # markers stamped at every offset
+            return len(offsets)
+        return int(np.sum([len(path.vertices) for path in paths]))
+
+    if isinstance(artist, mpl.patches.Patch):
+        return len(artist.get_path().vertices)
+
+    return 0
+
+
+def _candidates(ax):
+    return list(ax.lines) + list(ax.collections) + list(ax.patches)
+
+
+def _export_size(fig, fmt, **savefig_kws):
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **savefig_kws)
+    return len(buf.getvalue())
+
+
+def rasterize_heavy(fig, threshold=5000, measure=None, **savefig_kws):
+    """
+    Rasterize the artists of fig with more than threshold elements.
+
+    Rasterized artists are drawn at the savefig dpi in vector exports
+    (PDF, SVG, EPS). Axes, ticks, text and highlights stay vector.
+
+    Parameters
+    ----------
+
+        threshold : int, default 5000
+            Elements (vertices or markers) above which an artist is
+            rasterized, see element_count.
+
+        measure : str, default None
+            Export format, e.g. 'pdf' or 'svg', to measure the file
+            size before and after. Exports the figure twice.
+
+        savefig_kws :
+            Passed to fig.savefig when measuring, e.g. dpi.
+
+    Returns
+    -------
+
+        report : dict
+            rasterized: list of {ax, artist, label, elements}.
+            bytes_before, bytes_after, bytes_saved: when measured.
+    """
+
+    report = {'rasterized': list()}
+    heavy = list()
+
+    for ax_idx, ax in enumerate(fig.axes):
+        for artist in _candidates(ax):
+            if artist in _KEEP_VECTOR or artist.get_rasterized():
+                continue
+            n = element_count(artist)
+            if n > threshold:
+                heavy.append(artist)
+                report['rasterized'].append({
+                    'ax': ax_idx,
+                    'artist': type(artist).__name__,
+                    'label': artist.get_label(),
+                    'elements': n})
+
+    if measure:
+        report['bytes_before'] = _export_size(fig, measure, **savefig_kws)
+
+    for artist in heavy:
+        artist.set_rasterized(True)
+
+    if measure:
+        report['bytes_after'] = _export_size(fig, measure, **savefig_kws)
+        report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+
+    logging.debug("rasterized {} artists over {} elements".format(
+        len(heavy), threshold))
+
+    return report
@@ -0,0 +1,789 @@
+import logging
+import numpy as np
+import pandas as pd
+
+
+def grouped_estimates(values, codes, n_groups, estimator=np.mean):
+    """
+    Apply an estimator to values split by integer group codes
+    in a single grouped pass.
+
+    Parameters
+    ----------
+
+        values : array
+            Values to summarize, e.g. df['order_value'].values.
+
+        codes : array of int
+            Group of each value, rows with code < 0 are skipped.
+
+        n_groups : int
+            Number of groups, codes must be < n_groups.
+
+        estimator : callable, default np.mean
+            Reduces a 1d array to a scalar. numpy reductions
+            (np.mean, np.median, np.sum, ...) run vectorized in pandas.
+
+    Returns
+    -------
+
+        estimates : np.ndarray
+            One estimate per group, nan for empty groups.
+    """
+
+    values = np.asarray(values)
+    codes = np.asarray(codes)
+
+    keep = codes >= 0
+    grouped = pd.Series(values[keep]).groupby(codes[keep])
+    aggregated = grouped.agg(estimator)
+
+    estimates = np.full(n_groups, np.nan)
+    estimates[aggregated.index.values] = aggregated.values
+
+    return estimates
+
+
+CI_COLUMNS = ['estimate', 'ci_low', 'ci_high']
+
+# resampled values per bootstrap batch, 32 MB of float64
+BOOT_CHUNKSIZE = 2 ** 22
+
+# per worker process state, set by _init_bootstrap
+_BOOT = dict()
+
+
+def _init_bootstrap(args):
+    _BOOT['args'] = args
+
+
+def _replicate_estimates(resampled, starts, counts, estimator):
+    """
+    Estimate of every group in every bootstrap replicate (a row of
+    resampled, groups are contiguous slices of it).
+    """
+    if estimator in (np.mean, np.sum, 'mean', 'sum'):
+        sums = np.add.reduceat(resampled, starts, axis=1)
+        if estimator in (np.sum, 'sum'):
+            return sums
+        return sums / counts
+
+    if isinstance(estimator, str):
+        estimator = getattr(np, estimator)
+
+    replicates = np.empty((len(resampled), len(starts)))
+    for group, (start, count) in enumerate(zip(starts, counts)):
+        block = resampled[:, start:start + count]
+        try:
+            replicates[:, group] = estimator(block, axis=1)
+        except TypeError:
+            # estimator without an axis argument
+            replicates[:, group] = np.apply_along_axis(estimator, 1, block)
+    return replicates
+
+
+def _bootstrap_chunk(task, args=None):
+    """
+    n_boot replicates of every group, resampling all groups at once with
+    one index matrix.
+    """
+    seed, n_boot = task
+    values, codes, starts, counts, estimator = args or _BOOT['args']
+
+    # uniform floats scaled to each row's group: much faster than
+    # integers with a per row upper bound
+    rng = np.random.default_rng(seed)
+    uniform = rng.random((n_boot, len(values)))
+    uniform *= counts[codes]
+    draws = uniform.astype(np.intp)
+    del uniform
+    draws += starts[codes]
+
+    return _replicate_estimates(values[draws], starts, counts, estimator)
+
+
+def grouped_bootstrap(values,
+                      codes,
+                      n_groups,
+                      estimator=np.mean,
+                      ci=95,
+                      n_boot=1000,
+                      seed=None,
+                      chunksize=BOOT_CHUNKSIZE,
+                      processes=None):
+    """
+    Estimate and percentile bootstrap confidence interval of every
+    group, all groups resampled at once.
+
+    Each batch of replicates draws one index matrix (replicates x rows)
+    that resamples every group within itself, so the cost is a few
+    numpy calls per batch instead of a Python loop per group and
+    replicate. mean and sum reduce all groups at once, other estimators
+    (np.median, np.std, ...) once per group over all replicates.
+
+    Parameters
+    ----------
+
+        values : array
+            Values to summarize, nan are skipped.
+
+        codes : array of int
+            Group of each value, rows with code < 0 are skipped.
+
+        n_groups : int
+
+        estimator : callable or str, default np.mean
+
+        ci : float, default 95
+            Width of the interval in percent, None skips the bootstrap.
+
+        n_boot : int, default 1000
+            Bootstrap replicates.
+
+        seed : int, default None
+            Seed of the resampling. Every batch draws from its own
+            stream spawned from seed, so results depend on seed and
+            chunksize but not on processes.
+
+        chunksize : int, default BOOT_CHUNKSIZE
+            Resampled values held per batch, bounds the memory used.
+
+        processes : int, default None
+            Run the batches on a process pool of this size.
+
+    Returns
+    -------
+
+        intervals : pd.DataFrame
+            One row per group (0..n_groups - 1) with count, estimate,
+            ci_low and ci_high, nan for empty groups.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+
+    estimates = grouped_estimates(values, codes, n_groups, estimator)
+    counts = np.bincount(codes, minlength=n_groups)
+
+    low = np.full(n_groups, np.nan)
+    high = np.full(n_groups, np.nan)
+    intervals = pd.DataFrame({'count': counts,
+                              'estimate': estimates,
+                              'ci_low': low,
+                              'ci_high': high},
+                             columns=['count'] + CI_COLUMNS)
+
+    filled = np.flatnonzero(counts)
+    if ci is None or not len(filled):
+        return intervals
+
+    # groups contiguous, renumbered over the filled ones
+    order = np.argsort(codes, kind='stable')
+    group_index = np.full(n_groups, -1, dtype=np.intp)
+    group_index[filled] = np.arange(len(filled))
+    sorted_codes = group_index[codes[order]]
+    group_counts = counts[filled]
+    starts = np.cumsum(group_counts) - group_counts
+
+    args = (values[order], sorted_codes, starts, group_counts, estimator)
+
+    per_batch = max(1, min(n_boot, chunksize // max(len(values), 1)))
+    sizes = [min(per_batch, n_boot - start)
+             for start in range(0, n_boot, per_batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = list(zip(seeds, sizes))
+
+    if processes:
+        import multiprocessing
+
+        pool = multiprocessing.Pool(processes=processes,
+                                    initializer=_init_bootstrap,
+                                    initargs=(args,))
+        try:
+            replicates = pool.map(_bootstrap_chunk, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        replicates = [_bootstrap_chunk(task, args) for task in tasks]
+
+    replicates = np.concatenate(replicates)
+    with np.errstate(invalid='ignore'):
+        low[filled], high[filled] = np.nanpercentile(
+            replicates, [50 - ci / 2., 50 + ci / 2.], axis=0)
+    intervals['ci_low'] = low
+    intervals['ci_high'] = high
+
+    logging.debug("bootstrapped {} groups in {} batches".format(
+        len(filled), len(tasks)))
+
+    return intervals
+
+
+def shared_bin_edges(values, bins=None, max_bins=50):
+    """
+    Bin edges shared by every facet of a histogram.
+
+    Parameters
+    ----------
+
+        values : array
+            All values of the plotted column, nans are ignored.
+
+        bins : int or array, default None
+            Number of bins or the edges themselves. If None uses the
+            Freedman-Diaconis rule on all values, capped at max_bins,
+            like seaborn does for a single facet.
+    """
+
+    if bins is not None and np.ndim(bins) == 1:
+        return np.asarray(bins, dtype=np.float64)
+
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    lo, hi = values.min(), values.max()
+
+    if bins is None:
+        q25, q75 = np.percentile(values, [25, 75])
+        h = 2 * (q75 - q25) / (len(values) ** (1. / 3))
+        if h == 0 or hi == lo:
+            bins = int(np.sqrt(len(values)))
+        else:
+            bins = int(np.ceil((hi - lo) / h))
+        bins = max(min(bins, max_bins), 1)
+
+    if hi == lo:
+        lo, hi = lo - 0.5, hi + 0.5
+
+    return np.linspace(lo, hi, int(bins) + 1)
+
+
+def grouped_histogram(values, codes, n_groups, edges):
+    """
+    Histogram of every group on the same edges with one bincount.
+
+    Values outside the edges or with code < 0 are dropped, the last
+    bin is closed like np.histogram.
+
+    Returns
+    -------
+
+        counts : np.ndarray
+            Shape (n_groups, len(edges) - 1).
+    """
+
+    codes = np.asarray(codes)
+    n_bins = len(edges) - 1
+
+    bin_idx = _bin_index(values, edges)
+
+    keep = (codes >= 0) & (bin_idx >= 0)
+    flat = codes[keep] * n_bins + bin_idx[keep]
+    counts = np.bincount(flat, minlength=n_groups * n_bins)
+
+    return counts.reshape(n_groups, n_bins)
+
+
+def _bin_index(values, edges):
+    """
+    Bin of every value, the last bin closed like np.histogram, -1 for
+    values outside the edges or nan.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_bins = len(edges) - 1
+
+    bin_idx = np.searchsorted(edges, values, side='right') - 1
+    bin_idx[values == edges[-1]] = n_bins - 1
+    bin_idx[(bin_idx >= n_bins) | np.isnan(values)] = -1
+
+    return bin_idx
+
+
+def joint_histogram(x, y, x_edges, y_edges):
+    """
+    2D histogram of x, y and both marginal histograms from one binning,
+    marginals are the sums of the 2D counts so they share its edges.
+
+    Pairs with a value outside the edges or nan are dropped.
+
+    Returns
+    -------
+
+        counts : np.ndarray
+            Shape (len(x_edges) - 1, len(y_edges) - 1).
+
+        x_counts, y_counts : np.ndarray
+    """
+
+    x_idx = _bin_index(x, x_edges)
+    y_idx = _bin_index(y, y_edges)
+    n_x, n_y = len(x_edges) - 1, len(y_edges) - 1
+
+    keep = (x_idx >= 0) & (y_idx >= 0)
+    counts = np.bincount(x_idx[keep] * n_y + y_idx[keep],
+                         minlength=n_x * n_y).reshape(n_x, n_y)
+
+    return counts, counts.sum(axis=1), counts.sum(axis=0)
+
+
+def hexbin_counts(x, y, gridsize=50, extent=None):
+    """
+    Points per hexagon on the lattice of Axes.hexbin (linear scales),
+    computed with two bincounts.
+
+    Parameters
+    ----------
+
+        gridsize : int, default 50
+            Hexagons in the x direction.
+
+        extent : (xmin, xmax, ymin, ymax), default None
+            Range of the lattice, the data range if None.
+
+    Returns
+    -------
+
+        centers : np.ndarray
+            Shape (n, 2), centers of the hexagons with points.
+
+        counts : np.ndarray
+            Points in each of these hexagons.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+
+    xmin, xmax, ymin, ymax = extent or (x.min(), x.max(), y.min(), y.max())
+    # same padding as Axes.hexbin
+    padding = 1.e-9 * (xmax - xmin)
+    xmin, xmax = xmin - padding, xmax + padding
+
+    nx = gridsize
+    ny = int(nx / np.sqrt(3))
+    sx = (xmax - xmin) / nx
+    sy = (ymax - ymin) / ny if ymax > ymin else 1.
+
+    ix = (x - xmin) / sx
+    iy = (y - ymin) / sy
+    keep = (ix >= 0) & (ix <= nx) & (iy >= 0) & (iy <= ny)
+    ix, iy = ix[keep], iy[keep]
+
+    # nearest center on the lattice and on the lattice offset by half
+    ix1, iy1 = np.round(ix).astype(np.intp), np.round(iy).astype(np.intp)
+    ix2, iy2 = np.floor(ix).astype(np.intp), np.floor(iy).astype(np.intp)
+    first = ((ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2 <
+             (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2)
+    ix2, iy2 = np.minimum(ix2, nx - 1), np.minimum(iy2, ny - 1)
+
+    counts1 = np.bincount(ix1[first] * (ny + 1) + iy1[first],
+                          minlength=(nx + 1) * (ny + 1))
+    counts2 = np.bincount(ix2[~first] * ny + iy2[~first],
+                          minlength=nx * ny)
+
+    i1, j1 = np.divmod(np.arange((nx + 1) * (ny + 1)), ny + 1)
+    i2, j2 = np.divmod(np.arange(nx * ny), ny)
+    centers = np.vstack([
+        np.column_stack([xmin + sx * i1, ymin + sy * j1]),
+        np.column_stack([xmin + sx * (i2 + .5), ymin + sy * (j2 + .5)])])
+    counts = np.concatenate([counts1, counts2])
+
+    filled = counts > 0
+    return centers[filled], counts[filled]
+
+
+def grouped_describe(values, codes, n_groups, weights=None):
+    """
+    count, std, min and max of every group in one grouped pass.
+
+    Parameters
+    ----------
+
+        weights : array, default None
+            Weight of each value, e.g. bin counts when values are
+            bin centers. count is then the sum of weights.
+
+    Returns
+    -------
+
+        described : pd.DataFrame
+            Indexed by group (0..n_groups - 1), nan for empty groups.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    keep = (codes >= 0) & ~np.isnan(values)
+
+    if weights is None:
+        described = pd.Series(values[keep]).groupby(codes[keep]).agg(
+            ['count', 'std', 'min', 'max'])
+        return described.reindex(np.arange(n_groups))
+
+    weights = np.asarray(weights, dtype=np.float64)
+    keep &= weights > 0
+    values, codes, weights = values[keep], codes[keep], weights[keep]
+
+    count = np.bincount(codes, weights=weights, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=weights * values,
+                           minlength=n_groups) / count
+        sq = np.bincount(codes, weights=weights * (values - mean[codes]) ** 2,
+                         minlength=n_groups)
+        std = np.sqrt(sq / (count - 1))
+
+    extremes = pd.Series(values).groupby(codes).agg(['min', 'max'])
+    described = pd.DataFrame({'count': count, 'std': std},
+                             columns=['count', 'std'])
+    described = described.join(extremes)
+    described.loc[count == 0, 'count'] = np.nan
+
+    return described
+
+
+def _linear_binning(values, codes, n_groups, lo, dx, n_grid, weights=None):
+    """
+    Spread every value over its two neighbouring grid points.
+    """
+    pos = (values - lo) / dx
+    left = np.clip(np.floor(pos).astype(np.intp), 0, n_grid - 2)
+    frac = np.clip(pos - left, 0, 1)
+    if weights is None:
+        weights = np.ones_like(frac)
+
+    offset = codes * n_grid + left
+    size = n_groups * n_grid
+    counts = np.bincount(offset, weights=weights * (1 - frac),
+                         minlength=size)
+    counts += np.bincount(offset + 1, weights=weights * frac, minlength=size)
+
+    return counts.reshape(n_groups, n_grid)
+
+
+def grouped_kde(values,
+                codes,
+                n_groups,
+                bw='scott',
+                gridsize=100,
+                cut=3,
+                clip=None,
+                n_grid=2048,
+                weights=None):
+    """
+    Gaussian KDE of every group, computed on a shared fine grid with
+    linear binning and an FFT convolution instead of evaluating every
+    kernel at every grid point.
+
+    Parameters
+    ----------
+
+        values : array
+
+        codes : array of int
+            Group of each value, rows with code < 0 are skipped.
+
+        n_groups : int
+
+        bw : 'scott', 'silverman' or float, default 'scott'
+            Bandwidth rule (as in scipy.stats.gaussian_kde) or the
+            bandwidth itself, shared by all groups.
+
+        gridsize, cut, clip :
+            As in seaborn kdeplot, used to build each group's support.
+
+        n_grid : int, default 2048
+            Size of the shared grid the density is computed on.
+
+        weights : array, default None
+            Weight of each value, e.g. bin counts when values are
+            bin centers of precomputed histograms.
+
+    Returns
+    -------
+
+        supports : list of np.ndarray or None
+            Support of each group, None for groups with < 2 values.
+
+        densities : list of np.ndarray or None
+            Density of each group at its support.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    keep = (codes >= 0) & ~np.isnan(values)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        keep &= weights > 0
+        weights = weights[keep]
+    values, codes = values[keep], codes[keep]
+
+    clip = clip or (-np.inf, np.inf)
+
+    described = grouped_describe(values, codes, n_groups, weights=weights)
+    n = described['count'].fillna(0).values
+    std = described['std'].values
+
+    if isinstance(bw, str):
+        if bw not in ['scott', 'silverman']:
+            msg = "bw must be 'scott', 'silverman' or a float"
+            logging.error(msg)
+            raise ValueError(msg)
+        # empty groups get an infinite factor and no density
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if bw == 'scott':
+                factor = n ** (-1. / 5)
+            else:
+                factor = (n * 3 / 4.) ** (-1. / 5)
+            bws = factor * std
+    else:
+        bws = np.full(n_groups, float(bw))
+
+    valid = (n >= 2) & (bws > 0)
+    supports = [None] * n_groups
+    densities = [None] * n_groups
+    if not valid.any():
+        return supports, densities
+
+    support_min = np.maximum(described['min'].values - bws * cut, clip[0])
+    support_max = np.minimum(described['max'].values + bws * cut, clip[1])
+
+    lo = np.nanmin(np.where(valid, described['min'].values - bws * cut,
+                            np.nan))
+    hi = np.nanmax(np.where(valid, described['max'].values + bws * cut,
+                            np.nan))
+    dx = (hi - lo) / (n_grid - 1)
+    grid = lo + dx * np.arange(n_grid)
+
+    counts = _linear_binning(values, codes, n_groups, lo, dx, n_grid,
+                             weights=weights)
+
+    # zero padding to 2 * n_grid keeps the circular convolution linear
+    freqs = np.fft.rfftfreq(2 * n_grid, d=dx)
+    with np.errstate(invalid='ignore'):
+        kernels = np.exp(-2 * (np.pi * freqs[None, :] * bws[:, None]) ** 2)
+    kernels[~valid] = 0
+
+    spectrum = np.fft.rfft(counts, n=2 * n_grid, axis=1) * kernels
+    fine = np.fft.irfft(spectrum, n=2 * n_grid, axis=1)[:, :n_grid]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fine = np.maximum(fine, 0) / (n[:, None] * dx)
+
+    for group in np.flatnonzero(valid):
+        support = np.linspace(support_min[group], support_max[group],
+                              gridsize)
+        supports[group] = support
+        densities[group] = np.interp(support, grid, fine[group])
+
+    return supports, densities
+
+
+# columns of precomputed summaries accepted by the facetted plots
+BOX_STATS_COLUMNS = ['whislo', 'q1', 'med', 'q3', 'whishi']
+HIST_COLUMNS = ['bin_left', 'bin_right', 'count']
+DENSITY_COLUMNS = ['support', 'density']
+
+
+def grouped_box_stats(values, codes, n_groups, whis=1.5):
+    """
+    Box plot statistics of every group from a single sort.
+
+    Quartiles interpolate linearly like np.percentile, whiskers reach
+    the most extreme value within whis * IQR of the box, like
+    matplotlib and seaborn.
+
+    Returns
+    -------
+
+        box_stats : pd.DataFrame
+            One row per group (0..n_groups - 1) with count, mean,
+            whislo, q1, med, q3, whishi and fliers (array of values),
+            the keys Axes.bxp expects. nan for empty groups.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    filled = counts > 0
+
+    def quantile(q):
+        pos = starts + q * np.maximum(counts - 1, 0)
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(lo + 1, starts + counts - 1)
+        lo, hi = lo[filled], hi[filled]
+        frac = pos[filled] - lo
+        result = np.full(n_groups, np.nan)
+        result[filled] = values[lo] + frac * (values[hi] - values[lo])
+        return result
+
+    q1, med, q3 = quantile(.25), quantile(.5), quantile(.75)
+
+    iqr = q3 - q1
+    inside = ((values >= (q1 - whis * iqr)[codes]) &
+              (values <= (q3 + whis * iqr)[codes]))
+
+    whislo = np.full(n_groups, np.nan)
+    whishi = np.full(n_groups, np.nan)
+    if filled.any():
+        within = np.where(inside, values, np.nan)
+        whislo[filled] = np.fmin.reduceat(within, starts[filled])
+        whishi[filled] = np.fmax.reduceat(within, starts[filled])
+
+    # groups are contiguous after the sort, split outliers per group
+    outside_counts = np.bincount(codes[~inside], minlength=n_groups)
+    fliers = np.split(values[~inside], np.cumsum(outside_counts)[:-1])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=values,
+                           minlength=n_groups) / counts
+
+    return pd.DataFrame({'count': counts,
+                         'mean': mean,
+                         'whislo': whislo,
+                         'q1': q1,
+                         'med': med,
+                         'q3': q3,
+                         'whishi': whishi,
+                         'fliers': fliers},
+                        columns=['count', 'mean'] + BOX_STATS_COLUMNS +
+                        ['fliers'])
+
+
+def _split_groups(codes, n_groups, *columns):
+    """
+    Sort rows by group (stable) and split each column per group.
+    """
+    order = np.argsort(codes, kind='mergesort')
+    order = order[codes[order] >= 0]
+    counts = np.bincount(codes[order], minlength=n_groups)
+    bounds = np.cumsum(counts)[:-1]
+    return [np.split(np.asarray(column)[order], bounds)
+            for column in columns]
+
+
+def summary_box_stats(summary, codes, n_groups):
+    """
+    Box stats table from precomputed per group statistics.
+
+    Parameters
+    ----------
+
+        summary : pd.DataFrame
+            One row per group with BOX_STATS_COLUMNS, optionally
+            count, mean and fliers (list of values).
+
+        codes : array of int
+            Group of each summary row, -1 to skip a row.
+
+    Returns
+    -------
+
+        box_stats : pd.DataFrame
+            Same layout as grouped_box_stats.
+    """
+
+    codes = np.asarray(codes)
+    keep = codes >= 0
+    if len(np.unique(codes[keep])) != keep.sum():
+        msg = "summary must have one row per facet and hue level"
+        logging.error(msg)
+        raise ValueError(msg)
+
+    rows = summary[keep].copy()
+    rows.index = codes[keep]
+
+    if 'count' not in rows.columns:
+        rows['count'] = 1
+    if 'mean' not in rows.columns:
+        rows['mean'] = np.nan
+    if 'fliers' not in rows.columns:
+        rows['fliers'] = [np.array([])] * len(rows)
+    rows['fliers'] = [np.asarray(f, dtype=np.float64)
+                      for f in rows['fliers']]
+
+    columns = ['count', 'mean'] + BOX_STATS_COLUMNS + ['fliers']
+    box_stats = rows[columns].reindex(np.arange(n_groups))
+    box_stats['count'] = box_stats['count'].fillna(0)
+
+    return box_stats
+
+
+def summary_histograms(summary, codes, n_groups):
+    """
+    Edges and counts of every group from precomputed bin counts.
+
+    Parameters
+    ----------
+
+        summary : pd.DataFrame
+            One row per bin and group with HIST_COLUMNS, bins of a
+            group must be contiguous.
+
+        codes : array of int
+            Group of each summary row, -1 to skip a row.
+
+    Returns
+    -------
+
+        edges, counts : list of np.ndarray
+            One entry per group, empty for groups without bins.
+    """
+
+    codes = np.asarray(codes)
+    lefts, rights, counts = _split_groups(codes, n_groups,
+                                          *[summary[c].values.astype(float)
+                                            for c in HIST_COLUMNS])
+    edges = list()
+    for group in range(n_groups):
+        order = np.argsort(lefts[group])
+        lefts[group] = lefts[group][order]
+        counts[group] = counts[group][order]
+        rights[group] = rights[group][order]
+        edges.append(np.append(lefts[group], rights[group][-1:]))
+
+    return edges, counts
+
+
+def summary_densities(summary, codes, n_groups):
+    """
+    Support and density of every group from precomputed density grids.
+
+    Parameters
+    ----------
+
+        summary : pd.DataFrame
+            One row per grid point and group with DENSITY_COLUMNS.
+
+        codes : array of int
+            Group of each summary row, -1 to skip a row.
+
+    Returns
+    -------
+
+        supports, densities : list of np.ndarray or None
+            Sorted by support, None for groups with < 2 points.
+    """
+
+    codes = np.asarray(codes)
+    supports, densities = _split_groups(
+        codes, n_groups,
+        summary['support'].values.astype(float),
+        summary['density'].values.astype(float))
+
+    for group in range(n_groups):
+        if len(supports[group]) < 2:
+            supports[group], densities[group] = None, None
+            continue
+        order = np.argsort(supports[group])
+        supports[group] = supports[group][order]
+        densities[group] = densities[group][order]
+
+    return supports, densities
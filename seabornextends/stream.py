@@ -0,0 +1,325 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from seabornextends import instrument
+from seabornextends import plots
+
+
+class RingBuffer(object):
+
+    """
+    Preallocated buffer of the last window values appended, or of all
+    of them when window is None (then grown by doubling).
+
+    A windowed buffer writes every value twice, at i and i + window, so
+    the last window values are always one contiguous slice and view()
+    never copies.
+    """
+
+    def __init__(self, window=None, capacity=1024, dtype=np.float64):
+        if window is not None and window < 1:
+            msg = "window must be a positive int or None but is {}".format(
+                window)
+            logging.error(msg)
+            raise ValueError(msg)
+
+        self.window = window
+        self.size = 0
+        self._head = 0
+        self._data = np.empty(2 * window if window else max(capacity, 1),
+                              dtype=dtype)
+
+    def __len__(self):
+        return self.size
+
+    def append(self, values):
+        values = np.asarray(values)
+        if not len(values):
+            return
+
+        if self.window is None:
+            end = self.size + len(values)
+            if end > len(self._data):
+                data = np.empty(max(2 * len(self._data), end),
+                                dtype=self._data.dtype)
+                data[:self.size] = self._data[:self.size]
+                self._data = data
+            self._data[self.size:end] = values
+            self.size = end
+            return
+
+        values = values[-self.window:]
+        idx = (self._head + np.arange(len(values))) % self.window
+        self._data[idx] = values
+        self._data[idx + self.window] = values
+        self._head = (self._head + len(values)) % self.window
+        self.size = min(self.size + len(values), self.window)
+
+    def view(self):
+        """
+        Values in append order, a view of the buffer.
+        """
+        if self.window is None:
+            return self._data[:self.size]
+        end = self._head + self.window
+        return self._data[end - self.size:end]
+
+
+def _value_range(axis, values):
+    """
+    Min and max of values in axis units (e.g. date numbers), None if
+    all are missing.
+    """
+    values = values[~pd.isnull(values)]
+    if not len(values):
+        return None
+    return axis.convert_units(np.array([values.min(), values.max()]))
+
+
+@instrument.timed_methods('LineStream')
+class LineStream(object):
+
+    """
+    Append mode for a grid drawn by plots.plot: new rows are routed to
+    their facet and hue level and appended to a buffer behind each
+    line, only the changed axes are redrawn.
+
+    With a window each line shows its last window points, so the cost
+    of an append does not grow with the history. On canvases that
+    support blitting (Agg and the interactive backends) the lines are
+    drawn over a saved background of each ax; the whole figure is only
+    redrawn when the new points leave the limits, which then grow with
+    headroom so this stays rare.
+
+    Example:
+    grid = plots.plot(x='timestamp', y='latency', data=df,
+                      col='region', hue='host')
+    stream = LineStream(grid, window=10000)
+    for batch in batches:
+        stream.append(batch)
+
+    The stream owns the lines: don't call plots.update or
+    consolidate_artists while it is open, close() it first.
+    """
+
+    def __init__(self, grid, window=None, capacity=1024, headroom=0.1,
+                 blit=True):
+
+        self._state = plots._GRID_STATE.get(grid)
+        if self._state is None or self._state['kind'] != 'plot':
+            msg = "grid must be drawn by plots.plot"
+            logging.error(msg)
+            raise ValueError(msg)
+
+        self.grid = grid
+        self.window = window
+        self.capacity = capacity
+        self.headroom = headroom
+        self.blit = blit and grid.fig.canvas.supports_blit
+
+        self._axes = list(grid.axes.flat)
+        self._buffers = dict()
+        self._backgrounds = None
+        self._cid = None
+
+        self._route(grid.data)
+
+        if self.blit:
+            for line in self._lines():
+                line.set_animated(True)
+            self._cid = grid.fig.canvas.mpl_connect('draw_event',
+                                                    self._on_draw)
+
+    def _lines(self, ax_indices=None):
+        for (ax_idx, _), lines in self._state['artists'].items():
+            if ax_indices is None or ax_idx in ax_indices:
+                for line in lines:
+                    yield line
+
+    def _on_draw(self, event):
+        """
+        Background of every ax without the lines, then the lines.
+        """
+        canvas = self.grid.fig.canvas
+        if canvas.is_saving():
+            # another renderer, the backgrounds need a new draw
+            self._backgrounds = None
+            return
+
+        self._backgrounds = [canvas.copy_from_bbox(ax.bbox)
+                             for ax in self._axes]
+        for line in self._lines():
+            line.axes.draw_artist(line)
+
+    def _set_lines(self, key, ax):
+        """
+        Point the lines of a facet and hue level at its buffers.
+        """
+        state = self._state
+        x_buffer, y_buffer = self._buffers[key]
+        x, y = x_buffer.view(), y_buffer.view()
+
+        lines = state['artists'].get(key)
+        if lines is None:
+            # level without data when the grid was drawn
+            lines = state['func'](x, y, ax=ax,
+                                  **plots._facet_kws(self.grid, key[1],
+                                                     state['kws']))
+            state['artists'][key] = lines
+            for line in lines:
+                line.set_animated(self.blit)
+            self.grid._update_legend_data(ax)
+            return
+
+        if state['downsample']:
+            x, y = plots._downsample(x, y, ax,
+                                     downsample=state['downsample'],
+                                     **state['downsample_kws'])
+
+        for line in lines:
+            if line.axes is None:
+                msg = ("lines were removed from the grid, e.g. merged by "
+                       "consolidate_artists, stream before consolidating")
+                logging.error(msg)
+                raise ValueError(msg)
+            line.set_data(x, y)
+
+    def _outside(self, ax, x, y):
+        """
+        True if x, y leave the autoscaled limits of ax.
+        """
+        for axis, values, lim, auto in [
+                (ax.xaxis, x, ax.get_xlim(), ax.get_autoscalex_on()),
+                (ax.yaxis, y, ax.get_ylim(), ax.get_autoscaley_on())]:
+            if not auto:
+                continue
+            value_range = _value_range(axis, values)
+            if value_range is None:
+                continue
+            if value_range[0] < min(lim) or value_range[1] > max(lim):
+                return True
+        return False
+
+    def _relimit(self):
+        """
+        Limits of all autoscaled axes from the buffered points, x grows
+        to the right and y both ways by headroom.
+        """
+        for ax in self._axes:
+            ax.relim()
+
+        for ax in self._axes:
+            ax.autoscale_view()
+            if ax.get_autoscalex_on():
+                x0, x1 = ax.get_xlim()
+                ax.set_xlim(x0, x1 + self.headroom * (x1 - x0), auto=None)
+            if ax.get_autoscaley_on():
+                y0, y1 = ax.get_ylim()
+                pad = self.headroom * (y1 - y0) / 2.
+                ax.set_ylim(y0 - pad, y1 + pad, auto=None)
+
+    def _route(self, data):
+        """
+        Append the rows of data to the buffers of their facet and hue
+        level.
+
+        Returns
+        -------
+
+            changed : set of ax indices
+
+            relimit : bool
+        """
+        grid = self.grid
+        x = data[self._state['x']].values
+        y = data[self._state['y']].values
+
+        codes, n_hue = plots._group_codes(grid, x, data=data)
+        if grid._dropna:
+            codes[pd.isnull(y)] = -1
+        n_groups = len(self._axes) * n_hue
+        order, bounds = plots._group_slices(codes, n_groups)
+
+        changed = set()
+        relimit = False
+        for group in np.flatnonzero(np.diff(bounds)):
+            key = divmod(int(group), n_hue)
+            ax = self._axes[key[0]]
+            rows = order[bounds[group]:bounds[group + 1]]
+
+            if key not in self._buffers:
+                self._buffers[key] = (
+                    RingBuffer(self.window, self.capacity, dtype=x.dtype),
+                    RingBuffer(self.window, self.capacity, dtype=y.dtype))
+            x_buffer, y_buffer = self._buffers[key]
+            x_buffer.append(x[rows])
+            y_buffer.append(y[rows])
+
+            self._set_lines(key, ax)
+            changed.add(key[0])
+            relimit = relimit or self._outside(ax, x[rows], y[rows])
+
+        return changed, relimit
+
+    def append(self, data):
+        """
+        Append the rows of data and redraw the axes they went to.
+
+        Parameters
+        ----------
+
+            data : pd.DataFrame
+                Rows with the grid's x, y and facet columns, x sorted
+                within each facet and hue level and after the rows
+                already appended.
+
+        Returns
+        -------
+
+            report : dict
+                axes: indices into grid.axes.flat of the changed axes.
+                redraw: 'blit', 'full' (limits changed or first draw)
+                or 'idle' (canvas without blitting).
+        """
+
+        changed, relimit = self._route(data)
+        report = {'axes': sorted(changed), 'redraw': None}
+        if not changed:
+            return report
+
+        if relimit:
+            self._relimit()
+
+        canvas = self.grid.fig.canvas
+        if not self.blit:
+            canvas.draw_idle()
+            report['redraw'] = 'idle'
+            return report
+
+        if relimit or self._backgrounds is None:
+            # _on_draw saves the backgrounds and draws the lines
+            canvas.draw()
+            report['redraw'] = 'full'
+        else:
+            for ax_idx in changed:
+                ax = self._axes[ax_idx]
+                canvas.restore_region(self._backgrounds[ax_idx])
+                for line in self._lines([ax_idx]):
+                    ax.draw_artist(line)
+                canvas.blit(ax.bbox)
+            report['redraw'] = 'blit'
+
+        canvas.flush_events()
+        return report
+
+    def close(self):
+        """
+        Stop streaming: lines are drawn normally again.
+        """
+        if self._cid is not None:
+            self.grid.fig.canvas.mpl_disconnect(self._cid)
+            self._cid = None
+        for line in self._lines():
+            line.set_animated(False)
+        self._backgrounds = None
@@ -1,4 +1,13 @@
-import scipy
+import zlib
+import weakref
+import numpy as np
+import matplotlib as mpl
+import matplotlib.axes
+import matplotlib.collections
+
+# {Line2D: (xorig, yorig, fingerprint, x, y, cdf)}, entries go away with
+# their line
+_INTEGRALS = weakref.WeakKeyDictionary()
 
 
 def other_axis(axis='xaxis'):
@@ -9,6 +18,127 @@ def other_axis(axis='xaxis'):
         return 'x'
 
 
+def level_codes(values, levels):
+    """
+    Integer position of each value in levels, -1 if not a level.
+
+    Parameters
+    ----------
+
+        values : pd.Series or array
+            Values to encode, e.g. df['country'].
+
+        levels : list
+            Ordered levels, e.g. grid.col_names.
+    """
+
+    import pandas as pd
+
+    values = getattr(values, 'values', values)
+    return pd.Categorical(values, categories=levels).codes.astype(np.intp)
+
+
+def categorical_levels(values, order=None):
+    """
+    Levels of a facet, hue or categorical variable in the order seaborn
+    uses: categories, sorted numbers or order of appearance.
+    """
+
+    import pandas as pd
+
+    if order is not None:
+        return list(order)
+    if hasattr(values, 'cat'):
+        return list(values.cat.categories)
+    levels = pd.unique(values.dropna())
+    if pd.api.types.is_numeric_dtype(values):
+        levels = np.sort(levels)
+    return list(levels)
+
+
+def interval_segments(positions, low, high, vert=True, capsize=0):
+    """
+    Line segments of error ranges: one from low to high at each
+    position, plus caps capsize wide at both ends. Ranges with a nan
+    end are left out.
+
+    Returns
+    -------
+
+        segments : np.ndarray
+            Shape (n_segments, 2, 2), for a LineCollection.
+    """
+
+    positions = np.asarray(positions, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    keep = ~(np.isnan(low) | np.isnan(high))
+    positions, low, high = positions[keep], low[keep], high[keep]
+
+    segments = [np.stack([np.column_stack([positions, low]),
+                          np.column_stack([positions, high])], axis=1)]
+    if capsize:
+        for end in [low, high]:
+            segments.append(np.stack(
+                [np.column_stack([positions - capsize / 2., end]),
+                 np.column_stack([positions + capsize / 2., end])], axis=1))
+
+    segments = np.concatenate(segments)
+    return segments if vert else segments[:, :, ::-1]
+
+
+def facet_codes(grid, data):
+    """
+    Locate every row of data in a seaborn FacetGrid.
+
+    Uses the grid's own row/col/hue variables and level names so the codes
+    line up with grid.axes.flat and grid.hue_names.
+
+    Parameters
+    ----------
+
+        grid : sns.FacetGrid
+
+        data : pd.DataFrame
+            Frame with the grid's row/col/hue columns, usually grid.data.
+
+    Returns
+    -------
+
+        ax_codes : np.ndarray
+            Index into grid.axes.flat for every row, -1 if the row
+            falls outside the grid.
+
+        hue_codes : np.ndarray
+            Index into grid.hue_names for every row (0 without hue),
+            -1 if the hue level is not in the grid.
+    """
+
+    n = len(data)
+    ax_codes = np.zeros(n, dtype=np.intp)
+    hue_codes = np.zeros(n, dtype=np.intp)
+    outside = np.zeros(n, dtype=bool)
+
+    if grid._row_var is not None and grid._col_wrap is None:
+        row_codes = level_codes(data[grid._row_var], grid.row_names)
+        outside |= row_codes < 0
+        ax_codes += row_codes * grid._ncol
+
+    if grid._col_var is not None:
+        col_codes = level_codes(data[grid._col_var], grid.col_names)
+        outside |= col_codes < 0
+        ax_codes += col_codes
+
+    if grid._hue_var is not None:
+        hue_codes = level_codes(data[grid._hue_var], grid.hue_names)
+        outside |= hue_codes < 0
+
+    ax_codes[outside] = -1
+    hue_codes[outside] = -1
+
+    return ax_codes, hue_codes
+
+
 def integrate_line(ax, line_idx=None):
     """
     Get line data from a plot and integrate it using scipy.cumtrapz.
@@ -22,10 +152,178 @@ def integrate_line(ax, line_idx=None):
             is retrieved.
     """
 
-    if not line_idx:
+    if line_idx is None:
         line_idx = len(ax.get_lines()) - 1
 
-    x, y = ax.get_lines()[line_idx].get_data()
-    cdf = scipy.integrate.cumtrapz(y, x, initial=0)
+    return integrate_lines([ax], line_idx=line_idx)[0][0]
+
+
+def _cumulative_trapezoid():
+    from scipy import integrate
+
+    # scipy >= 1.6 renamed cumtrapz (removed in 1.14)
+    return (getattr(integrate, 'cumulative_trapezoid', None) or
+            integrate.cumtrapz)
+
+
+def _grid_axes(grid):
+    """
+    Axes of a FacetGrid, JointGrid, single ax or list of axes.
+    """
+    if isinstance(grid, mpl.axes.Axes):
+        return [grid]
+    if hasattr(grid, 'ax_joint'):
+        return [grid.ax_joint, grid.ax_marg_x, grid.ax_marg_y]
+    if hasattr(grid, 'axes'):
+        return list(np.ravel(grid.axes))
+    return list(np.ravel(grid))
+
+
+def _select_lines(ax, line_idx):
+    lines = ax.get_lines()
+    if line_idx is None:
+        return list(lines)
+    if isinstance(line_idx, (list, tuple, np.ndarray)):
+        return [lines[i] for i in line_idx]
+    return [lines[line_idx]]
+
+
+def _data_fingerprint(xorig, yorig):
+    """
+    Shape, dtype and a checksum of the bytes of a line's x and y, so in
+    place edits of the arrays are seen. Object arrays (e.g. datetime
+    objects) have no meaningful bytes and only count by shape.
+    """
+    fingerprint = list()
+    for values in [xorig, yorig]:
+        values = np.asarray(values)
+        checksum = None
+        if values.dtype != object:
+            checksum = zlib.crc32(np.ascontiguousarray(values).tobytes())
+        fingerprint.append((values.shape, values.dtype.str, checksum))
+    return tuple(fingerprint)
+
+
+def _cached_integral(line, check_data=False):
+    """
+    (x, y, cdf) of line if it was integrated since its data last
+    changed: set_data replaces the orig arrays and marks the line
+    invalid until it recaches. With check_data in place edits of the
+    arrays are seen too.
+    """
+    cached = _INTEGRALS.get(line)
+    if cached is None:
+        return None
+    xorig, yorig = line.get_xdata(orig=True), line.get_ydata(orig=True)
+    if (cached[0] is not xorig or cached[1] is not yorig or
+            getattr(line, '_invalidx', False) or
+            getattr(line, '_invalidy', False)):
+        return None
+    if check_data and (cached[2] is None or
+                       cached[2] != _data_fingerprint(xorig, yorig)):
+        return None
+    return cached[3:]
+
+
+def integrate_lines(grid, line_idx=None, shade=False, shade_kws=None,
+                    check_data=False):
+    """
+    Integrate the lines of every ax of a grid at once, optionally
+    shading the areas under them.
+
+    Lines of the same length are stacked and integrated with one
+    cumulative_trapezoid call, results are cached per line until its
+    data is set again. Areas are drawn as one PolyCollection per ax.
+
+    Example:
+    integrals = integrate_lines(grid, line_idx=0, shade=True)
+    x, y, cdf = integrals[ax_idx][0]
+
+    Parameters
+    ----------
+
+        grid : sns.FacetGrid, sns.JointGrid, ax or list of axes
+
+        line_idx : int or list of int, default None
+            Index of the lines to integrate on every ax, if None
+            all of them.
+
+        shade : bool, default False
+            Fill between each line and 0.
+
+        shade_kws : dict, default None
+            PolyCollection properties, e.g. alpha or facecolors. Each
+            area defaults to the color of its line with alpha 0.3.
+
+        check_data : bool, default False
+            Also compare a checksum of each line's data with the cached
+            one, for lines whose arrays are edited in place. Costs a
+            pass over the data on every call.
+
+    Returns
+    -------
+
+        integrals : list
+            One list of (x, y, cdf) per ax, one tuple per selected line.
+    """
+
+    axes = _grid_axes(grid)
+    lines = [_select_lines(ax, line_idx) for ax in axes]
+
+    # integrate the lines not cached yet, one call per line length
+    pending = dict()
+    for line in [line for ax_lines in lines for line in ax_lines]:
+        if _cached_integral(line, check_data=check_data) is None:
+            if check_data:
+                # the converted data is stale after in place edits
+                line.recache(always=True)
+            xy = np.asarray(line.get_xydata(), dtype=np.float64)
+            pending.setdefault(len(xy), list()).append((line, xy))
+
+    cumulative_trapezoid = _cumulative_trapezoid()
+    for same_length in pending.values():
+        xys = np.stack([xy for _, xy in same_length])
+        if xys.shape[1]:
+            cdfs = cumulative_trapezoid(xys[:, :, 1], xys[:, :, 0],
+                                        axis=-1, initial=0)
+        else:
+            cdfs = np.empty((len(xys), 0))
+        for (line, xy), cdf in zip(same_length, cdfs):
+            xorig = line.get_xdata(orig=True)
+            yorig = line.get_ydata(orig=True)
+            fingerprint = None
+            if check_data:
+                fingerprint = _data_fingerprint(xorig, yorig)
+            _INTEGRALS[line] = (xorig, yorig, fingerprint,
+                                xy[:, 0], xy[:, 1], cdf)
+
+    integrals = [[_cached_integral(line) for line in ax_lines]
+                 for ax_lines in lines]
+
+    if shade:
+        for ax, ax_lines, ax_integrals in zip(axes, lines, integrals):
+            if ax_lines:
+                _shade_areas(ax, ax_lines, ax_integrals, shade_kws)
+
+    return integrals
+
+
+def _shade_areas(ax, lines, integrals, shade_kws=None):
+    """
+    One PolyCollection with the area under each line.
+    """
+    polygons = list()
+    for x, y, _ in integrals:
+        polygons.append(np.column_stack([np.concatenate([x, x[::-1]]),
+                                         np.concatenate([y, 0 * y])]))
+
+    kws = {'alpha': 0.3,
+           'facecolors': [line.get_color() for line in lines],
+           'edgecolors': 'none'}
+    kws.update(shade_kws or dict())
+
+    areas = mpl.collections.PolyCollection(polygons, **kws)
+    ax.add_collection(areas)
+    ax.autoscale_view()
 
-    return x, y, cdf
+    return areas
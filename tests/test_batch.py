@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from seabornextends import batch
+
+
+def _frame():
+    return pd.DataFrame({
+        'value': np.arange(6.),
+        'when': pd.date_range('2020-01-01', periods=6),
+        'level': pd.Categorical(list('abcabc'), categories=list('cba')),
+        'name': ['x', None, 'y', 'x', 'y', None],
+        'facet': [0, 1] * 3})
+
+
+def test_shared_frames_roundtrip():
+    df = _frame()
+    shared = batch.SharedFrames({'df': df})
+    try:
+        attached = batch.SharedFrames.from_manifest(shared.manifest)
+        loaded = attached.load('df')
+        assert attached.load('df') is loaded
+
+        pd.testing.assert_frame_equal(loaded[['value', 'when', 'level']],
+                                      df[['value', 'when', 'level']])
+        assert list(loaded['name'].isnull()) == list(df['name'].isnull())
+        assert list(loaded['name'].dropna()) == list(df['name'].dropna())
+    finally:
+        shared.cleanup()
+    assert not shared.directory
+
+
+def test_render_batch_reports_every_spec_in_order(tmpdir):
+    spec = {'plot': 'boxplot',
+            'data': 'df',
+            'plot_kws': {'a': 'value', 'col': 'facet', 'engine': 'grouped'},
+            'retouch': [('set_lim', {'axis': 'xaxis', 'left': 0})]}
+    specs = [dict(spec, path=str(tmpdir.join('first.png'))),
+             dict(spec, plot='no_such_plot',
+                  path=str(tmpdir.join('failed.png'))),
+             dict(spec, path=str(tmpdir.join('last.png')))]
+
+    report = batch.render_batch(specs, {'df': _frame()}, processes=2)
+
+    assert [result['path'] for result in report] == \
+        [s['path'] for s in specs]
+    assert report[1]['error'] and 'no_such_plot' in report[1]['traceback']
+    for result in [report[0], report[2]]:
+        assert result['error'] is None
+        assert os.path.exists(result['path'])
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from seabornextends.cache import RenderCache
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SPEC = {'plot': 'boxplot',
+        'plot_kws': {'a': 'value', 'col': 'facet'},
+        'grid_kws': {'x': 'level', 'y': 'value', 'estimator': np.mean},
+        'retouch': [('set_tight_layout', {})],
+        'path': 'chart.png'}
+
+
+def _frame():
+    return pd.DataFrame({'value': np.arange(6.),
+                         'facet': [0, 1] * 3,
+                         'level': list('aabbcc'),
+                         3: np.ones(6)})
+
+
+def test_key_is_the_same_in_a_new_process(tmpdir):
+    key = RenderCache(str(tmpdir)).key(SPEC, _frame())
+
+    code = ('import sys; sys.path.insert(0, {!r}); '
+            'from tests.test_cache import SPEC, _frame; '
+            'from seabornextends.cache import RenderCache; '
+            'print(RenderCache({!r}).key(SPEC, _frame()))').format(
+                ROOT, str(tmpdir))
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.decode().strip() == key
+
+
+def test_key_covers_grid_kws_and_non_string_columns(tmpdir):
+    cache = RenderCache(str(tmpdir))
+    df = _frame()
+    key = cache.key(SPEC, df)
+
+    changed = df.copy()
+    changed['level'] = list('abcabc')
+    assert cache.key(SPEC, changed) != key
+
+    spec = dict(SPEC, plot_kws=dict(SPEC['plot_kws'], hue=3))
+    changed = df.copy()
+    changed[3] = np.zeros(6)
+    assert cache.key(spec, changed) != cache.key(spec, df)
+
+
+def test_key_rejects_unstable_values(tmpdir):
+    spec = dict(SPEC, grid_kws=dict(SPEC['grid_kws'],
+                                    estimator=lambda a: a.mean()))
+    with pytest.raises(ValueError):
+        RenderCache(str(tmpdir)).key(spec, _frame())
+
+
+def test_put_is_atomic(tmpdir):
+    cache = RenderCache(str(tmpdir))
+    cache.put('chart', b'old')
+
+    with pytest.raises(TypeError):
+        cache.put('chart', u'not bytes')
+
+    assert cache.get('chart') == b'old'
+    assert [path.basename for path in tmpdir.listdir()] == \
+        [os.path.basename(cache._path('chart'))]
+
+
+def test_least_recently_used_are_evicted(tmpdir):
+    import time
+
+    cache = RenderCache(str(tmpdir), max_bytes=250)
+    cache.put('a', b'a' * 100)
+    cache.put('b', b'b' * 100)
+    now = time.time()
+    os.utime(cache._path('a'), (now - 20, now - 20))
+    os.utime(cache._path('b'), (now - 10, now - 10))
+
+    # a hit makes a the most recently used
+    assert cache.get('a') == b'a' * 100
+    cache.put('c', b'c' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2 and stats['bytes'] == 200
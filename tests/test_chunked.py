@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from seabornextends import stats
+from seabornextends.chunked import FacetAggregator
+from seabornextends.chunked import QuantileSketch
+from seabornextends.chunked import StreamingHistogram
+
+
+@pytest.fixture
+def values():
+    return np.random.RandomState(0).lognormal(size=200000)
+
+
+def test_quantile_sketch_rank_error(values):
+    q = np.linspace(.01, .99, 99)
+    sketch = QuantileSketch(k=1024)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+
+    # rank of the estimates within the data, about 1 / k off
+    ranks = np.searchsorted(np.sort(values), sketch.quantile(q)) / \
+        float(len(values))
+    assert np.abs(ranks - q).max() < 3. / 1024
+
+    assert sketch.count == len(values)
+    assert sketch.min == values.min() and sketch.max == values.max()
+    assert sketch.sum == pytest.approx(values.sum())
+
+
+def test_merged_sketches_match_one_sketch(values):
+    left, right = np.array_split(values, 2)
+    merged = QuantileSketch(k=1024).update(left).merge(
+        QuantileSketch(k=1024, seed=1).update(right))
+
+    expected = np.percentile(values, [25, 50, 75])
+    np.testing.assert_allclose(merged.quantile([.25, .5, .75]), expected,
+                               rtol=1e-2)
+
+    box = merged.box_stats()
+    exact = stats.grouped_box_stats(values, np.zeros(len(values), int), 1)
+    assert box['whishi'] == pytest.approx(exact.loc[0, 'whishi'], rel=1e-2)
+    assert box['whislo'] == exact.loc[0, 'whislo']
+
+
+def test_streaming_histogram_on_edges_is_exact(values):
+    codes = np.arange(len(values)) % 3
+    edges = np.linspace(0, 10, 21)
+    histogram = StreamingHistogram(edges)
+    for chunk in np.array_split(np.arange(len(values)), 7):
+        histogram.update(values[chunk], codes[chunk], 3)
+
+    _, counts = histogram.histogram()
+    np.testing.assert_array_equal(
+        counts, stats.grouped_histogram(values, codes, 3, edges))
+
+
+def test_streaming_histogram_fine_bins_add_up(values):
+    codes = np.zeros(len(values), dtype=int)
+    histogram = StreamingHistogram(n_fine=512)
+    # growing range: the fine grid is coarsened along the way
+    for chunk in np.array_split(np.sort(values), 11):
+        histogram.update(chunk, codes[:len(chunk)], 1)
+
+    edges, counts = histogram.fine()
+    assert counts.sum() == len(values)
+    expected, _ = np.histogram(values, bins=edges)
+    np.testing.assert_array_equal(counts[0], expected)
+
+    edges, counts = histogram.histogram(bins=20)
+    assert len(edges) - 1 <= 20
+    expected, _ = np.histogram(values, bins=edges)
+    np.testing.assert_array_equal(counts[0], expected)
+
+
+def test_facet_aggregator_groups_in_order_of_appearance(values):
+    rs = np.random.RandomState(1)
+    df = pd.DataFrame({'value': values[:3000],
+                       'country': rs.choice(['UK', 'US', 'FR'], 3000),
+                       'device': rs.choice(['web', 'app'], 3000)})
+    aggregator = FacetAggregator('value', ['country', 'device'],
+                                 sketch=True)
+    aggregator.consume(df.iloc[start:start + 600]
+                       for start in range(0, len(df), 600))
+
+    keys = list(df[['country', 'device']].drop_duplicates().itertuples(
+        index=False, name=None))
+    assert sorted(aggregator.keys, key=aggregator.keys.get) == keys
+
+    frame = aggregator.facet_frame()
+    for group, key in enumerate(keys):
+        assert tuple(frame.iloc[group]) == key
+        expected = df.loc[(df['country'] == key[0]) &
+                          (df['device'] == key[1]), 'value']
+        sketch = aggregator.sketches[group]
+        assert sketch.count == len(expected)
+        # small groups stay exact, below k values
+        assert sketch.quantile(.5) == pytest.approx(expected.median())
@@ -0,0 +1,46 @@
+import numpy as np
+
+import pytest
+
+from seabornextends import decimate
+
+
+@pytest.fixture
+def walk():
+    rs = np.random.RandomState(0)
+    x = np.arange(10000.)
+    return x, rs.standard_normal(len(x)).cumsum()
+
+
+def test_minmax_keeps_every_bucket_extreme(walk):
+    x, y = walk
+    index = decimate.downsample_index(x, y, method='minmax', n_out=100)
+
+    assert len(index) <= 4 * 100
+    assert index[0] == 0 and index[-1] == len(x) - 1
+    np.testing.assert_array_equal(index, np.unique(index))
+    assert y[index].min() == y.min()
+    assert y[index].max() == y.max()
+    # every pixel column keeps its own min and max
+    buckets = np.array_split(np.arange(len(x)), 100)
+    for bucket in buckets[1:-1]:
+        kept = y[np.intersect1d(index, bucket)]
+        assert kept.min() == y[bucket].min()
+        assert kept.max() == y[bucket].max()
+
+
+def test_lttb_keeps_n_out_points(walk):
+    x, y = walk
+    index = decimate.downsample_index(x, y, method='lttb', n_out=100)
+
+    assert len(index) == 100
+    assert index[0] == 0 and index[-1] == len(x) - 1
+    assert np.all(np.diff(index) > 0)
+
+
+def test_short_or_unsorted_lines_are_kept(walk):
+    x, y = walk
+    assert len(decimate.downsample_index(x[:150], y[:150], n_out=100)) == 150
+    assert len(decimate.downsample_index(x[::-1], y, n_out=100)) == len(x)
+    with pytest.raises(ValueError):
+        decimate.downsample_index(x, y, method='mean')
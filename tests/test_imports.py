@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_heavy_dependencies_are_imported_lazily():
+    script = os.path.join(ROOT, 'benchmarks', 'check_imports.py')
+    process = subprocess.Popen([sys.executable, script],
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT)
+    out, _ = process.communicate()
+    assert process.returncode == 0, out.decode()
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+
+from seabornextends import pages
+
+
+@pytest.fixture
+def df():
+    rs = np.random.RandomState(0)
+    host = np.repeat(['e', 'b', 'd', 'a', 'c'], 20)
+    step = np.tile(np.arange(20.), 5)
+    # every host on its own scale
+    scale = np.repeat([1, 2, 3, 4, 5], 20)
+    return pd.DataFrame({'host': host,
+                         'step': step,
+                         'latency': rs.exponential(size=100) * scale})
+
+
+@pytest.mark.parametrize('plot', ['plot', 'boxplot'])
+def test_pages_share_limits_and_keep_the_level_order(df, tmpdir, plot):
+    plot_kws = {'x': 'step', 'y': 'latency'} if plot == 'plot' \
+        else {'a': 'latency'}
+    plot_kws['col'] = 'host'
+    spec = {'plot': plot,
+            'plot_kws': plot_kws,
+            'path': str(tmpdir.join('latency.png'))}
+
+    report = pages.render_pages(spec, df, page_size=2)
+
+    assert [page['levels'] for page in report['pages']] == \
+        [['e', 'b'], ['d', 'a'], ['c']]
+    assert [page['page'] for page in report['pages']] == [1, 2, 3]
+    for page in report['pages']:
+        assert page['path'] == pages.page_path(spec['path'], page['page'])
+        assert os.path.exists(page['path'])
+
+    axis = 'y' if plot == 'plot' else 'x'
+    lo, hi = report['limits'][axis]
+    assert lo <= df['latency'].min() and hi >= df['latency'].max()
+    assert report['limits'] == pages.shared_limits(spec, df, page_size=2)
+
+
+def test_pages_need_a_facet_variable(df, tmpdir):
+    spec = {'plot': 'boxplot',
+            'plot_kws': {'a': 'latency'},
+            'path': str(tmpdir.join('latency.png'))}
+    with pytest.raises(ValueError):
+        pages.render_pages(spec, df)
@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import pytest
+
+from seabornextends import plots
+
+
+@pytest.fixture
+def df():
+    rs = np.random.RandomState(0)
+    return pd.DataFrame({'value': rs.standard_normal(400),
+                         'facet': rs.randint(0, 2, 400)})
+
+
+def test_grouped_histograms_match_seaborn(df):
+    bars = dict()
+    for engine in ['seaborn', 'grouped']:
+        grid = plots.distplot(a='value', data=df, col='facet',
+                              engine=engine,
+                              distplot_kws={'bins': np.linspace(-4, 4, 17),
+                                            'kde': False})
+        bars[engine] = [[(p.get_x(), p.get_width(), p.get_height())
+                         for p in ax.patches] for ax in grid.axes.flat]
+        plt.close(grid.fig)
+
+    np.testing.assert_allclose(bars['grouped'], bars['seaborn'])
+
+
+def test_grouped_kdes_match_seaborn(df):
+    lines = dict()
+    for engine in ['seaborn', 'grouped']:
+        grid = plots.distplot(a='value', data=df, col='facet',
+                              engine=engine, distplot_kws={'hist': False})
+        lines[engine] = [ax.lines[0] for ax in grid.axes.flat]
+        plt.close(grid.fig)
+
+    for grouped, seaborn in zip(lines['grouped'], lines['seaborn']):
+        x = grouped.get_xdata()
+        expected = np.interp(x, seaborn.get_xdata(), seaborn.get_ydata())
+        assert x[0] == pytest.approx(seaborn.get_xdata()[0])
+        assert x[-1] == pytest.approx(seaborn.get_xdata()[-1])
+        np.testing.assert_allclose(grouped.get_ydata(), expected,
+                                   atol=1e-3 * expected.max())
+
+
+def test_grouped_box_stats_match_seaborn(df):
+    lines = dict()
+    for engine in ['seaborn', 'grouped']:
+        grid = plots.boxplot(a='value', data=df, col='facet',
+                             engine=engine)
+        lines[engine] = [[np.asarray(line.get_xydata(), dtype=np.float64)
+                          for line in ax.lines] for ax in grid.axes.flat]
+        plt.close(grid.fig)
+
+    for grouped, seaborn in zip(lines['grouped'], lines['seaborn']):
+        assert len(grouped) == len(seaborn)
+        for grouped_line, seaborn_line in zip(grouped, seaborn):
+            np.testing.assert_allclose(grouped_line, seaborn_line)
+
+
+@pytest.mark.parametrize('kind', ['boxplot', 'violinplot'])
+@pytest.mark.parametrize('engine', ['seaborn', 'grouped'])
+def test_categorical_orientation(df, kind, engine):
+    grid = getattr(plots, kind)(a='value', data=df, col='facet',
+                                engine=engine, pyplot=False)
+    ax = grid.axes.flat[0]
+
+    # horizontal by default: values on x, one inverted category on y
+    assert ax.get_xlim()[0] < df['value'].min()
+    assert ax.get_xlim()[1] > df['value'].max()
+    assert tuple(ax.get_ylim()) == (.5, -.5)
+    assert ax.get_ylabel() == ''
+
+
+def test_grids_off_pyplot_are_not_registered(df):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    before = plt.get_fignums()
+    grids = [plots.boxplot(a='value', data=df, col='facet', pyplot=False),
+             plots.distplot(a='value', data=df, col='facet',
+                            engine='grouped', pyplot=False)]
+
+    assert plt.get_fignums() == before
+    for grid in grids:
+        assert type(grid.fig.canvas) is FigureCanvasAgg
+
+
+def test_update_swaps_data_into_the_grid(df):
+    df = df.assign(step=np.arange(len(df)))
+    grid = plots.plot(x='step', y='value', data=df, col='facet',
+                      pyplot=False)
+    lines = [list(ax.lines) for ax in grid.axes.flat]
+
+    new = df.assign(value=df['value'] * 10)
+    assert plots.update(grid, new) is grid
+
+    for facet, ax in enumerate(grid.axes.flat):
+        assert list(ax.lines) == lines[facet]
+        line, = ax.lines
+        expected = new[new['facet'] == facet]
+        np.testing.assert_array_equal(line.get_xdata(), expected['step'])
+        np.testing.assert_array_equal(line.get_ydata(), expected['value'])
+        assert ax.get_ylim()[1] >= expected['value'].max()
+
+
+def test_update_rejects_grids_it_did_not_draw(df):
+    grid = plots.boxplot(a='value', data=df, col='facet', pyplot=False)
+    with pytest.raises(ValueError):
+        plots.update(grid, df)
+
+
+@pytest.fixture
+def points():
+    rs = np.random.RandomState(0)
+    return pd.DataFrame({'x': rs.standard_normal(3000),
+                         'y': rs.exponential(size=3000)})
+
+
+def test_jointplot_hist_counts(points):
+    grid = plots.jointplot('x', 'y', points, kind='hist', bins=8,
+                           pyplot=False)
+
+    expected, x_edges, y_edges = np.histogram2d(points['x'], points['y'],
+                                                bins=8)
+    image, = grid.ax_joint.images
+    np.testing.assert_array_equal(image.get_array().filled(0), expected.T)
+    assert image.get_extent() == [x_edges[0], x_edges[-1],
+                                  y_edges[0], y_edges[-1]]
+
+    x_heights = [p.get_height() for p in grid.ax_marg_x.patches]
+    y_widths = [p.get_width() for p in grid.ax_marg_y.patches]
+    np.testing.assert_array_equal(x_heights, expected.sum(axis=1))
+    np.testing.assert_array_equal(y_widths, expected.sum(axis=0))
+
+
+def test_jointplot_hex_counts(points):
+    grid = plots.jointplot('x', 'y', points, kind='hex', gridsize=10,
+                           pyplot=False)
+    hexagons, = grid.ax_joint.collections
+
+    # Axes.hexbin on every point, empty hexagons left out
+    fig, ax = plt.subplots()
+    extent = (points['x'].min(), points['x'].max(),
+              points['y'].min(), points['y'].max())
+    expected = ax.hexbin(points['x'], points['y'], gridsize=10,
+                         extent=extent)
+    filled = expected.get_array() > 0
+    np.testing.assert_array_equal(hexagons.get_array(),
+                                  expected.get_array()[filled])
+    np.testing.assert_allclose(hexagons.get_offsets(),
+                               expected.get_offsets()[filled])
+    plt.close(fig)
@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import pytest
+
+from seabornextends.retouch.grid import FacetGridRetoucher
+
+
+def test_level_estimates_follow_df_edits():
+    import seaborn as sns
+
+    df = pd.DataFrame({'country': pd.Categorical(['UK', 'US'] * 10),
+                       'value': np.arange(20.)})
+    grid = sns.catplot(x='country', y='value', data=df, kind='bar',
+                       errorbar=None)
+    retoucher = FacetGridRetoucher(grid)
+
+    before = retoucher.level_estimates(df, 'country', 'value', np.mean)
+    df['value'] *= 2
+    after = retoucher.level_estimates(df, 'country', 'value', np.mean)
+
+    np.testing.assert_allclose(after, 2 * before)
+    plt.close(grid.fig)
+
+
+@pytest.fixture
+def scatter_grid():
+    import seaborn as sns
+
+    rs = np.random.RandomState(0)
+    df = pd.DataFrame({'x': rs.standard_normal(50),
+                       'y': rs.standard_normal(50),
+                       'facet': rs.randint(0, 2, 50)})
+    grid = sns.FacetGrid(df, col='facet')
+    grid.map(plt.scatter, 'x', 'y')
+    yield grid
+    plt.close(grid.fig)
+
+
+def test_lazy_plan_applies_on_canvas_draw(scatter_grid):
+    retoucher = FacetGridRetoucher(scatter_grid, lazy=True)
+    assert retoucher.set_lim(axis='xaxis', left=-10, right=10) is None
+    assert len(retoucher.plan) == 1
+
+    scatter_grid.fig.canvas.draw()
+
+    assert len(retoucher.plan) == 0
+    assert retoucher._draw_cid is None
+    for ax in scatter_grid.axes.flat:
+        assert tuple(ax.get_xlim()) == (-10, 10)
+
+
+def test_lazy_plan_is_applied_before_saving(scatter_grid, tmpdir):
+    import io
+
+    retoucher = FacetGridRetoucher(scatter_grid, lazy=True)
+    retoucher.set_lim(axis='xaxis', left=-10, right=10)
+
+    with pytest.raises(ValueError):
+        scatter_grid.fig.savefig(io.BytesIO(), format='png')
+
+    retoucher.savefig(str(tmpdir.join('grid.png')))
+    assert len(retoucher.plan) == 0
+    for ax in scatter_grid.axes.flat:
+        assert tuple(ax.get_xlim()) == (-10, 10)
+
+
+def test_date_labels_follow_limit_changes():
+    import matplotlib.dates as mdates
+    from seabornextends.retouch.ax import AxRetoucher
+
+    fig, ax = plt.subplots()
+    dates = pd.date_range('2020-01-01', periods=100, freq='D')
+    ax.plot(dates.values, np.arange(100))
+    AxRetoucher(ax).touch_dates_axis(fmt='%Y-%m-%d',
+                                     locator=mdates.DayLocator(interval=7))
+
+    def labels():
+        locs = ax.xaxis.get_majorticklocs()
+        texts = ax.xaxis.get_major_formatter().format_ticks(locs)
+        return locs, texts
+
+    locs, texts = labels()
+    assert texts == [str(mdates.num2date(loc).date()) for loc in locs]
+
+    ax.set_xlim(mdates.date2num(np.datetime64('2020-03-01')),
+                mdates.date2num(np.datetime64('2020-03-20')))
+    new_locs, new_texts = labels()
+    assert new_texts[0].startswith('2020-03')
+    assert new_texts == [str(mdates.num2date(loc).date())
+                         for loc in new_locs]
+    plt.close(fig)
+
+
+def test_merged_lines_keep_their_styles():
+    from seabornextends.retouch import consolidate
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1], color='C1', lw=2)
+    ax.plot([0, 1], [1, 0], color='C2', ls='--', alpha=.5)
+    ax.plot([0, 1], [.5, .5], marker='o')
+    xlim = ax.get_xlim()
+
+    collection, = consolidate.merge_lines(ax)
+
+    # the line with markers is kept
+    assert len(ax.lines) == 1
+    assert consolidate.merged_lines(ax) == [collection]
+    np.testing.assert_array_equal(collection.get_segments()[1],
+                                  [[0, 1], [1, 0]])
+    np.testing.assert_allclose(collection.get_colors(),
+                               [matplotlib.colors.to_rgba('C1'),
+                                matplotlib.colors.to_rgba('C2', .5)])
+    assert list(collection.get_linewidths()) == [2, 1.5]
+    assert ax.get_xlim() == xlim
+    plt.close(fig)
+
+
+def test_merged_points_keep_per_point_styles(scatter_grid):
+    from seabornextends.retouch import consolidate
+
+    ax = scatter_grid.axes.flat[0]
+    first = ax.collections[0]
+    offsets = first.get_offsets().copy()
+    ax.scatter([10, 11], [10, 11], s=[5, 50], color='red')
+
+    merged, = consolidate.merge_points(ax)
+
+    assert list(ax.collections) == [merged]
+    np.testing.assert_array_equal(merged.get_offsets(),
+                                  np.concatenate([offsets,
+                                                  [[10, 10], [11, 11]]]))
+    assert list(merged.get_sizes()[-2:]) == [5, 50]
+    assert tuple(merged.get_facecolors()[-1]) == (1, 0, 0, 1)
+    assert tuple(merged.get_facecolors()[0]) == \
+        tuple(first.get_facecolors()[0])
+
+
+def test_fast_layout_matches_tight_layout():
+    from seabornextends.retouch import layout
+
+    fig, axes = plt.subplots(2, 3, figsize=(8, 5))
+    for ax in axes.flat:
+        ax.plot(np.arange(10) * 1000)
+        ax.set_ylabel('value')
+        ax.set_title('facet')
+    axes[0, 0].set_xlabel('a much longer x label')
+    fig.suptitle('title')
+
+    kws = layout.fast_layout_kws(fig)
+    fig.tight_layout()
+    params = fig.subplotpars
+    for name, value in kws.items():
+        assert value == pytest.approx(getattr(params, name))
+    plt.close(fig)
+
+
+def test_fast_layout_falls_back_without_a_renderer():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_svg import FigureCanvasSVG
+    from seabornextends.retouch import layout
+
+    fig = Figure()
+    FigureCanvasSVG(fig)
+    fig.subplots(1, 2)
+    assert layout.fast_layout_kws(fig) is None
+
+
+def test_highlight_ranges_are_in_view():
+    import seaborn as sns
+
+    rs = np.random.RandomState(0)
+    df = pd.DataFrame({
+        'country': pd.Categorical(rs.choice(['UK', 'US', 'FR'], 300)),
+        'value': rs.exponential(size=300)})
+    df.loc[df['country'] == 'UK', 'value'] *= 3
+
+    grid = sns.catplot(x='value', y='country', data=df, kind='bar',
+                       errorbar=None)
+    retoucher = FacetGridRetoucher(grid, grid_kws={'x': 'value',
+                                                   'y': 'country',
+                                                   'estimator': np.mean,
+                                                   'ci': 95,
+                                                   'seed': 0})
+    retoucher.highlight_levels(df=df, category='country', axis='yaxis',
+                               highlights=[{'kind': 'bar',
+                                            'level_pattern': 'UK'}])
+
+    _, high = retoucher.level_intervals(df, 'country', 'value', np.mean,
+                                        seed=0)
+    assert grid.ax.get_xlim()[1] > np.nanmax(high)
+    plt.close(grid.fig)
+
+
+def test_point_setters_skip_highlights(scatter_grid):
+    retoucher = FacetGridRetoucher(scatter_grid)
+    retoucher.highlight_lines(values=[0])
+    retoucher.set_point_sizes(sizes=[40])
+    retoucher.set_point_colors('red')
+
+    for ax in scatter_grid.axes.flat:
+        points, lines = ax.collections
+        assert list(points.get_sizes()) == [40]
+        assert tuple(points.get_facecolor()[0]) == (1, 0, 0, 1)
+        assert tuple(lines.get_color()[0]) == (0, 0, 0, .3)
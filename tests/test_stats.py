@@ -0,0 +1,82 @@
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.cbook
+
+import pytest
+
+from seabornextends import stats
+
+
+@pytest.fixture
+def grouped():
+    rs = np.random.RandomState(0)
+    codes = rs.randint(-1, 3, 600)
+    values = rs.standard_normal(600) * (codes + 2)
+    values[::50] = np.nan
+    return values, codes
+
+
+def _groups(values, codes, n_groups=3):
+    return [values[(codes == group) & ~np.isnan(values)]
+            for group in range(n_groups)]
+
+
+def test_grouped_histogram_matches_numpy(grouped):
+    values, codes = grouped
+    edges = stats.shared_bin_edges(values, bins=12)
+    counts = stats.grouped_histogram(values, codes, 4, edges)
+
+    for group, group_values in enumerate(_groups(values, codes)):
+        expected, _ = np.histogram(group_values, bins=edges)
+        np.testing.assert_array_equal(counts[group], expected)
+    assert not counts[3].any()
+
+
+def test_grouped_kde_matches_scipy(grouped):
+    from scipy.stats import gaussian_kde
+
+    values, codes = grouped
+    supports, densities = stats.grouped_kde(values, codes, 4)
+
+    for group, group_values in enumerate(_groups(values, codes)):
+        expected = gaussian_kde(group_values, bw_method='scott')(
+            supports[group])
+        np.testing.assert_allclose(densities[group], expected,
+                                   atol=1e-3 * expected.max())
+    assert supports[3] is None and densities[3] is None
+
+
+def test_grouped_box_stats_match_matplotlib(grouped):
+    values, codes = grouped
+    box_stats = stats.grouped_box_stats(values, codes, 4)
+
+    for group, group_values in enumerate(_groups(values, codes)):
+        expected, = matplotlib.cbook.boxplot_stats(group_values)
+        row = box_stats.loc[group]
+        for key in stats.BOX_STATS_COLUMNS + ['mean']:
+            assert row[key] == pytest.approx(expected[key])
+        np.testing.assert_array_equal(np.sort(row['fliers']),
+                                      np.sort(expected['fliers']))
+    assert box_stats.loc[3, 'count'] == 0
+    assert np.isnan(box_stats.loc[3, 'med'])
+
+
+def test_grouped_bootstrap_is_reproducible(grouped):
+    values, codes = grouped
+    kws = dict(estimator=np.median, n_boot=200, seed=0, chunksize=5000)
+
+    first = stats.grouped_bootstrap(values, codes, 4, **kws)
+    second = stats.grouped_bootstrap(values, codes, 4, **kws)
+    pooled = stats.grouped_bootstrap(values, codes, 4, processes=2, **kws)
+    other = stats.grouped_bootstrap(values, codes, 4,
+                                    **dict(kws, seed=1))
+
+    np.testing.assert_array_equal(first.values, second.values)
+    np.testing.assert_array_equal(first.values, pooled.values)
+    assert not np.allclose(first['ci_low'][:3], other['ci_low'][:3])
+
+    for group, group_values in enumerate(_groups(values, codes)):
+        assert first.loc[group, 'estimate'] == np.median(group_values)
+        assert (first.loc[group, 'ci_low'] < first.loc[group, 'estimate'] <
+                first.loc[group, 'ci_high'])
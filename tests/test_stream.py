@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+
+from seabornextends import plots
+from seabornextends.stream import LineStream
+from seabornextends.stream import RingBuffer
+
+
+def _rows(start, stop, facets=(0, 1)):
+    t = np.repeat(np.arange(start, stop, dtype=np.float64), len(facets))
+    facet = np.tile(facets, stop - start)
+    return pd.DataFrame({'t': t, 'y': t * (facet + 1), 'facet': facet})
+
+
+@pytest.fixture
+def grid():
+    return plots.plot(x='t', y='y', data=_rows(0, 10), col='facet',
+                      pyplot=False)
+
+
+def test_ring_buffer_keeps_the_last_window_values():
+    buffer = RingBuffer(window=4)
+    buffer.append([1, 2, 3])
+    np.testing.assert_array_equal(buffer.view(), [1, 2, 3])
+    buffer.append([4, 5])
+    np.testing.assert_array_equal(buffer.view(), [2, 3, 4, 5])
+    buffer.append(np.arange(10))
+    np.testing.assert_array_equal(buffer.view(), [6, 7, 8, 9])
+    assert len(buffer) == 4
+
+    with pytest.raises(ValueError):
+        RingBuffer(window=0)
+
+
+def test_rows_are_routed_to_their_facet(grid):
+    stream = LineStream(grid, window=5)
+
+    report = stream.append(_rows(10, 12, facets=(1,)))
+    assert report['axes'] == [1]
+
+    first, second = [ax.lines[0] for ax in grid.axes.flat]
+    np.testing.assert_array_equal(first.get_xdata(), [5, 6, 7, 8, 9])
+    np.testing.assert_array_equal(second.get_xdata(), [7, 8, 9, 10, 11])
+    np.testing.assert_array_equal(second.get_ydata(),
+                                  2 * second.get_xdata())
+    stream.close()
+
+
+def test_limits_grow_only_when_points_leave_them(grid):
+    stream = LineStream(grid)
+    ax = grid.axes.flat[1]
+
+    assert stream.append(_rows(10, 11))['redraw'] == 'full'
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+    assert xlim[1] > 10 and ylim[1] > 20
+
+    # within the headroom: blitted, limits kept
+    assert stream.append(_rows(11, 12))['redraw'] == 'blit'
+    assert ax.get_xlim() == xlim and ax.get_ylim() == ylim
+
+    stream.append(_rows(12, 100))
+    assert ax.get_xlim()[1] > 99 and ax.get_ylim()[1] > 198
+    stream.close()
+    assert not ax.lines[0].get_animated()
+
+
+def test_stream_needs_a_plot_grid():
+    df = _rows(0, 10)
+    grid = plots.boxplot(a='y', data=df, col='facet', pyplot=False)
+    with pytest.raises(ValueError):
+        LineStream(grid)
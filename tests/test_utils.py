@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from seabornextends import utils
+
+
+def test_level_codes():
+    codes = utils.level_codes(pd.Series(['b', 'a', None, 'c', 'b']),
+                              ['a', 'b'])
+    np.testing.assert_array_equal(codes, [1, 0, -1, -1, 1])
+
+
+def test_facet_codes_line_up_with_the_grid():
+    import seaborn as sns
+
+    df = pd.DataFrame({'row': list('xxyyzz'),
+                       'col': [1, 2, 1, 2, 1, 2],
+                       'hue': list('abbaab')})
+    grid = sns.FacetGrid(df, row='row', col='col', hue='hue',
+                         row_order=['y', 'x'], hue_order=['b', 'a'])
+    ax_codes, hue_codes = utils.facet_codes(grid, df)
+
+    np.testing.assert_array_equal(ax_codes, [2, 3, 0, 1, -1, -1])
+    np.testing.assert_array_equal(hue_codes, [1, 0, 0, 1, -1, -1])
+    for code, (_, row) in zip(ax_codes, df.iterrows()):
+        if code >= 0:
+            ax = grid.axes.flat[code]
+            assert ax is grid.axes[grid.row_names.index(row['row']),
+                                   grid.col_names.index(row['col'])]
+    plt.close(grid.fig)
+
+
+def test_integrals_follow_in_place_edits():
+    fig, ax = plt.subplots()
+    x = np.linspace(0, 1, 11)
+    y = np.ones(11)
+    line, = ax.plot(x, y)
+
+    _, _, cdf = utils.integrate_lines(ax)[0][0]
+    assert cdf[-1] == 1
+
+    # the line's own data, matplotlib copies y
+    line.get_ydata(orig=True)[:] *= 2
+    _, _, cdf = utils.integrate_lines(ax, check_data=True)[0][0]
+    assert cdf[-1] == 2
+    plt.close(fig)